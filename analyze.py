@@ -16,8 +16,14 @@ def get_solver(method, kb, query):
         solver = Resolution(kb, query)
     elif method == "DPLL":
         solver = DPLL(kb, query)
+    elif method == "BDD":
+        solver = BDD(kb, query)
+    elif method == "MC":
+        solver = ModelCounting(kb, query)
+    elif method == "WALKSAT":
+        solver = WalkSAT(kb, query)
     else:
-        raise ValueError("Invalid method. Please use one of the following methods: TT, FC, BC, RES, DPLL")
+        raise ValueError("Invalid method. Please use one of the following methods: TT, FC, BC, RES, DPLL, BDD, MC, WALKSAT")
     return solver
 
 
@@ -56,13 +62,13 @@ def analyze(file_name, method, number=1000):
     print(f"\t- Knowledge Base / Tell: {kb}")
     print(f"\t- Query / Ask: {query}")
     if expected_result is not None:
-        print(f"\t- Expected Result: {"YES" if expected_result else "NO"}")
+        print(f"\t- Expected Result: {'YES' if expected_result else 'NO'}")
     
     solver = get_solver(method, kb, query)
     result, peak = space(solver)
     
     print("\nResult:")
-    print(f"\t- Entails: {"YES" if result["entails"] else "NO"}")
+    print(f"\t- Entails: {'YES' if result['entails'] else 'NO'}")
     if "message" in result.keys():
         print(f"\t- Message: {result['message']}")
     
@@ -0,0 +1,65 @@
+"""
+This module contains the asyncio interface of the solvers, for services that answer queries from an event loop. A solver is a blocking CPU loop, so it runs in an executor (a thread pool, the default executor of the loop unless another is given) while the event loop keeps serving other coroutines, and many queries can be in flight at once. The threads share the interpreter lock, so queries run concurrently but not in parallel.
+
+A thread cannot be stopped from outside, so Resolution and DPLL, which check a budget as they search, are given one of their own (with the limits of the budget of the caller, if any) and stop at their next check (a conflict or decision of DPLL, a resolvent of Resolution) once their query is cancelled or times out. The other methods cannot be interrupted: a timeout answers UNKNOWN at once, but their solver runs to its end in the background, keeping a thread of the executor.
+
+### Functions:
+    - solve_async(kb: Sentence, query: Sentence, method: str, timeout: float, budget: Budget, executor: Executor) -> dict: Solve a query without blocking the event loop.
+"""
+import asyncio
+from concurrent.futures import Executor
+from syntax import *
+from methods import Resolution, DPLL
+from analyze import get_solver
+from budget import Budget, UNKNOWN
+
+# The methods that stop at the next check of their budget once cancelled
+CANCELLABLE = ("RES", "DPLL")
+
+
+def _solve(method:str, kb:Sentence, query:Sentence, budget:Budget) -> dict:
+    if method == "RES":
+        solver = Resolution(kb, query, budget=budget)
+    elif method == "DPLL":
+        solver = DPLL(kb, query, budget=budget)
+    else:
+        solver = get_solver(method, kb, query)
+    return solver.solve()
+
+
+async def solve_async(kb:Sentence, query:Sentence, method:str="DPLL", timeout:float=None, budget:Budget=None, executor:Executor=None) -> dict:
+    """
+    Solve a query in an executor, without blocking the event loop. Cancelling the coroutine cancels the search of RES and DPLL.
+
+    ### Args:
+        - kb (Sentence): The knowledge base
+        - query (Sentence): The query
+        - method (str): The inference method: TT, FC, BC, RES, DPLL, BDD, MC or WALKSAT
+        - timeout (float): The maximum time to wait for the answer, in seconds, including the time waiting for a thread of the executor
+        - budget (Budget): The other limits of the search (RES and DPLL only). The call runs with a copy of them, which the cancellation goes through, so the same budget can be given to many calls
+        - executor (Executor): The executor running the solver, or None for the default executor of the loop
+
+    ### Returns:
+        - dict: The result of the solver, or UNKNOWN if the time or the budget ran out
+    """
+    method = method.upper()
+    if method in CANCELLABLE:
+        # A budget of its own, so cancelling this call leaves the budget of the caller usable by others
+        budget = budget.copy() if budget is not None else Budget()
+    elif budget is not None:
+        raise ValueError("A budget is only available for the RES and DPLL methods")
+    future = asyncio.get_running_loop().run_in_executor(executor, _solve, method, kb, query, budget)
+    try:
+        # Shielded so a timeout leaves the solver running until its budget stops it, instead of abandoning its thread
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+    except asyncio.TimeoutError:
+        if budget is None:
+            return dict(UNKNOWN)
+        budget.cancel()
+        # The solver stops at its next check, with UNKNOWN, unless it found the answer in the meantime
+        return await future
+    except asyncio.CancelledError:
+        if budget is not None:
+            budget.cancel()
+        future.cancel()
+        raise
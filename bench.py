@@ -0,0 +1,341 @@
+"""
+This module contains the benchmark suite of the inference methods, run with `./iengine bench`.
+
+Every method is run on every problem file, each pair (a case) in a new process, so the peak resident memory (RSS) of a case is not hidden by the cases run before it, and a case that takes too long can be stopped. In that process the case is run a number of times to warm up (filling the caches of the interpreter and of the syntax classes), then timed a number of times with the garbage collector disabled, like timeit. Every run times separately the parsing of the file, the construction of the solver (CNF conversion, compilation or preprocessing, depending on the method) and the search.
+
+Results can be saved as JSON, with every time measured, and compared with saved results: a case is slower when its total times are larger than those of the baseline with a one-sided Mann-Whitney U test, and its median more than a threshold larger.
+
+### Functions:
+    - run_case(method: str, file_name: str, repeat: int, warmup: int, memory: bool) -> dict: Time a method on a file, in the current process.
+    - run_isolated(method: str, file_name: str, repeat: int, warmup: int, timeout: float, memory: bool) -> dict: Time a method on a file in a new process.
+    - summarize(samples: list[float]) -> dict: Get the median, 95th percentile and minimum of times.
+    - bench(methods: list[str], files: list[str], repeat: int, warmup: int, timeout: float) -> dict: Run every method on every file.
+    - mann_whitney(slower: list[float], faster: list[float]) -> float: Get the p-value of the samples of slower not being larger than those of faster.
+    - compare(results: dict, baseline: dict, alpha: float, threshold: float) -> list[dict]: Compare results with a baseline.
+    - report(results: dict) -> str: Get the results as a table.
+    - report_comparison(changes: list[dict]) -> str: Get the comparison as a table.
+    - save(results: dict, path: str): Save results as JSON.
+    - load(path: str) -> dict: Load results saved as JSON.
+    - main(...) -> bool: Run the benchmark, print, save and compare the results.
+    - parse_options(args: list[str]) -> dict: Parse the options of the benchmark from the command line.
+"""
+import os, sys, gc, io, json, math, time, platform, statistics, tracemalloc
+import multiprocessing
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from tabulate import tabulate
+from parser import parse_kb_and_query, INPUT_DIR, problem_files
+from budget import peak_memory
+
+METHODS = ["TT", "FC", "BC", "RES", "DPLL", "BDD", "MC", "WALKSAT"]
+PHASES = ("parse", "cnf", "solve", "total")
+
+
+def run_case(method:str, file_name:str, repeat:int=10, warmup:int=2, memory:bool=False) -> dict:
+    """
+    Time a method on a file in the current process.
+
+    ### Args:
+        - method (str): The inference method
+        - file_name (str): The name of the file in the data/ folder
+        - repeat (int): The number of timed runs
+        - warmup (int): The number of runs before the timed ones
+        - memory (bool): Whether to measure the memory allocated by a run, in one more run traced by tracemalloc (which slows it down too much to be timed)
+
+    ### Returns:
+        - dict: The answer, the times of every phase of every timed run in seconds, the peak RSS of the process in bytes (None where it is not available, e.g. on Windows), and with memory the peak of the memory allocated by a run in bytes
+    """
+    from analyze import get_solver
+
+    def run():
+        start = time.perf_counter()
+        kb, query = parse_kb_and_query(file_name)
+        parsed = time.perf_counter()
+        solver = get_solver(method, kb, query)
+        built = time.perf_counter()
+        result = solver.solve()
+        solved = time.perf_counter()
+        return result, (parsed - start, built - parsed, solved - built, solved - start)
+
+    times = {phase: [] for phase in PHASES}
+    # The Horn checks of FC and BC print warnings
+    with redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            run()
+        enabled = gc.isenabled()
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                result, durations = run()
+                for phase, duration in zip(PHASES, durations):
+                    times[phase].append(duration)
+        finally:
+            if enabled:
+                gc.enable()
+        case = {
+            "entails": result["entails"],
+            "times": times,
+            "peak_rss": peak_memory()
+        }
+        if memory:
+            tracemalloc.start()
+            try:
+                run()
+                case["peak_memory"] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    return case
+
+
+def _run_child(connection, method:str, file_name:str, repeat:int, warmup:int, memory:bool):
+    try:
+        connection.send(run_case(method, file_name, repeat, warmup, memory))
+    except Exception as e:
+        connection.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        connection.close()
+
+
+def run_isolated(method:str, file_name:str, repeat:int=10, warmup:int=2, timeout:float=None, memory:bool=False) -> dict:
+    """
+    Time a method on a file in a new process, stopped after a timeout.
+
+    ### Args:
+        - method (str): The inference method
+        - file_name (str): The name of the file in the data/ folder
+        - repeat (int): The number of timed runs
+        - warmup (int): The number of runs before the timed ones
+        - timeout (float): The time in seconds after which the case is stopped, or None
+        - memory (bool): Whether to measure the memory allocated by a run
+
+    ### Returns:
+        - dict: The result of run_case(), or a dictionary with an error message if the case failed or timed out
+    """
+    # A new interpreter rather than a fork, whose peak RSS would start from that of this process
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_child, args=(sender, method, file_name, repeat, warmup, memory))
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(timeout):
+            return {"error": f"timeout after {timeout:g} s"}
+        return receiver.recv()
+    except EOFError:
+        return {"error": f"process exited with code {process.exitcode}"}
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        receiver.close()
+
+
+def summarize(samples:list[float]) -> dict:
+    """
+    Get the median, 95th percentile and minimum of times.
+
+    ### Args:
+        - samples (list[float]): The times
+
+    ### Returns:
+        - dict: The median, p95 and min of the times
+    """
+    p95 = statistics.quantiles(samples, n=20, method="inclusive")[-1] if len(samples) > 1 else samples[0]
+    return {
+        "median": statistics.median(samples),
+        "p95": p95,
+        "min": min(samples)
+    }
+
+
+def bench(methods:list[str], files:list[str], repeat:int=10, warmup:int=2, timeout:float=60) -> dict:
+    """
+    Run every method on every file, each in a new process.
+
+    ### Args:
+        - methods (list[str]): The inference methods
+        - files (list[str]): The names of the files in the data/ folder
+        - repeat (int): The number of timed runs of every case
+        - warmup (int): The number of runs of every case before the timed ones
+        - timeout (float): The time in seconds after which a case is stopped, or None
+
+    ### Returns:
+        - dict: The settings and machine of the run, and the result of every case, keyed by "<method> <file>"
+    """
+    cases = {}
+    for file_name in files:
+        for method in methods:
+            case = run_isolated(method, file_name, repeat, warmup, timeout)
+            case.update(method=method, file=file_name)
+            if "times" in case:
+                case["summary"] = {phase: summarize(samples) for phase, samples in case["times"].items()}
+            cases[f"{method} {file_name}"] = case
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "warmup": warmup,
+        "cases": cases
+    }
+
+
+def mann_whitney(slower:list[float], faster:list[float]) -> float:
+    """
+    One-sided Mann-Whitney U test, with the normal approximation of U corrected for ties: the probability of samples at least as ordered as these if the samples of slower were not larger than those of faster. Unlike a t-test, it does not assume times are normally distributed, and an outlier weighs no more than any other larger sample.
+
+    ### Args:
+        - slower (list[float]): The samples expected to be larger
+        - faster (list[float]): The samples expected to be smaller
+
+    ### Returns:
+        - float: The p-value
+    """
+    n, m = len(slower), len(faster)
+    # Ranks of the pooled samples, tied samples sharing the mean of their ranks
+    pooled = sorted([(value, 0) for value in slower] + [(value, 1) for value in faster])
+    ranks, ties, i = [0.0] * len(pooled), 0, 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        ties += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    u = sum(rank for rank, (_, sample) in zip(ranks, pooled) if sample == 0) - n * (n + 1) / 2
+    variance = n * m / 12 * ((n + m + 1) - ties / ((n + m) * (n + m - 1)))
+    if variance == 0:
+        return 1.0
+    # Continuity correction, as U only takes discrete values
+    z = (u - n * m / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(results:dict, baseline:dict, alpha:float=0.01, threshold:float=0.05) -> list[dict]:
+    """
+    Compare the total times of the cases run in both results and baseline.
+
+    ### Args:
+        - results (dict): The results of bench()
+        - baseline (dict): The results of bench() to compare with
+        - alpha (float): The significance level of the test
+        - threshold (float): The relative change of the median below which a significant change is ignored
+
+    ### Returns:
+        - list[dict]: For every case, the medians, their ratio, the p-values, the ratio of the peak RSS (None if unknown), and whether the case is a regression or an improvement
+    """
+    changes = []
+    for key, case in results["cases"].items():
+        before = baseline["cases"].get(key)
+        if before is None or "times" not in case or "times" not in before:
+            continue
+        new, old = case["times"]["total"], before["times"]["total"]
+        ratio = statistics.median(new) / statistics.median(old)
+        slower, faster = mann_whitney(new, old), mann_whitney(old, new)
+        status = "regression" if slower < alpha and ratio > 1 + threshold else "improvement" if faster < alpha and ratio < 1 - threshold else ""
+        changes.append({
+            "case": key,
+            "baseline": statistics.median(old),
+            "median": statistics.median(new),
+            "ratio": ratio,
+            "p_slower": slower,
+            "p_faster": faster,
+            "rss_ratio": case["peak_rss"] / before["peak_rss"] if case["peak_rss"] and before["peak_rss"] else None,
+            "status": status
+        })
+    return changes
+
+
+def report(results:dict) -> str:
+    headers = ["Method", "File", "Answer", "Parse (ms)", "CNF (ms)", "Solve (ms)", "Median (ms)", "p95 (ms)", "Min (ms)", "Peak RSS (MB)"]
+    rows = []
+    for case in results["cases"].values():
+        if "error" in case:
+            rows.append([case["method"], case["file"], case["error"]])
+            continue
+        summary = case["summary"]
+        answer = "UNKNOWN" if case["entails"] is None else "YES" if case["entails"] else "NO"
+        rows.append([case["method"], case["file"], answer]
+                    + [summary[phase]["median"] * 1000 for phase in ("parse", "cnf", "solve")]
+                    + [summary["total"][statistic] * 1000 for statistic in ("median", "p95", "min")]
+                    + ["n/a" if case["peak_rss"] is None else f"{case['peak_rss'] / 2 ** 20:.3f}"])
+    return tabulate(rows, headers, floatfmt=".3f")
+
+
+def report_comparison(changes:list[dict]) -> str:
+    headers = ["Case", "Baseline (ms)", "Median (ms)", "Change", "p (slower)", "p (faster)", "RSS change", "Status"]
+    rows = [[change["case"], change["baseline"] * 1000, change["median"] * 1000, f"{change['ratio'] - 1:+.1%}", f"{change['p_slower']:.4f}", f"{change['p_faster']:.4f}", "n/a" if change["rss_ratio"] is None else f"{change['rss_ratio'] - 1:+.1%}", change["status"].upper()] for change in changes]
+    return tabulate(rows, headers, floatfmt=".3f")
+
+
+def save(results:dict, path:str):
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+
+
+def load(path:str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def main(methods:list[str]=None, files:list[str]=None, repeat:int=10, warmup:int=2, timeout:float=60, output:str=None, baseline:str=None, alpha:float=0.01, threshold:float=0.05) -> bool:
+    """
+    Run the benchmark, print the results, save them and compare them with a baseline.
+
+    ### Returns:
+        - bool: Whether no regression was found
+    """
+    methods = methods or METHODS
+    files = files or problem_files()
+    for method in methods:
+        if method not in METHODS:
+            raise ValueError(f"Invalid method. Please use one of the following methods: {', '.join(METHODS)}")
+    for file_name in files:
+        if not os.path.exists(os.path.join(INPUT_DIR, file_name)):
+            raise FileNotFoundError(file_name)
+
+    results = bench(methods, files, repeat, warmup, timeout)
+    print(report(results))
+    if output:
+        save(results, output)
+        print(f"\nResults saved to {output}")
+    if baseline:
+        changes = compare(results, load(baseline), alpha, threshold)
+        print(f"\nComparison with {baseline} (alpha = {alpha:g}, threshold = {threshold:.0%}):")
+        print(report_comparison(changes))
+        regressions = [change["case"] for change in changes if change["status"] == "regression"]
+        if regressions:
+            print(f"\n{len(regressions)} significant regression(s): {', '.join(regressions)}")
+            return False
+    return True
+
+
+def parse_options(args:list[str]) -> dict:
+    """
+    Parse the options of the benchmark from the command line: --methods <m,m,...>, --files <f,f,...>, --repeat <n>, --warmup <n>, --timeout <seconds>, --output <path>, --baseline <path>, --alpha <level> and --threshold <fraction>.
+
+    ### Args:
+        - args (list[str]): The command line arguments
+
+    ### Returns:
+        - dict: The keyword arguments of main()
+    """
+    option = lambda name, kind, default: kind(args[args.index(name) + 1]) if name in args else default
+    split = lambda value: value.split(",")
+    return {
+        "methods": [method.upper() for method in option("--methods", split, METHODS)],
+        "files": option("--files", split, None),
+        "repeat": option("--repeat", int, 10),
+        "warmup": option("--warmup", int, 2),
+        "timeout": option("--timeout", float, 60),
+        "output": option("--output", str, None),
+        "baseline": option("--baseline", str, None),
+        "alpha": option("--alpha", float, 0.01),
+        "threshold": option("--threshold", float, 0.05)
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(**parse_options(sys.argv)) else 1)
@@ -0,0 +1,43 @@
+"""
+Benchmark for compiled sentence evaluation.
+
+Compares the per-model cost of Sentence.evaluate() with a dict model against the function produced by compiler.compile_sentence() with a tuple model, over every model of the problems in the data/ folder.
+
+Usage: python benchmarks/compiled_evaluation.py [--number <number>]
+"""
+import sys, os, timeit
+from itertools import product
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+os.chdir(parent_dir)
+
+from compiler import compile_sentence
+from parser import parse_kb_and_query, problem_files
+
+
+def main(number:int):
+    print(f"{'Problem':<20}{'Models':>8}{'evaluate (us)':>16}{'compiled (us)':>16}{'Speedup':>10}")
+    for file_name in problem_files():
+        kb, query = parse_kb_and_query(file_name)
+        symbols = sorted(kb.symbols() | query.symbols(), key=lambda x: x.name)
+        models = list(product((True, False), repeat=len(symbols)))
+        dict_models = [dict(zip(symbols, model)) for model in models]
+        evaluate = compile_sentence(kb, symbols)
+
+        def interpreted():
+            for model in dict_models:
+                kb.evaluate(model)
+
+        def compiled():
+            for model in models:
+                evaluate(model)
+
+        interpreted_time = timeit.timeit(interpreted, number=number) * 10**6 / number / len(models)
+        compiled_time = timeit.timeit(compiled, number=number) * 10**6 / number / len(models)
+        print(f"{file_name:<20}{len(models):>8}{interpreted_time:>16.4f}{compiled_time:>16.4f}{interpreted_time / compiled_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    number = int(sys.argv[sys.argv.index("--number") + 1]) if "--number" in sys.argv else 100
+    main(number)
@@ -0,0 +1,50 @@
+"""
+Benchmark for the explicit-stack CNF conversion and sentence traversal.
+
+Times to_cnf(), evaluate() and symbols() on the (shallow) problems in the data/ folder, then on implication
+chains a0 => (a1 => (... => an)) nested up to 10^5 deep, which used to raise RecursionError.
+
+Usage: python benchmarks/deep_formulas.py [--number <number>]
+"""
+import sys, os, timeit
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+os.chdir(parent_dir)
+
+from syntax import *
+from cnf import to_cnf
+from parser import parse_kb_and_query, problem_files
+
+
+def implication_chain(depth:int) -> Sentence:
+    symbols = [Symbol(f"a{i}") for i in range(depth + 1)]
+    sentence = symbols[-1]
+    for symbol in reversed(symbols[:-1]):
+        sentence = Implication(symbol, sentence)
+    return sentence
+
+
+def time_operations(sentence:Sentence, number:int) -> tuple[float, float, float]:
+    model = {symbol: True for symbol in sentence.symbols()}
+    cnf_time = timeit.timeit(lambda: to_cnf(sentence), number=number) * 1000 / number
+    evaluate_time = timeit.timeit(lambda: sentence.evaluate(model), number=number) * 1000 / number
+    symbols_time = timeit.timeit(lambda: sentence.symbols(), number=number) * 1000 / number
+    return cnf_time, evaluate_time, symbols_time
+
+
+def main(number:int):
+    print(f"{'Sentence':<20}{'Depth':>8}{'to_cnf (ms)':>14}{'evaluate (ms)':>16}{'symbols (ms)':>15}")
+    for file_name in problem_files():
+        kb, _ = parse_kb_and_query(file_name)
+        cnf_time, evaluate_time, symbols_time = time_operations(kb, number)
+        print(f"{file_name:<20}{kb.depth:>8}{cnf_time:>14.4f}{evaluate_time:>16.4f}{symbols_time:>15.4f}")
+    for depth in (10**3, 10**4, 10**5):
+        chain = implication_chain(depth)
+        cnf_time, evaluate_time, symbols_time = time_operations(chain, 1)
+        print(f"{'chain':<20}{chain.depth:>8}{cnf_time:>14.4f}{evaluate_time:>16.4f}{symbols_time:>15.4f}")
+
+
+if __name__ == "__main__":
+    number = int(sys.argv[sys.argv.index("--number") + 1]) if "--number" in sys.argv else 1000
+    main(number)
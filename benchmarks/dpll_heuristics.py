@@ -0,0 +1,49 @@
+"""
+Benchmark for the DPLL branching heuristics.
+
+Runs DPLL with every branching heuristic, with and without phase saving, on random 3-SAT instances near the phase transition (about 4.26 clauses per variable), where instances are hardest and about half of them are satisfiable. Reports the mean number of decisions and the mean time per instance.
+
+Usage: python benchmarks/dpll_heuristics.py [--variables <n,n,...>] [--instances <number>] [--ratio <ratio>] [--seed <seed>]
+"""
+import sys, os, random, timeit
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from methods import DPLL
+from heuristics import HEURISTICS
+
+
+def random_3sat(variables:int, ratio:float, rng:random.Random) -> list[Sentence]:
+    symbols = [Symbol(f"x{i}") for i in range(variables)]
+    clauses = []
+    for _ in range(round(variables * ratio)):
+        literals = [symbol if rng.random() < 0.5 else Negation(symbol) for symbol in rng.sample(symbols, 3)]
+        clauses.append(Disjunction(*literals))
+    return clauses
+
+
+def main(sizes:list[int], instances:int, ratio:float, seed:int):
+    configurations = [(heuristic, phase_saving) for heuristic in HEURISTICS for phase_saving in (False, True)]
+    print(f"{'Variables':>10}{'Heuristic':>12}{'Phases':>8}{'SAT':>6}{'Decisions':>12}{'Time (ms)':>12}")
+    for size in sizes:
+        rng = random.Random(seed)
+        problems = [random_3sat(size, ratio, rng) for _ in range(instances)]
+        for heuristic, phase_saving in configurations:
+            decisions, time, satisfiable = 0, 0, 0
+            for clauses in problems:
+                solver = DPLL.from_clauses(clauses, heuristic, phase_saving)
+                result = {}
+                time += timeit.timeit(lambda: result.update(solver.solve()), number=1) * 1000
+                decisions += solver.decisions
+                satisfiable += not result["entails"]
+            print(f"{size:>10}{heuristic:>12}{'yes' if phase_saving else 'no':>8}{satisfiable:>6}{decisions / instances:>12.1f}{time / instances:>12.2f}")
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[sys.argv.index("--variables") + 1].split(",")] if "--variables" in sys.argv else [25, 50, 75]
+    instances = int(sys.argv[sys.argv.index("--instances") + 1]) if "--instances" in sys.argv else 10
+    ratio = float(sys.argv[sys.argv.index("--ratio") + 1]) if "--ratio" in sys.argv else 4.26
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 1
+    main(sizes, instances, ratio, seed)
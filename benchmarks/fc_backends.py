@@ -0,0 +1,52 @@
+"""
+Benchmark of the backends of forward chaining.
+
+Times ForwardChaining with the python and numpy backends on Horn knowledge bases of generator.py of growing size, for a symbol of no sentence so the whole closure is computed. The numpy backend is timed on its first query, which builds its arrays, and on the next ones, which reuse them (the arrays alone are timed in the Compile column).
+
+Usage: python benchmarks/fc_backends.py [--sizes <n,n,...>] [--repeat <n>] [--seed <seed>]
+"""
+import sys, os, time, timeit
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from tabulate import tabulate
+from syntax import *
+from parser import parse, tokenize, sanitize, KB_SEPARATOR
+from generator import generate
+from methods.forward_chaining import ForwardChaining, np
+
+
+def horn_kb(size:int, seed:int) -> Conjunction:
+    kb = generate("horn", size, seed)[0].split("\n")[1]
+    return Conjunction(*[parse(tokenize(sanitize(text))) for text in kb.split(KB_SEPARATOR) if sanitize(text)])
+
+
+def main(sizes:list[int], repeat:int, seed:int):
+    if np is None:
+        raise ValueError("The numpy backend needs NumPy, which is not installed")
+    rows = []
+    for size in sizes:
+        kb = horn_kb(size, seed)
+        # A symbol of no sentence, so forward chaining computes the whole closure
+        query = Symbol("unknown")
+        python = min(timeit.repeat(ForwardChaining(kb, query).solve, number=1, repeat=repeat))
+        firsts = []
+        for _ in range(repeat):
+            solver = ForwardChaining(kb, query, backend="numpy")
+            start = time.perf_counter()
+            solver.solve()
+            firsts.append(time.perf_counter() - start)
+        first = min(firsts)
+        compile_time = min(timeit.repeat(solver.compile, number=1, repeat=repeat))
+        again = min(timeit.repeat(solver.solve, number=1, repeat=repeat))
+        rows.append([size, solver.agenda_pops // (repeat + 1), python * 1000, first * 1000, compile_time * 1000, again * 1000, python / first, python / again])
+
+    print(tabulate(rows, ["Clauses", "Agenda pops", "Python (ms)", "NumPy (ms)", "Compile (ms)", "NumPy again (ms)", "Speedup", "Speedup again"], floatfmt=".1f", intfmt=","))
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[sys.argv.index("--sizes") + 1].split(",")] if "--sizes" in sys.argv else [10000, 100000, 1000000]
+    repeat = int(sys.argv[sys.argv.index("--repeat") + 1]) if "--repeat" in sys.argv else 3
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 0
+    main(sizes, repeat, seed)
@@ -0,0 +1,74 @@
+"""
+Benchmark of incremental forward chaining.
+
+Streams the sentences of a Horn knowledge base of generator.py into IncrementalForwardChaining one at a time, in a random order (--order shuffled, by default), rules before facts (rules-first) or facts before rules (facts-first), and reports the throughput of the additions (sentences told per second) and their latency. Every addition closes the knowledge base under its rules again, so it is compared with recomputing the closure with ForwardChaining after every addition, timed once on the whole knowledge base (the speedup is the time of a recompute per addition over the time of an addition).
+Random facts and rules are then retracted one at a time (--retractions, 100 by default), reporting the median time of a retraction and the mean number of symbols it deletes, including those inferred again.
+
+Usage: python benchmarks/incremental_fc.py [--sizes <n,n,...>] [--order <order>] [--repeat <n>] [--retractions <n>] [--seed <seed>]
+"""
+import sys, os, random, statistics, time, timeit
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from tabulate import tabulate
+from syntax import *
+from parser import parse, tokenize, sanitize, KB_SEPARATOR
+from generator import generate
+from methods import ForwardChaining
+from incremental import IncrementalForwardChaining
+
+ORDERS = ("shuffled", "rules-first", "facts-first")
+
+
+def stream(size:int, order:str, seed:int) -> list[Sentence]:
+    kb = generate("horn", size, seed)[0].split("\n")[1]
+    sentences = [parse(tokenize(sanitize(text))) for text in kb.split(KB_SEPARATOR) if sanitize(text)]
+    random.Random(seed).shuffle(sentences)
+    if order != "shuffled":
+        # Stable, so the sentences of each kind stay shuffled
+        sentences.sort(key=lambda sentence: isinstance(sentence, Symbol) == (order == "rules-first"))
+    return sentences
+
+
+def main(sizes:list[int], order:str, repeat:int, retractions:int, seed:int):
+    rows = []
+    for size in sizes:
+        sentences = stream(size, order, seed)
+        latencies, totals = [], []
+        for _ in range(repeat):
+            solver = IncrementalForwardChaining()
+            start = time.perf_counter()
+            for sentence in sentences:
+                before = time.perf_counter()
+                solver.tell(sentence)
+                latencies.append(time.perf_counter() - before)
+            totals.append(time.perf_counter() - start)
+        inferred = sum(1 for position in solver.position if position)
+        # A symbol of no sentence, so forward chaining computes the whole closure
+        recompute = ForwardChaining(Conjunction(*sentences), Symbol("unknown"))
+        recompute_time = min(timeit.repeat(recompute.solve, number=1, repeat=repeat))
+        retract_times = []
+        deletions = solver.deletions
+        for sentence in random.Random(seed).sample(sentences, min(retractions, len(sentences))):
+            before = time.perf_counter()
+            solver.retract(sentence)
+            retract_times.append(time.perf_counter() - before)
+        deleted = (solver.deletions - deletions) / len(retract_times)
+        total = statistics.median(totals)
+        p50, p99 = statistics.quantiles(latencies, n=100)[49], statistics.quantiles(latencies, n=100)[98]
+        rows.append([size, inferred, total * 1000, len(sentences) / total, p50 * 10 ** 6, p99 * 10 ** 6, recompute_time * 1000, recompute_time * len(sentences) / total, statistics.median(retract_times) * 10 ** 6, deleted])
+
+    print(f"Additions in {order} order, then {retractions} retractions")
+    print(tabulate(rows, ["Sentences", "Inferred", "Total (ms)", "Additions/s", "p50 (µs)", "p99 (µs)", "Recompute (ms)", "Speedup", "Retraction (µs)", "Deleted"], floatfmt=".1f", intfmt=","))
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[sys.argv.index("--sizes") + 1].split(",")] if "--sizes" in sys.argv else [1000, 10000, 100000]
+    order = sys.argv[sys.argv.index("--order") + 1] if "--order" in sys.argv else "shuffled"
+    if order not in ORDERS:
+        raise ValueError(f"Unknown order '{order}', expected one of: {', '.join(ORDERS)}")
+    repeat = int(sys.argv[sys.argv.index("--repeat") + 1]) if "--repeat" in sys.argv else 3
+    retractions = int(sys.argv[sys.argv.index("--retractions") + 1]) if "--retractions" in sys.argv else 100
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 0
+    main(sizes, order, repeat, retractions, seed)
@@ -0,0 +1,44 @@
+"""
+Benchmark for model counting.
+
+Times Truth Table and Model Counting on Horn knowledge bases of growing size, where every rule x_i derives from two of the previous few symbols. Without facts the KB has a large number of models, so the count cannot be obtained by unit propagation alone. Truth Table is only run while it stays practical.
+
+Usage: python benchmarks/model_counting.py [--sizes <n,n,...>] [--seed <seed>]
+"""
+import sys, os, random, timeit
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from methods import TruthTable, ModelCounting
+
+# Largest number of symbols the truth table is run on
+MAX_TRUTH_TABLE_SYMBOLS = 16
+
+
+def horn_kb(size:int, seed:int):
+    rng = random.Random(seed)
+    symbols = [Symbol(f"x{i}") for i in range(size)]
+    rules = [Implication(Conjunction(*rng.sample(symbols[max(0, i - 6):i], 2)), symbols[i]) for i in range(2, size)]
+    return Conjunction(*rules), symbols[-1]
+
+
+def main(sizes:list[int], seed:int):
+    print(f"{'Symbols':>8}{'KB models':>14}{'TT (ms)':>12}{'MC (ms)':>12}{'Cache':>8}")
+    for size in sizes:
+        kb, query = horn_kb(size, seed)
+        solver = ModelCounting(kb, query)
+        mc_time = timeit.timeit(solver.solve, number=1) * 1000
+        if size <= MAX_TRUTH_TABLE_SYMBOLS:
+            tt_time = f"{timeit.timeit(TruthTable(kb, query).solve, number=1) * 1000:.2f}"
+        else:
+            tt_time = "-"
+        models = f"{solver.kb_models_count:.3e}" if solver.kb_models_count >= 10**9 else str(solver.kb_models_count)
+        print(f"{size:>8}{models:>14}{tt_time:>12}{mc_time:>12.2f}{len(solver.cache):>8}")
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[sys.argv.index("--sizes") + 1].split(",")] if "--sizes" in sys.argv else [8, 12, 16, 50, 100, 200, 400]
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 1
+    main(sizes, seed)
@@ -0,0 +1,45 @@
+"""
+Benchmark of parallel forward chaining.
+
+Times the numpy backend of ForwardChaining on Horn knowledge bases of generator.py of growing size, for a symbol of no sentence so the whole closure is computed, with the rules sharded over a growing number of worker processes (1 runs the rounds in this process). The arrays are built before the timed runs, while the time of a run includes starting the workers and copying their arrays to shared memory. The speedup is over one worker, and cannot go beyond the number of CPUs, printed first.
+
+Usage: python benchmarks/parallel_fc.py [--sizes <n,n,...>] [--workers <n,n,...>] [--repeat <n>] [--seed <seed>]
+"""
+import sys, os, timeit
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from tabulate import tabulate
+from syntax import *
+from methods.forward_chaining import ForwardChaining, np
+from fc_backends import horn_kb
+
+
+def main(sizes:list[int], workers:list[int], repeat:int, seed:int):
+    if np is None:
+        raise ValueError("The numpy backend needs NumPy, which is not installed")
+    rows = []
+    for size in sizes:
+        kb = horn_kb(size, seed)
+        # A symbol of no sentence, so forward chaining computes the whole closure
+        solver = ForwardChaining(kb, Symbol("unknown"), backend="numpy")
+        # Builds the arrays, kept by the solver for every number of workers
+        solver.solve()
+        single = None
+        for number in workers:
+            solver.workers = number
+            time = min(timeit.repeat(solver.solve, number=1, repeat=repeat))
+            single = single or time
+            rows.append([size, number, time * 1000, single / time])
+
+    print(f"{os.cpu_count()} CPUs")
+    print(tabulate(rows, ["Clauses", "Workers", "Time (ms)", "Speedup"], floatfmt=".2f", intfmt=","))
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[sys.argv.index("--sizes") + 1].split(",")] if "--sizes" in sys.argv else [100000, 1000000]
+    workers = [int(number) for number in sys.argv[sys.argv.index("--workers") + 1].split(",")] if "--workers" in sys.argv else [1, 2, 4, 8]
+    repeat = int(sys.argv[sys.argv.index("--repeat") + 1]) if "--repeat" in sys.argv else 3
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 0
+    main(sizes, workers, repeat, seed)
@@ -0,0 +1,84 @@
+"""
+Scaling benchmark of the inference methods.
+
+Runs every method on problems of a family of generator.py of growing size, with the cases of the benchmark suite (bench.py): every size in a new process, timing parsing, building the solver and solving, and measuring the peak memory allocated (tracemalloc) and the peak RSS. A method stops growing once its median time passes a limit, which shows where it falls off a cliff.
+
+The growth exponent of a method is the slope of the least squares line through log(time) against log(clauses), on the sizes from --fit-from clauses: about 1 for a linear method, 2 for a quadratic one, and growing with the size for an exponential one (such as the truth table, whose last exponents are the telling ones). The exponent of the memory is fitted in the same way.
+
+Usage: python benchmarks/scaling.py [--methods <m,m,...>] [--family <family>] [--sizes <n,n,...>] [--limit <seconds>] [--repeat <n>] [--fit-from <clauses>] [--seed <seed>] [--csv <path>]
+"""
+import sys, os, csv, math, statistics, tempfile
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from tabulate import tabulate
+from bench import METHODS, run_isolated
+from generator import generate
+
+# Columns of the CSV file, written even when no case ran
+FIELDS = ["method", "family", "clauses", "parse_ms", "cnf_ms", "solve_ms", "total_ms", "peak_memory_kb", "peak_rss_mb"]
+
+
+def growth_exponent(sizes:list[int], values:list[float]) -> float | None:
+    # Slope of the least squares line of log(value) against log(size)
+    points = [(math.log(size), math.log(value)) for size, value in zip(sizes, values) if value > 0]
+    if len(points) < 2:
+        return None
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / sum((x - mean_x) ** 2 for x, _ in points)
+
+
+def main(methods:list[str], family:str, sizes:list[int], limit:float, repeat:int, fit_from:int, seed:int, csv_path:str):
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        files = {}
+        for size in sizes:
+            # The parser reads an absolute path as is
+            files[size] = os.path.join(directory, f"{family}_{size}.txt")
+            with open(files[size], "w") as file:
+                file.write(generate(family, size, seed, timeout=limit)[0])
+        for method in methods:
+            for size in sizes:
+                # Enough time for the warmup, timed and traced runs (the traced one being slower) of a case past the limit
+                case = run_isolated(method, files[size], repeat, 1, 2 * limit * (repeat + 4) + 10, memory=True)
+                if "error" in case:
+                    print(f"{method} on {size} clauses: {case['error']}", file=sys.stderr)
+                    break
+                medians = {phase: statistics.median(times) for phase, times in case["times"].items()}
+                rows.append({"method": method, "family": family, "clauses": size,
+                             **{f"{phase}_ms": medians[phase] * 1000 for phase in ("parse", "cnf", "solve", "total")},
+                             "peak_memory_kb": case["peak_memory"] / 1024, "peak_rss_mb": None if case["peak_rss"] is None else case["peak_rss"] / 2 ** 20})
+                print(f"{method} on {size} clauses: {medians['total'] * 1000:.2f} ms", file=sys.stderr)
+                if medians["total"] > limit:
+                    break
+
+    print(tabulate([row.values() for row in rows], ["Method", "Family", "Clauses", "Parse (ms)", "CNF (ms)", "Solve (ms)", "Total (ms)", "Peak memory (KB)", "Peak RSS (MB)"], floatfmt=".2f", missingval="n/a"))
+    if csv_path:
+        with open(csv_path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nResults saved to {csv_path}")
+
+    fits = []
+    for method in methods:
+        fitted = [row for row in rows if row["method"] == method and row["clauses"] >= fit_from]
+        exponents = [growth_exponent([row["clauses"] for row in fitted], [row[column] for row in fitted]) for column in ("cnf_ms", "solve_ms", "total_ms", "peak_memory_kb")]
+        largest = max((row["clauses"] for row in rows if row["method"] == method), default=None)
+        fits.append([method, largest] + ["-" if exponent is None else f"{exponent:.2f}" for exponent in exponents])
+    print(f"\nGrowth exponents (time or memory ~ clauses^k, from {fit_from} clauses):")
+    print(tabulate(fits, ["Method", "Largest size", "CNF", "Solve", "Total", "Memory"]))
+
+
+if __name__ == "__main__":
+    methods = [method.upper() for method in sys.argv[sys.argv.index("--methods") + 1].split(",")] if "--methods" in sys.argv else METHODS
+    family = sys.argv[sys.argv.index("--family") + 1] if "--family" in sys.argv else "horn"
+    sizes = [int(size) for size in sys.argv[sys.argv.index("--sizes") + 1].split(",")] if "--sizes" in sys.argv else [10, 30, 100, 300, 1000, 3000, 10000, 30000]
+    limit = float(sys.argv[sys.argv.index("--limit") + 1]) if "--limit" in sys.argv else 2
+    repeat = int(sys.argv[sys.argv.index("--repeat") + 1]) if "--repeat" in sys.argv else 3
+    fit_from = int(sys.argv[sys.argv.index("--fit-from") + 1]) if "--fit-from" in sys.argv else 100
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 0
+    csv_path = sys.argv[sys.argv.index("--csv") + 1] if "--csv" in sys.argv else None
+    main(methods, family, sizes, limit, repeat, fit_from, seed, csv_path)
@@ -0,0 +1,42 @@
+"""
+Benchmark for independent-component decomposition.
+
+Builds knowledge bases made of several copies of the same small theory over disjoint symbols (as if one TELL was assembled from unrelated sources), and times TT, RES and DPLL on the whole problem against Decomposition with 1 worker and with a worker per CPU. Runs on the whole problem are skipped when they would take too long.
+
+Usage: python benchmarks/split_components.py [--copies <n,n,...>]
+"""
+import sys, os, io, contextlib, timeit
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from methods import TruthTable, Resolution, DPLL, Decomposition
+
+SOLVERS = {"TT": TruthTable, "RES": Resolution, "DPLL": DPLL}
+# Largest number of copies each method is run on without splitting
+MAX_WHOLE_COPIES = {"TT": 3, "RES": 2, "DPLL": 8}
+
+
+def theory(copy:int) -> list[Sentence]:
+    # (a & b) => c; c => d; a; b; d => e; ~e || f || g, over symbols renamed for the copy
+    a, b, c, d, e, f, g = (Symbol(f"{name}{copy}") for name in "abcdefg")
+    return [Implication(Conjunction(a, b), c), Implication(c, d), a, b, Implication(d, e), Disjunction(Negation(e), f, g)]
+
+
+def main(copies:list[int]):
+    print(f"{'Method':<8}{'Copies':>8}{'Whole (ms)':>14}{'Split x1 (ms)':>16}{f'Split x{os.cpu_count()} (ms)':>16}")
+    for method, solver_class in SOLVERS.items():
+        for number in copies:
+            kb = Conjunction(*[sentence for copy in range(number) for sentence in theory(copy)])
+            query = Symbol("e0")
+            with contextlib.redirect_stdout(io.StringIO()):
+                whole = f"{timeit.timeit(lambda: solver_class(kb, query).solve(), number=1) * 1000:.2f}" if number <= MAX_WHOLE_COPIES[method] else "-"
+                single = timeit.timeit(lambda: Decomposition(method, kb, query, workers=1).solve(), number=1) * 1000
+                parallel = timeit.timeit(lambda: Decomposition(method, kb, query).solve(), number=1) * 1000
+            print(f"{method:<8}{number:>8}{whole:>14}{single:>16.2f}{parallel:>16.2f}")
+
+
+if __name__ == "__main__":
+    copies = [int(number) for number in sys.argv[sys.argv.index("--copies") + 1].split(",")] if "--copies" in sys.argv else [1, 2, 3, 8, 32]
+    main(copies)
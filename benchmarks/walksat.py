@@ -0,0 +1,42 @@
+"""
+Benchmark for WalkSAT.
+
+Times WalkSAT and DPLL on random 3-SAT instances below the phase transition, which are almost always satisfiable: a query whose answer is NO gives such a problem, as KB ∧ ¬query has a model. DPLL is stopped after a timeout.
+
+Usage: python benchmarks/walksat.py [--variables <n,n,...>] [--ratio <ratio>] [--timeout <seconds>] [--seed <seed>]
+"""
+import sys, os, random, timeit
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from methods import DPLL, WalkSAT
+from budget import Budget
+
+
+def random_3sat(variables:int, ratio:float, rng:random.Random) -> list[Sentence]:
+    symbols = [Symbol(f"x{i}") for i in range(variables)]
+    return [Disjunction(*(symbol if rng.random() < 0.5 else Negation(symbol) for symbol in rng.sample(symbols, 3))) for _ in range(round(variables * ratio))]
+
+
+def main(sizes:list[int], ratio:float, timeout:float, seed:int):
+    print(f"{'Variables':>10}{'Clauses':>10}{'Flips':>10}{'WalkSAT (ms)':>14}{'DPLL (ms)':>12}")
+    rng = random.Random(seed)
+    for size in sizes:
+        clauses = random_3sat(size, ratio, rng)
+        walksat = WalkSAT.from_clauses(clauses)
+        walksat_time = timeit.timeit(walksat.solve, number=1) * 1000
+        dpll = DPLL.from_clauses(clauses, budget=Budget(timeout=timeout))
+        result = {}
+        dpll_time = timeit.timeit(lambda: result.update(dpll.solve()), number=1) * 1000
+        dpll_time = f"{dpll_time:.2f}" if result["entails"] is not None else f">{timeout * 1000:.0f}"
+        print(f"{size:>10}{len(clauses):>10}{walksat.flips:>10}{walksat_time:>14.2f}{dpll_time:>12}")
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[sys.argv.index("--variables") + 1].split(",")] if "--variables" in sys.argv else [100, 200, 400, 800]
+    ratio = float(sys.argv[sys.argv.index("--ratio") + 1]) if "--ratio" in sys.argv else 4.0
+    timeout = float(sys.argv[sys.argv.index("--timeout") + 1]) if "--timeout" in sys.argv else 30
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 1
+    main(sizes, ratio, timeout, seed)
@@ -0,0 +1,138 @@
+"""
+This module contains resource budgets, which bound the work of a solver so it gives up with an UNKNOWN answer instead of running unbounded, and the restart policies of DPLL.
+
+A budget can limit the wall-clock time, the number of conflicts and decisions (DPLL), the number of resolvents (Resolution) and the peak memory of the process. Solvers call Budget.check() as they work, which raises BudgetExhausted once a limit is passed; solve() then returns UNKNOWN. A budget can also be cancelled from another thread, which stops the solver at its next check.
+
+### Functions:
+    - luby(i: int) -> int: Get the i-th term of the Luby sequence (1, 1, 2, 1, 1, 2, 4, ...).
+    - restart_limits(policy: str, base: int, factor: float) -> Iterator[int]: Get the number of conflicts allowed to every run of a restarting search.
+    - peak_memory() -> int | None: Get the peak memory of the process, in bytes, or None where it is not available.
+
+### Classes:
+    - Budget: The limits of a solver run.
+    - BudgetExhausted: The exception raised when a limit is passed.
+"""
+import sys, time, itertools
+
+try:
+    import resource
+except ImportError: # Not available on Windows
+    resource = None
+
+# Result of a solver that ran out of budget
+UNKNOWN = { "entails": None, "message": "UNKNOWN: budget exhausted" }
+
+RESTART_POLICIES = ("luby", "geometric")
+
+
+def luby(i: int) -> int:
+    # The sequence is made of repeated halves: find the smallest 2^k - 1 >= i
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while i != (1 << k) - 1:
+        # Inside the sequence: the term is the one at the same position in the previous half
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+def restart_limits(policy: str, base: int = 100, factor: float = 1.5):
+    """
+    Get the number of conflicts allowed to every run of a restarting search. The limits grow without bound, so a search that keeps restarting stays complete.
+
+    ### Args:
+        - policy (str): "luby" for base times the Luby sequence, or "geometric" for base times powers of factor
+        - base (int): The number of conflicts of the first run
+        - factor (float): The growth of the limit between runs (geometric only)
+
+    ### Returns:
+        - Iterator[int]: The limits of the successive runs
+    """
+    if policy not in RESTART_POLICIES:
+        raise ValueError(f"Unknown restart policy '{policy}', expected one of: {', '.join(RESTART_POLICIES)}")
+    return (base * luby(i) if policy == "luby" else int(base * factor ** (i - 1)) for i in itertools.count(1))
+
+def peak_memory() -> int | None:
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+class BudgetExhausted(Exception):
+    """
+    The exception raised by Budget.check() when a limit of the budget is passed.
+    """
+    pass
+
+
+class Budget:
+    """
+    The class to represent the resource budget of a solver. Every limit is optional.
+
+    ### Attributes:
+        - timeout (float): The maximum wall-clock time, in seconds.
+        - conflicts (int): The maximum number of conflicts (DPLL).
+        - decisions (int): The maximum number of decisions (DPLL).
+        - resolvents (int): The maximum number of resolvents generated (Resolution).
+        - memory (int): The maximum peak memory of the process, in megabytes.
+        - deadline (float): The time.perf_counter() value at which the time runs out.
+        - reason (str): The limit that was passed, if any.
+        - cancelled (bool): Whether the run was cancelled.
+
+    ### Methods:
+        - start(): Start the clock.
+        - check(conflicts: int, decisions: int, resolvents: int): Raise BudgetExhausted if a limit is passed.
+        - cancel(): Stop the run at its next check. Safe to call from another thread.
+        - copy(): Get a new budget with the same limits, not started or cancelled.
+    """
+    # The peak memory is only read once every this number of checks, as it needs a system call
+    MEMORY_CHECK_INTERVAL = 1000
+
+    def __init__(self, timeout:float=None, conflicts:int=None, decisions:int=None, resolvents:int=None, memory:int=None):
+        if memory is not None and resource is None:
+            raise ValueError("A memory budget is not available on this platform")
+        self.timeout = timeout
+        self.conflicts = conflicts
+        self.decisions = decisions
+        self.resolvents = resolvents
+        self.memory = memory
+        self.deadline = None
+        self.reason = None
+        self.cancelled = False
+        self._checks = 0
+
+    def start(self):
+        self.deadline = time.perf_counter() + self.timeout if self.timeout is not None else None
+        self.reason = None
+        self._checks = 0
+
+    def cancel(self):
+        # Not cleared by start(): a run cancelled before it starts stops at its first check
+        self.cancelled = True
+
+    def copy(self) -> "Budget":
+        return Budget(self.timeout, self.conflicts, self.decisions, self.resolvents, self.memory)
+
+    def check(self, conflicts:int=0, decisions:int=0, resolvents:int=0):
+        if self.cancelled:
+            self._exhaust("cancelled")
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            self._exhaust("timeout")
+        if self.conflicts is not None and conflicts > self.conflicts:
+            self._exhaust("conflicts")
+        if self.decisions is not None and decisions > self.decisions:
+            self._exhaust("decisions")
+        if self.resolvents is not None and resolvents > self.resolvents:
+            self._exhaust("resolvents")
+        if self.memory is not None:
+            self._checks += 1
+            if self._checks % self.MEMORY_CHECK_INTERVAL == 1 and peak_memory() > self.memory * 1024 * 1024:
+                self._exhaust("memory")
+
+    def _exhaust(self, reason:str):
+        self.reason = reason
+        raise BudgetExhausted(reason)
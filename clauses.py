@@ -0,0 +1,213 @@
+"""
+This module contains functions to encode sentences as integer clauses, the representation used by the clause-based solvers.
+
+Symbols are numbered from 1 in the order of the given symbol list. A literal is the number of its symbol, negated for a negative literal, and a clause is a frozenset of literals.
+Like to_cnf(), the encoding drops tautological clauses (containing a literal and its complement), which are always true.
+
+### Functions:
+    - symbol_index(symbols: list[Symbol]) -> dict[Symbol, int]: Number the symbols from 1.
+    - encode(sentence: Sentence, index: dict[Symbol, int]) -> list[frozenset[int]]: Encode a sentence as a list of integer clauses.
+    - encode_clauses(clauses: Iterable[Sentence]) -> tuple[list[Symbol], list[frozenset[int]]]: Encode clauses produced by to_cnf() as integer clauses.
+    - variables(clauses: Iterable[frozenset[int]]) -> set[int]: Get the variables of a set of clauses.
+    - components(clauses: Iterable[frozenset[int]]) -> list[list[frozenset[int]]]: Split clauses into groups that share no variable.
+    - elimination_order(clauses: Iterable[frozenset[int]]) -> list[int]: Order the variables by greedy min-degree elimination.
+    - propagate(clauses: frozenset[frozenset[int]]) -> tuple[frozenset[frozenset[int]] | None, set[int]]: Apply unit propagation to a set of clauses.
+    - satisfiable(clauses: Iterable[frozenset[int]]) -> bool: Check if a set of clauses has a model.
+"""
+from typing import Iterable
+from syntax import *
+from cnf import _to_nnf, _clause_sets
+
+# Number of assignments propagate() makes by scanning the clauses before indexing them by literal
+SCAN_LIMIT = 4
+
+
+def symbol_index(symbols: list[Symbol]) -> dict[Symbol, int]:
+    return {symbol: i for i, symbol in enumerate(symbols, start=1)}
+
+def encode(sentence: Sentence, index: dict[Symbol, int]) -> list[frozenset[int]]:
+    """
+    Encode a sentence as an equivalent list of integer clauses.
+
+    ### Args:
+        - sentence (Sentence): The sentence to encode
+        - index (dict[Symbol, int]): The number of every symbol of the sentence
+
+    ### Returns:
+        - list[frozenset[int]]: The clauses, without duplicates or tautologies. An unsatisfiable sentence may produce an empty clause; a valid one produces no clause.
+    """
+    clauses = []
+    for clause in _clause_sets(_to_nnf(sentence)):
+        literals = frozenset(-index[literal.arg] if isinstance(literal, Negation) else index[literal] for literal in clause)
+        if not any(-literal in literals for literal in literals):
+            clauses.append(literals)
+    return list(dict.fromkeys(clauses))
+
+def encode_clauses(clauses: Iterable[Sentence]) -> tuple[list[Symbol], list[frozenset[int]]]:
+    """
+    Encode clauses produced by to_cnf() (literals and disjunctions of literals) as integer clauses, literal by literal.
+
+    ### Args:
+        - clauses (Iterable[Sentence]): The clauses to encode
+
+    ### Returns:
+        - tuple[list[Symbol], list[frozenset[int]]]: The symbols of the clauses sorted by name, numbered from 1 in that order, and the clauses without duplicates.
+    """
+    clauses = list(clauses)
+    symbols = sorted(set().union(*(clause.symbols() for clause in clauses)), key=lambda x: x.name)
+    index = symbol_index(symbols)
+    to_literal = lambda literal: -index[literal.arg] if isinstance(literal, Negation) else index[literal]
+    int_clauses = list(dict.fromkeys(
+        frozenset(map(to_literal, clause.args if isinstance(clause, Disjunction) else (clause,)))
+        for clause in clauses))
+    return symbols, int_clauses
+
+def variables(clauses: Iterable[frozenset[int]]) -> set[int]:
+    return {abs(literal) for clause in clauses for literal in clause}
+
+def components(clauses: Iterable[frozenset[int]]) -> list[list[frozenset[int]]]:
+    """
+    Split clauses into connected components: two clauses are in the same component if they are linked by a chain of clauses sharing variables. Components can be solved independently.
+
+    ### Args:
+        - clauses (Iterable[frozenset[int]]): The clauses to split
+
+    ### Returns:
+        - list[list[frozenset[int]]]: The clauses of every component, in order of first appearance
+    """
+    clauses = list(clauses)
+    occurrences = {}
+    for clause in clauses:
+        for literal in clause:
+            occurrences.setdefault(abs(literal), []).append(clause)
+
+    # Breadth-first over clauses sharing variables
+    groups = []
+    grouped = set()
+    for clause in clauses:
+        if clause in grouped:
+            continue
+        grouped.add(clause)
+        group = [clause]
+        visited = set()
+        for member in group:
+            for literal in member:
+                variable = abs(literal)
+                if variable in visited:
+                    continue
+                visited.add(variable)
+                for neighbour in occurrences[variable]:
+                    if neighbour not in grouped:
+                        grouped.add(neighbour)
+                        group.append(neighbour)
+        groups.append(group)
+    return groups
+
+def elimination_order(clauses: Iterable[frozenset[int]]) -> list[int]:
+    """
+    Order the variables by greedy min-degree elimination on the primal graph (variables are adjacent if they share a clause): repeatedly remove the variable with the fewest neighbours and connect its neighbours together.
+    Variables eliminated last are the ones that separate the graph, so branching on them first splits the clauses into components early.
+
+    ### Args:
+        - clauses (Iterable[frozenset[int]]): The clauses to order the variables of
+
+    ### Returns:
+        - list[int]: The variables in elimination order, ties broken by the smallest variable
+    """
+    neighbours = {}
+    for clause in clauses:
+        clause_variables = {abs(literal) for literal in clause}
+        for variable in clause_variables:
+            neighbours.setdefault(variable, set()).update(clause_variables)
+    for variable, adjacent in neighbours.items():
+        adjacent.discard(variable)
+
+    order = []
+    while neighbours:
+        variable = min(neighbours, key=lambda x: (len(neighbours[x]), x))
+        adjacent = neighbours.pop(variable)
+        for neighbour in adjacent:
+            neighbours[neighbour].discard(variable)
+            neighbours[neighbour].update(adjacent - {neighbour})
+        order.append(variable)
+    return order
+
+def propagate(clauses: frozenset[frozenset[int]]) -> tuple[frozenset[frozenset[int]] | None, set[int]]:
+    """
+    Apply unit propagation: assign the literal of every unit clause, remove the clauses it satisfies and its complement from the other clauses, until there is no unit clause left.
+
+    ### Args:
+        - clauses (frozenset[frozenset[int]]): The clauses to simplify
+
+    ### Returns:
+        - tuple[frozenset[frozenset[int]] | None, set[int]]: The simplified clauses (None if a conflict was found) and the assigned literals
+    """
+    assigned = set()
+    if frozenset() in clauses:
+        return None, assigned
+    units = [clause for clause in clauses if len(clause) == 1]
+    clauses = set(clauses)
+    # A few assignments are cheapest as scans over the clauses; longer cascades index the clauses by literal,
+    # so each assignment only visits the clauses it touches
+    occurrences = None
+    def remove(clause):
+        clauses.discard(clause)
+        for literal in clause:
+            occurrences[literal].discard(clause)
+
+    while units:
+        literal = next(iter(units.pop()))
+        if literal in assigned:
+            continue
+        if -literal in assigned:
+            return None, assigned
+        assigned.add(literal)
+        if occurrences is None and len(assigned) > SCAN_LIMIT:
+            occurrences = {}
+            for clause in clauses:
+                for other in clause:
+                    occurrences.setdefault(other, set()).add(clause)
+        if occurrences is None:
+            touched = [clause for clause in clauses if literal in clause or -literal in clause]
+            clauses.difference_update(touched)
+        else:
+            touched = list(occurrences.get(literal, ())) + list(occurrences.get(-literal, ()))
+            for clause in touched:
+                remove(clause)
+        for clause in touched:
+            if literal in clause:
+                continue
+            clause = clause - {-literal}
+            if not clause:
+                return None, assigned
+            if clause not in clauses:
+                clauses.add(clause)
+                if occurrences is not None:
+                    for other in clause:
+                        occurrences.setdefault(other, set()).add(clause)
+                if len(clause) == 1:
+                    units.append(clause)
+    return frozenset(clauses), assigned
+
+def satisfiable(clauses: Iterable[frozenset[int]]) -> bool:
+    """
+    Check if a set of clauses has a model, with a DPLL search on an explicit stack.
+
+    ### Args:
+        - clauses (Iterable[frozenset[int]]): The clauses to check
+
+    ### Returns:
+        - bool: True if the clauses are satisfiable, False otherwise
+    """
+    stack = [frozenset(clauses)]
+    while stack:
+        simplified, _ = propagate(stack.pop())
+        if simplified is None:
+            continue
+        if not simplified:
+            return True
+        # Branch on a literal of a shortest clause, so one of the branches propagates quickly
+        literal = next(iter(min(simplified, key=len)))
+        stack.append(simplified | {frozenset((-literal,))})
+        stack.append(simplified | {frozenset((literal,))})
+    return False
@@ -3,13 +3,21 @@ This module contains functions to convert a given sentence to Conjunctive Normal
 
 CNF is a form of first-order logic where each sentence is a conjunction of disjunctions of literals. This form is useful for resolution-based algorithms.
 
+All conversions use explicit stacks instead of recursion, so deeply nested sentences (e.g. long implication chains) do not hit Python's recursion limit.
+
 ### Functions:
     - to_cnf(sentence: Sentence) -> Sentence: Convert the given sentence to CNF.
+    - cnf_clauses(sentence: Sentence) -> set[Sentence]: Get the clauses of the CNF of the given sentence.
     - _to_nnf(sentence: Sentence) -> Sentence: Convert the given sentence to Negation Normal Form (NNF).
-    - _move_not_inwards(sentence: Negation) -> Sentence: Move the negation inwards.
+    - _strip_negations(sentence: Sentence, positive: bool) -> tuple[Sentence, bool]: Remove leading negations, flipping the polarity for each one.
+    - _nnf_kind(sentence: Sentence, positive: bool) -> type: Get the connective a sentence becomes in NNF under the given polarity.
+    - _nnf_operands(sentence: Sentence, positive: bool) -> list[tuple[Sentence, bool]]: Get the sub-sentences (with polarity) the NNF of a sentence is built from.
+    - _nnf_build(sentence: Sentence, positive: bool, operands: list[Sentence]) -> Sentence: Build the NNF of a sentence from the NNF of its operands.
     - _distribute_or_over_and(sentence: Sentence) -> Sentence: Distribute the disjunction over the conjunction.
-    - _resolve_disjunction(sentence: Sentence) -> Sentence: Resolve the disjunctions in the sentence.
-    - _is_complementary(arg_1: Sentence, arg_2: Sentence) -> bool: Check if two arguments are complementary, i.e., one is the negation of the other.
+    - _is_clause(sentence: Sentence) -> bool: Check if an NNF sentence is a literal or a disjunction of literals.
+    - _clause_sets(sentence: Sentence) -> list[frozenset[Sentence]]: Get the clauses of an NNF sentence as sets of literals.
+    - _resolve_disjunction(sentence: Sentence) -> Sentence: Drop the tautological disjunctions of the sentence.
+    - _complement(literal: Sentence) -> Sentence: Get the complementary literal.
 """
 from syntax import *
 
@@ -21,7 +29,7 @@ def to_cnf(sentence: Sentence) -> Sentence:
         - sentence (Sentence): The sentence to convert
     
     ### Returns:
-        - Sentence: The CNF form of the
+        - Sentence: The CNF form of the sentence, without tautological clauses (containing a literal and its complement), or None if every clause is one (the sentence is valid)
     """
     # Convert to Negation Normal Form (NNF) first
     nnf = _to_nnf(sentence)
@@ -30,70 +38,154 @@ def to_cnf(sentence: Sentence) -> Sentence:
     # Resolve Disjunctions in the result
     return _resolve_disjunction(cnf)
 
+def cnf_clauses(sentence: Sentence) -> set[Sentence]:
+    """
+    Get the clauses of the CNF of the given sentence.
+
+    ### Args:
+        - sentence (Sentence): The sentence to convert
+
+    ### Returns:
+        - set[Sentence]: The clauses, literals or disjunctions of literals, without tautologies. A valid sentence has no clause.
+    """
+    cnf = to_cnf(sentence)
+    if cnf is None:
+        return set()
+    return set(cnf.args) if isinstance(cnf, Conjunction) else {cnf}
+
 def _to_nnf(sentence: Sentence):
-    if isinstance(sentence, Symbol):
-        return sentence
-    elif isinstance(sentence, Negation):
-        return _move_not_inwards(sentence)
-        
-    elif isinstance(sentence, Conjunction):
-        return Conjunction(*[_to_nnf(arg) for arg in sentence.args])
-    
-    elif isinstance(sentence, Disjunction):
-        return Disjunction(*[_to_nnf(arg) for arg in sentence.args])
-    
-    elif isinstance(sentence, Implication):
-        return _to_nnf(Disjunction(Negation(sentence.antecedent), sentence.consequent))
-    
-    elif isinstance(sentence, Biconditional):
+    # Every sub-sentence is converted under a polarity (False = negated), so negations are pushed inwards
+    # without building intermediate Negation objects. Results are memoized per (sub-sentence, polarity).
+    root, positive = _strip_negations(sentence, True)
+    if isinstance(root, Symbol):
+        return root if positive else Negation(root)
+    results = {}
+    stack = [(root, positive, None)]
+    while stack:
+        node, positive, operands = stack.pop()
+        key = (id(node), positive)
+        if key in results:
+            continue
+        if operands is None:
+            operands = _nnf_operands(node, positive)
+            pending = [(arg, polarity, None) for arg, polarity in operands
+                       if not isinstance(arg, Symbol) and (id(arg), polarity) not in results]
+            if pending:
+                stack.append((node, positive, operands))
+                stack.extend(pending)
+                continue
+        values = [(arg if polarity else Negation(arg)) if isinstance(arg, Symbol) else results[(id(arg), polarity)]
+                  for arg, polarity in operands]
+        results[key] = _nnf_build(node, positive, values)
+    return results[(id(root), positive)]
+
+def _strip_negations(sentence: Sentence, positive: bool):
+    while isinstance(sentence, Negation):
+        sentence, positive = sentence.arg, not positive
+    return sentence, positive
+
+def _nnf_kind(sentence: Sentence, positive: bool):
+    if isinstance(sentence, Conjunction):
+        return Conjunction if positive else Disjunction
+    elif isinstance(sentence, (Disjunction, Implication)):
+        return Disjunction if positive else Conjunction
+    return None
+
+def _nnf_operands(sentence: Sentence, positive: bool):
+    if isinstance(sentence, Biconditional):
+        # a <=> b becomes (~a || b) & (~b || a), and ~(a <=> b) becomes (a || b) & (~a || ~b)
         arg_1, arg_2 = sentence.args
-        return Conjunction(_to_nnf(Implication(arg_1, arg_2)), 
-                           _to_nnf(Implication(arg_2, arg_1)))
-        
-def _move_not_inwards(sentence: Negation):
-    # print(sentence)
-    if isinstance(sentence.arg, Symbol):
-        return sentence
-    elif isinstance(sentence.arg, Negation):
-        return _to_nnf(sentence.arg.arg)
-    elif isinstance(sentence.arg, Conjunction):
-        return Disjunction(*[_to_nnf(Negation(arg)) for arg in sentence.arg.args])
-    elif isinstance(sentence.arg, Disjunction):
-        return Conjunction(*[_to_nnf(Negation(arg)) for arg in sentence.arg.args])
-    elif isinstance(sentence.arg, Implication):
-        return Conjunction(_to_nnf(sentence.arg.antecedent), _to_nnf(Negation(sentence.arg.consequent)))
-    
+        return [_strip_negations(arg, polarity) for arg, polarity in
+                ((arg_1, False), (arg_2, True), (arg_1, True), (arg_2, False))]
+
+    # Collect the operands of nested sentences that turn into the same connective, so chains like
+    # a => (b => (c => ...)) become one flat disjunction instead of being re-flattened at every level
+    kind = _nnf_kind(sentence, positive)
+    operands = []
+    stack = [(sentence, positive)]
+    while stack:
+        node, polarity = _strip_negations(*stack.pop())
+        if isinstance(node, Symbol) or _nnf_kind(node, polarity) is not kind:
+            operands.append((node, polarity))
+        elif isinstance(node, Implication):
+            # a => b is equivalent to ~a || b
+            stack.append((node.antecedent, not polarity))
+            stack.append((node.consequent, polarity))
+        else:
+            stack.extend((arg, polarity) for arg in node.args)
+    return operands
+
+def _nnf_build(sentence: Sentence, positive: bool, operands: list[Sentence]):
+    if isinstance(sentence, Biconditional):
+        not_1, arg_2, arg_1, not_2 = operands
+        if positive:
+            return Conjunction(Disjunction(not_1, arg_2), Disjunction(not_2, arg_1))
+        return Conjunction(Disjunction(arg_1, arg_2), Disjunction(not_1, not_2))
+    if len(operands) == 1:
+        return operands[0]
+    return _nnf_kind(sentence, positive)(*operands)
+
 
 def _distribute_or_over_and(sentence: Sentence):
+    clauses = []
+    for arg in sentence.args if isinstance(sentence, Conjunction) else [sentence]:
+        if _is_clause(arg):
+            # Already a clause, nothing to distribute
+            clauses.append(arg)
+        else:
+            clauses.extend(Disjunction(*clause) if len(clause) > 1 else next(iter(clause))
+                           for clause in _clause_sets(arg))
+    if len(clauses) == 1:
+        return clauses[0]
+    return Conjunction(*clauses)
+
+def _is_clause(sentence: Sentence):
     if isinstance(sentence, Disjunction):
-        if any(isinstance(arg, Conjunction) for arg in sentence.args):
-            conj = next(arg for arg in sentence.args if isinstance(arg, Conjunction))
-            others = [arg for arg in sentence.args if arg is not conj]
-            return Conjunction(*[_distribute_or_over_and(Disjunction(*(others + [arg]))) for arg in conj.args])
+        return not any(isinstance(arg, CommutativeSentence) for arg in sentence.args)
+    return not isinstance(sentence, CommutativeSentence)
+
+def _clause_sets(sentence: Sentence):
+    # Bottom-up over the NNF: a conjunction collects the clauses of its arguments,
+    # a disjunction takes one clause from each argument in every combination
+    results = {}
+    stack = [(sentence, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in results:
+            continue
+        if not isinstance(node, CommutativeSentence):
+            # Literal
+            results[id(node)] = [frozenset((node,))]
+        elif not expanded:
+            stack.append((node, True))
+            stack.extend((arg, False) for arg in node.args if id(arg) not in results)
+        elif isinstance(node, Conjunction):
+            results[id(node)] = list(dict.fromkeys(clause for arg in node.args for clause in results[id(arg)]))
         else:
-            return sentence
-    elif isinstance(sentence, Conjunction):
-        return Conjunction(*[_distribute_or_over_and(arg) for arg in sentence.args])
-    else:
-        return sentence
+            arg_clauses = [results[id(arg)] for arg in node.args]
+            # Arguments with a single clause are merged once instead of in every combination
+            base = frozenset().union(*[clauses[0] for clauses in arg_clauses if len(clauses) == 1])
+            combined = [base]
+            for clauses in arg_clauses:
+                if len(clauses) > 1:
+                    combined = list(dict.fromkeys(partial | clause for partial in combined for clause in clauses))
+            results[id(node)] = combined
+    return results[id(sentence)]
 
 def _resolve_disjunction(sentence: Sentence):
+    # A disjunction with a literal and its complement is always true, so it is dropped rather than shortened.
+    # None stands for no clause left.
     if isinstance(sentence, Conjunction):
-        return Conjunction(*[_resolve_disjunction(arg) for arg in sentence.args])
+        resolved = [clause for clause in map(_resolve_disjunction, sentence.args) if clause is not None]
+        if len(resolved) > 1:
+            return Conjunction(*resolved)
+        return resolved[0] if resolved else None
     elif isinstance(sentence, Disjunction):
-        resolved_args = []
-        for arg in sentence.args:
-            if not any(_is_complementary(arg, other) for other in sentence.args if other is not arg):
-                resolved_args.append(arg)
-        if len(resolved_args) == 0:
+        if any(_complement(arg) in sentence.args for arg in sentence.args):
             return None
-        elif len(resolved_args) == 1:
-            return resolved_args[0]
-        return Disjunction(*resolved_args)
+        return sentence
     else:
         return sentence
-    
-def _is_complementary(arg_1: Sentence, arg_2: Sentence):
-    return arg_1 == arg_2 \
-        or isinstance(arg_1, Negation) and arg_1.arg == arg_2 \
-        or isinstance(arg_2, Negation) and arg_2.arg == arg_1
+
+def _complement(literal: Sentence):
+    return literal.arg if isinstance(literal, Negation) else Negation(literal)
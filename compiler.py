@@ -0,0 +1,85 @@
+"""
+This module contains functions to compile a sentence into a Python function for fast model checking.
+
+The compiled function takes a model as a sequence of booleans indexed like the given symbol list (e.g. a tuple from itertools.product), so evaluating a model costs a single function call with short-circuiting `and`/`or` instead of walking the sentence tree with dict lookups.
+Unlike Sentence.evaluate(), the compiled function expects a complete model (every symbol assigned).
+
+### Functions:
+    - compile_sentence(sentence: Sentence, symbols: list[Symbol]) -> Callable[[Sequence[bool]], bool]: Compile a sentence into an evaluator function.
+    - _expression(sentence: Sentence, operands: list[str], index: dict[Symbol, int]) -> str: Build the Python expression of a sentence from the expressions of its children.
+"""
+from typing import Callable, Sequence
+from syntax import *
+
+# Sub-expressions nested deeper than this are hoisted into local variables to stay within the limits of the Python parser
+MAX_EXPRESSION_DEPTH = 50
+
+
+def compile_sentence(sentence: Sentence, symbols: list[Symbol]) -> Callable[[Sequence[bool]], bool]:
+    """
+    Compile a sentence into a Python function evaluating it on a complete model.
+
+    ### Args:
+        - sentence (Sentence): The sentence to compile
+        - symbols (list[Symbol]): The symbols of the model, in the order of the model values
+
+    ### Returns:
+        - Callable[[Sequence[bool]], bool]: A function taking the truth values of the symbols and returning the truth value of the sentence
+
+    ### Raises:
+        - ValueError: If the sentence contains a symbol that is not in the list of symbols
+    """
+    index = {symbol: i for i, symbol in enumerate(symbols)}
+    missing = sentence.symbols() - index.keys()
+    if missing:
+        raise ValueError(f"Symbols {sorted(symbol.name for symbol in missing)} are not in the model")
+
+    # Post-order over the sentence, keeping for every node its expression and how deeply the expression is nested
+    lines = []
+    expressions = {}
+    stack = [(sentence, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in expressions:
+            continue
+        children = list(node.children())
+        if children and not expanded:
+            stack.append((node, True))
+            stack.extend((child, False) for child in children)
+            continue
+        operands = [expressions[id(child)] for child in children]
+        if isinstance(node, (Conjunction, Disjunction)):
+            # Cheap (shallow) operands first, so short-circuiting skips the expensive ones
+            operands.sort(key=lambda operand: operand[1])
+        expression = _expression(node, [operand for operand, _ in operands], index)
+        depth = 1 + max((depth for _, depth in operands), default=0)
+        if depth > MAX_EXPRESSION_DEPTH:
+            # Hoisted sub-expressions are evaluated eagerly, so deep sentences lose short-circuiting at these points only
+            name = f"t{len(lines)}"
+            lines.append(f"    {name} = {expression}")
+            expression, depth = name, 0
+        expressions[id(node)] = (expression, depth)
+
+    lines.append(f"    return {expressions[id(sentence)][0]}")
+    source = "def evaluate(m):\n" + "\n".join(lines)
+    namespace = {}
+    exec(compile(source, f"<compiled {type(sentence).__name__}>", "exec"), namespace)
+    return namespace["evaluate"]
+
+
+def _expression(sentence: Sentence, operands: list[str], index: dict[Symbol, int]) -> str:
+    if isinstance(sentence, Symbol):
+        return f"m[{index[sentence]}]"
+    elif isinstance(sentence, Negation):
+        return f"(not {operands[0]})"
+    elif isinstance(sentence, Conjunction):
+        return f"({' and '.join(operands)})"
+    elif isinstance(sentence, Disjunction):
+        return f"({' or '.join(operands)})"
+    elif isinstance(sentence, Implication):
+        antecedent, consequent = operands
+        return f"(not {antecedent} or {consequent})"
+    elif isinstance(sentence, Biconditional):
+        arg_1, arg_2 = operands
+        return f"({arg_1} == {arg_2})"
+    raise ValueError(f"Cannot compile sentence of type {type(sentence).__name__}")
@@ -50,4 +50,19 @@ print(resolution.solve())
 # DPLL
 print("\nDPLL:")
 dpll = DPLL(kb, query)
-print(dpll.solve())
\ No newline at end of file
+print(dpll.solve())
+
+# BDD
+print("\nBDD:")
+bdd = BDD(kb, query)
+print(bdd.solve())
+
+# Model Counting
+print("\nModel Counting:")
+model_counting = ModelCounting(kb, query)
+print(model_counting.solve())
+
+# WalkSAT
+print("\nWalkSAT:")
+walksat = WalkSAT(kb, query)
+print(walksat.solve())
\ No newline at end of file
@@ -0,0 +1,307 @@
+"""
+This module contains the generator of synthetic problems, to benchmark the methods on problems of growing size: the problems of the data/ folder only have a handful of symbols.
+
+Every family is a function of the number of clauses wanted and a seed, and gives the sentences of the knowledge base (as written in a problem file), the integer clauses of its CNF (see clauses.py), the query as an integer literal, and whether the clauses entail the query and have a model when it is known by construction. Symbol n is named xn, so the symbols of a problem file and the variables of its DIMACS file are the same. Other answers are given by a reference solver: linear-time unit resolution for Horn clauses, DPLL for other clauses.
+
+The expected answer of a problem file follows Truth Table, BDD and Model Counting: YES if the knowledge base has a model and the query holds in all of them, so a knowledge base without a model answers NO (DPLL and Resolution refute it, and answer YES). The DIMACS file states whether its clauses, the knowledge base and the negated query, are unsatisfiable, i.e. whether the knowledge base entails the query.
+
+Usage: python generator.py <family> [--clauses <number>] [--seed <seed>] [--depth <depth>] [--fan-in <size>] [--k <size>] [--ratio <ratio>] [--timeout <seconds>] [--output <name>] [--dimacs]
+
+### Functions:
+    - horn(clauses: int, seed: int, depth: int, fan_in: int) -> tuple[list[str], list[list[int]], int, bool | None, bool | None]: Random definite Horn knowledge base in layers.
+    - k_cnf(clauses: int, seed: int, k: int, ratio: float) -> tuple[list[str], list[list[int]], int, bool | None, bool | None]: Random k-CNF at a ratio of clauses per variable.
+    - pigeonhole(clauses: int, seed: int) -> tuple[list[str], list[list[int]], int, bool | None, bool | None]: Pigeons that do not fit in the holes.
+    - biconditional_chain(clauses: int, seed: int) -> tuple[list[str], list[list[int]], int, bool | None, bool | None]: A chain of biconditionals from a fact.
+    - horn_unsatisfiable(clauses: list[list[int]]) -> bool: Check if Horn clauses have no model, in linear time.
+    - horn_entails(clauses: list[list[int]], query: int) -> bool: Check if Horn clauses entail a literal, in linear time.
+    - unsatisfiable(clauses: list[list[int]], timeout: float) -> bool | None: Check if clauses have no model with the reference solver.
+    - reference(clauses: list[list[int]], query: int, timeout: float) -> bool | None: Check if clauses entail a literal with the reference solver.
+    - to_text(sentences: list[str], query: int, expected: bool | None) -> str: Get a problem in the TELL/ASK/EXPECT format.
+    - to_dimacs(clauses: list[list[int]], query: int, expected: bool | None) -> str: Get a problem in the DIMACS CNF format.
+    - generate(family: str, clauses: int, seed: int, timeout: float, **options) -> tuple[str, str, bool | None]: Generate a problem in both formats.
+    - _literal(literal: int) -> str: Get the text of an integer literal.
+"""
+import sys, os, random
+from collections import deque
+from parser import INPUT_DIR
+from syntax import *
+
+# The folder of the problems written, apart from the problems of the data folder run by default by the tests and the bench command
+GENERATED_DIR = os.path.join(INPUT_DIR, "generated")
+
+# Number of clauses of a problem given to DPLL as Sentence objects, above which the reference answer of a non-Horn problem is not computed
+MAX_REFERENCE_CLAUSES = 10 ** 5
+
+
+def _literal(literal:int) -> str:
+    return f"x{literal}" if literal > 0 else f"{Connective.NEGATION.value}x{-literal}"
+
+
+def horn(clauses:int, seed:int=0, depth:int=5, fan_in:int=2) -> tuple[list[str], list[list[int]], int, bool | None, bool | None]:
+    """
+    Random definite Horn knowledge base: the symbols are in depth + 1 layers, half of the first layer are facts, and every rule derives a symbol of a layer from fan_in symbols of the previous one. There are about 2 * fan_in rules per symbol, so on large knowledge bases most symbols of the last layer are derivable (the answer is mostly YES), while on small ones few are. The query is a symbol of the last layer.
+
+    ### Args:
+        - clauses (int): The number of facts and rules
+        - seed (int): The seed of the random generator
+        - depth (int): The number of layers of rules, i.e. the longest derivation
+        - fan_in (int): The number of symbols of the body of every rule
+
+    ### Returns:
+        - tuple[list[str], list[list[int]], int, bool | None, bool | None]: The sentences, clauses and query, whether the clauses entail the query and whether they have a model, each if known
+    """
+    rng = random.Random(seed)
+    width = max(2 * fan_in, clauses // (2 * fan_in * depth + 1))
+    layers = [range(layer * width + 1, (layer + 1) * width + 1) for layer in range(depth + 1)]
+    facts = rng.sample(layers[0], min(width // 2, clauses))
+    sentences = [_literal(fact) for fact in facts]
+    int_clauses = [[fact] for fact in facts]
+    for i in range(clauses - len(facts)):
+        layer = 1 + i % depth
+        head = rng.choice(layers[layer])
+        body = rng.sample(layers[layer - 1], fan_in)
+        sentences.append(f"{Connective.CONJUNCTION.value.join(map(_literal, body))} {Connective.IMPLICATION.value} {_literal(head)}")
+        int_clauses.append([-symbol for symbol in body] + [head])
+    # Definite clauses are all true when every symbol is
+    return sentences, int_clauses, rng.choice(layers[-1]), None, True
+
+
+def k_cnf(clauses:int, seed:int=0, k:int=3, ratio:float=4.26) -> tuple[list[str], list[list[int]], int, bool | None, bool | None]:
+    """
+    Random k-CNF: every clause has k distinct symbols, each negated with probability 1/2. Around the ratio of 4.26 clauses per variable for 3-CNF, about half of the problems are satisfiable and they are hardest. The query is a random literal.
+
+    ### Args:
+        - clauses (int): The number of clauses
+        - seed (int): The seed of the random generator
+        - k (int): The number of literals of every clause
+        - ratio (float): The number of clauses per variable
+
+    ### Returns:
+        - tuple[list[str], list[list[int]], int, bool | None, bool | None]: The sentences, clauses and query, whether the clauses entail the query and whether they have a model, each if known
+    """
+    rng = random.Random(seed)
+    variables = max(k, round(clauses / ratio))
+    int_clauses = [[variable if rng.random() < 0.5 else -variable for variable in rng.sample(range(1, variables + 1), k)] for _ in range(clauses)]
+    sentences = [f" {Connective.DISJUNCTION.value} ".join(map(_literal, clause)) for clause in int_clauses]
+    query = rng.randint(1, variables)
+    return sentences, int_clauses, query if rng.random() < 0.5 else -query, None, None
+
+
+def pigeonhole(clauses:int, seed:int=0) -> tuple[list[str], list[list[int]], int, bool | None, bool | None]:
+    """
+    Pigeonhole principle: n + 1 pigeons are each in one of n holes, and no two pigeons share a hole. The knowledge base is unsatisfiable, so it entails any query, but proving it takes exponential time for resolution and DPLL. Having no model, the expected answer of the problem file is NO. n is the largest number of holes with at most the given number of clauses, n + 1 + n * n * (n + 1) / 2. The query is a random symbol.
+
+    ### Args:
+        - clauses (int): The largest number of clauses
+        - seed (int): The seed of the random generator
+
+    ### Returns:
+        - tuple[list[str], list[list[int]], int, bool | None, bool | None]: The sentences, clauses and query, whether the clauses entail the query and whether they have a model, each if known
+    """
+    rng = random.Random(seed)
+    holes = 1
+    while (holes + 2) + (holes + 1) ** 2 * (holes + 2) // 2 <= clauses:
+        holes += 1
+    # Pigeon i is in hole j
+    symbol = lambda pigeon, hole: pigeon * holes + hole + 1
+    int_clauses = [[symbol(pigeon, hole) for hole in range(holes)] for pigeon in range(holes + 1)]
+    for hole in range(holes):
+        for first in range(holes + 1):
+            for second in range(first + 1, holes + 1):
+                int_clauses.append([-symbol(first, hole), -symbol(second, hole)])
+    sentences = [f" {Connective.DISJUNCTION.value} ".join(map(_literal, clause)) for clause in int_clauses]
+    return sentences, int_clauses, rng.randint(1, (holes + 1) * holes), True, False
+
+
+def biconditional_chain(clauses:int, seed:int=0) -> tuple[list[str], list[list[int]], int, bool | None, bool | None]:
+    """
+    Chain of biconditionals x1 <=> x2, x2 <=> ~x3, ..., each with a random sign, from the fact x1. Every symbol has a single value, found by following the chain, and the query is the last symbol with a random sign, so the answer is known. Every biconditional is two clauses, so the chain has (clauses - 1) / 2 of them.
+
+    ### Args:
+        - clauses (int): The number of clauses
+        - seed (int): The seed of the random generator
+
+    ### Returns:
+        - tuple[list[str], list[list[int]], int, bool | None, bool | None]: The sentences, clauses and query, whether the clauses entail the query and whether they have a model, each if known
+    """
+    rng = random.Random(seed)
+    length = max(1, (clauses - 1) // 2)
+    sentences, int_clauses = [_literal(1)], [[1]]
+    # Whether the last symbol seen is true
+    value = True
+    for variable in range(1, length + 1):
+        following = variable + 1 if rng.random() < 0.5 else -(variable + 1)
+        sentences.append(f"{_literal(variable)} {Connective.BICONDITIONAL.value} {_literal(following)}")
+        int_clauses += [[-variable, following], [variable, -following]]
+        value = value == (following > 0)
+    query = length + 1 if rng.random() < 0.5 else -(length + 1)
+    return sentences, int_clauses, query, value == (query > 0), True
+
+
+FAMILIES = {
+    "horn": horn,
+    "kcnf": k_cnf,
+    "pigeonhole": pigeonhole,
+    "biconditional": biconditional_chain,
+}
+
+
+def horn_entails(clauses:list[list[int]], query:int) -> bool:
+    """
+    Check if Horn clauses entail a literal: the clauses and the negated query are unsatisfiable (see horn_unsatisfiable()).
+
+    ### Args:
+        - clauses (list[list[int]]): The Horn clauses
+        - query (int): The literal
+
+    ### Returns:
+        - bool: True if the clauses entail the literal, False otherwise
+    """
+    return horn_unsatisfiable(clauses + [[-query]])
+
+
+def horn_unsatisfiable(clauses:list[list[int]]) -> bool:
+    """
+    Check if Horn clauses (with at most one positive literal each) have no model, by unit resolution: they are unsatisfiable iff propagating their facts reaches a clause whose literals are all false. Every clause keeps the number of its negative literals not yet made false, so the check is linear in the size of the clauses.
+
+    ### Args:
+        - clauses (list[list[int]]): The Horn clauses
+
+    ### Returns:
+        - bool: True if the clauses have no model, False otherwise
+    """
+    remaining = [sum(literal < 0 for literal in clause) for clause in clauses]
+    heads = [next((literal for literal in clause if literal > 0), None) for clause in clauses]
+    watchers = {}
+    for i, clause in enumerate(clauses):
+        for literal in clause:
+            if literal < 0:
+                watchers.setdefault(-literal, []).append(i)
+    agenda = deque(i for i in range(len(clauses)) if remaining[i] == 0)
+    true = set()
+    while agenda:
+        head = heads[agenda.popleft()]
+        if head is None:
+            # A clause with all its literals false
+            return True
+        if head in true:
+            continue
+        true.add(head)
+        for i in watchers.get(head, ()):
+            remaining[i] -= 1
+            if remaining[i] == 0:
+                agenda.append(i)
+    return False
+
+
+def unsatisfiable(clauses:list[list[int]], timeout:float=60) -> bool | None:
+    """
+    Check if clauses have no model with the reference solver: horn_unsatisfiable() for Horn clauses, DPLL otherwise.
+
+    ### Args:
+        - clauses (list[list[int]]): The clauses
+        - timeout (float): The time in seconds after which DPLL is stopped
+
+    ### Returns:
+        - bool | None: True if the clauses have no model, False if they have one, None if DPLL was stopped or the problem is too large for it
+    """
+    if all(sum(literal > 0 for literal in clause) <= 1 for clause in clauses):
+        return horn_unsatisfiable(clauses)
+    if len(clauses) > MAX_REFERENCE_CLAUSES:
+        return None
+    from methods import DPLL
+    from budget import Budget
+    to_sentence = lambda literal: Symbol(f"x{literal}") if literal > 0 else Negation(Symbol(f"x{-literal}"))
+    sentences = [Disjunction(*map(to_sentence, clause)) if len(clause) > 1 else to_sentence(clause[0]) for clause in clauses]
+    return DPLL.from_clauses(sentences, budget=Budget(timeout=timeout)).solve()["entails"]
+
+
+def reference(clauses:list[list[int]], query:int, timeout:float=60) -> bool | None:
+    """
+    Check if clauses entail a literal with the reference solver: they are unsatisfiable with its negation (see unsatisfiable()).
+
+    ### Args:
+        - clauses (list[list[int]]): The clauses
+        - query (int): The literal
+        - timeout (float): The time in seconds after which DPLL is stopped
+
+    ### Returns:
+        - bool | None: True if the clauses entail the literal, False if not, None if DPLL was stopped or the problem is too large for it
+    """
+    return unsatisfiable(clauses + [[-query]], timeout)
+
+
+def to_text(sentences:list[str], query:int, expected:bool|None) -> str:
+    text = f"TELL\n{'; '.join(sentences)};\nASK\n{_literal(query)}\n"
+    if expected is not None:
+        text += f"EXPECT\n{'YES' if expected else 'NO'}\n"
+    return text
+
+
+def to_dimacs(clauses:list[list[int]], query:int, expected:bool|None) -> str:
+    # The clauses of the knowledge base and the negated query, which are unsatisfiable iff the answer is YES
+    variables = max(abs(literal) for clause in clauses + [[query]] for literal in clause)
+    lines = [f"c query {_literal(query)}"]
+    if expected is not None:
+        lines.append(f"c expect {'YES (UNSAT)' if expected else 'NO (SAT)'}")
+    lines.append(f"p cnf {variables} {len(clauses) + 1}")
+    lines += [" ".join(map(str, clause)) + " 0" for clause in clauses + [[-query]]]
+    return "\n".join(lines) + "\n"
+
+
+def generate(family:str, clauses:int, seed:int=0, timeout:float=60, **options) -> tuple[str, str, bool | None]:
+    """
+    Generate a problem of a family, and its expected answer: the one known by construction, or else the one of the reference solver. As for Truth Table, the expected answer is NO when the knowledge base has no model, while the DIMACS file states that its clauses are unsatisfiable.
+
+    ### Args:
+        - family (str): The name of the family: horn, kcnf, pigeonhole or biconditional
+        - clauses (int): The number of clauses of the knowledge base
+        - seed (int): The seed of the random generator
+        - timeout (float): The time in seconds the reference solver is given
+        - options: The other arguments of the family (depth and fan_in for horn, k and ratio for kcnf)
+
+    ### Returns:
+        - tuple[str, str, bool | None]: The problem in the TELL/ASK/EXPECT and DIMACS formats, and the expected answer of the problem file (None if unknown, when it is left out)
+    """
+    if family not in FAMILIES:
+        raise ValueError(f"Unknown family '{family}', expected one of: {', '.join(FAMILIES)}")
+    sentences, int_clauses, query, entailed, satisfiable = FAMILIES[family](clauses, seed, **options)
+    if entailed is None:
+        entailed = reference(int_clauses, query, timeout)
+    expected = entailed
+    if entailed:
+        # A knowledge base entails the query when it has no model, which answers NO
+        if satisfiable is None:
+            refuted = unsatisfiable(int_clauses, timeout)
+            satisfiable = None if refuted is None else not refuted
+        expected = satisfiable
+    return to_text(sentences, query, expected), to_dimacs(int_clauses, query, entailed), expected
+
+
+if __name__ == "__main__":
+    try:
+        family = sys.argv[1]
+        option = lambda name, kind, default: kind(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+        clauses = option("--clauses", int, 100)
+        seed = option("--seed", int, 0)
+        options = {}
+        if family == "horn":
+            options = {"depth": option("--depth", int, 5), "fan_in": option("--fan-in", int, 2)}
+        elif family == "kcnf":
+            options = {"k": option("--k", int, 3), "ratio": option("--ratio", float, 4.26)}
+        text, dimacs, expected = generate(family, clauses, seed, option("--timeout", float, 60), **options)
+        name = option("--output", str, f"{family}_{clauses}_{seed}")
+        os.makedirs(GENERATED_DIR, exist_ok=True)
+        with open(os.path.join(GENERATED_DIR, f"{name}.txt"), "w") as file:
+            file.write(text)
+        print(f"Written {os.path.join(GENERATED_DIR, f'{name}.txt')}, run it as {os.path.relpath(os.path.join(GENERATED_DIR, f'{name}.txt'), INPUT_DIR)}")
+        if "--dimacs" in sys.argv:
+            with open(os.path.join(GENERATED_DIR, f"{name}.cnf"), "w") as file:
+                file.write(dimacs)
+            print(f"Written {os.path.join(GENERATED_DIR, f'{name}.cnf')}")
+        print(f"Expected answer: {'unknown (the reference solver was stopped)' if expected is None else 'YES' if expected else 'NO'}")
+    except IndexError:
+        print("Usage: python generator.py <family> [--clauses <number>] [--seed <seed>] [--depth <depth>] [--fan-in <size>] [--k <size>] [--ratio <ratio>] [--timeout <seconds>] [--output <name>] [--dimacs]")
+        print("Families:", ", ".join(FAMILIES))
+    except ValueError as e:
+        print("ERROR:", e)
@@ -0,0 +1,107 @@
+"""
+This module contains branching heuristics for DPLL: functions choosing the literal to branch on, given the clauses that are not satisfied yet.
+
+Clauses are integer clauses (see clauses.py) restricted to their unassigned literals, and are never empty. Ties are broken by variable number, i.e. by symbol name when symbols are numbered in name order, so the choice does not depend on the iteration order of sets.
+
+### Functions:
+    - first(clauses: list[tuple[int, ...]]) -> int: Branch on a variable of the first clause found (the original DPLL choice).
+    - dlis(clauses: list[tuple[int, ...]]) -> int: Dynamic Largest Individual Sum: the literal in the most clauses.
+    - moms(clauses: list[tuple[int, ...]]) -> int: Maximum Occurrences in clauses of Minimum Size.
+    - jeroslow_wang(clauses: list[tuple[int, ...]]) -> int: Two-sided Jeroslow-Wang: the variable with the largest weight of clauses, short clauses weighing more.
+    - _polarity(variable: int, positive: float, negative: float) -> int: Get the literal of the more frequent polarity.
+
+### Classes:
+    - VSIDS: Variable State Independent Decaying Sum, the variable most involved in recent conflicts.
+"""
+
+
+def first(clauses: list[tuple[int, ...]]) -> int:
+    return abs(clauses[0][0])
+
+def dlis(clauses: list[tuple[int, ...]]) -> int:
+    counts = {}
+    for clause in clauses:
+        for literal in clause:
+            counts[literal] = counts.get(literal, 0) + 1
+    return max(counts, key=lambda literal: (counts[literal], abs(literal), literal > 0))
+
+def moms(clauses: list[tuple[int, ...]]) -> int:
+    shortest = min(len(clause) for clause in clauses)
+    positive, negative = {}, {}
+    for clause in clauses:
+        if len(clause) != shortest:
+            continue
+        for literal in clause:
+            counts = positive if literal > 0 else negative
+            counts[abs(literal)] = counts.get(abs(literal), 0) + 1
+    # (f(x) + f(~x)) * 2^k + f(x) * f(~x) favours variables appearing often with both signs
+    score = lambda variable: (positive.get(variable, 0) + negative.get(variable, 0)) * 2 ** shortest + positive.get(variable, 0) * negative.get(variable, 0)
+    variable = max(positive.keys() | negative.keys(), key=lambda variable: (score(variable), variable))
+    return _polarity(variable, positive.get(variable, 0), negative.get(variable, 0))
+
+def jeroslow_wang(clauses: list[tuple[int, ...]]) -> int:
+    positive, negative = {}, {}
+    for clause in clauses:
+        weight = 2.0 ** -len(clause)
+        for literal in clause:
+            weights = positive if literal > 0 else negative
+            weights[abs(literal)] = weights.get(abs(literal), 0) + weight
+    variable = max(positive.keys() | negative.keys(), key=lambda variable: (positive.get(variable, 0) + negative.get(variable, 0), variable))
+    return _polarity(variable, positive.get(variable, 0), negative.get(variable, 0))
+
+def _polarity(variable: int, positive: float, negative: float) -> int:
+    return variable if positive >= negative else -variable
+
+
+class VSIDS:
+    """
+    The class to represent the Variable State Independent Decaying Sum (VSIDS) heuristic.
+    Every variable has an activity, starting from its number of occurrences. The variables of a clause falsified by a conflict are bumped by an increment that grows after every conflict, so older bumps decay relatively to newer ones, and the search branches on the unassigned variable with the highest activity.
+
+    ### Attributes:
+        - activity (dict[int, float]): The activity of every variable.
+        - increment (float): The amount added to the activity of a bumped variable.
+        - decay (float): The factor by which older bumps decay at every conflict.
+
+    ### Methods:
+        - bump(variables: Iterable[int]): Bump the activity of the variables involved in a conflict, then decay.
+        - select(clauses: list[tuple[int, ...]]): Choose the literal to branch on.
+    """
+    # Activities are rescaled when they grow past this, to stay within float range
+    RESCALE_LIMIT = 1e100
+
+    def __init__(self, clauses, decay: float = 0.95):
+        self.activity = {}
+        for clause in clauses:
+            for literal in clause:
+                self.activity[abs(literal)] = self.activity.get(abs(literal), 0) + 1
+        self.increment = 1.0
+        self.decay = decay
+
+    def bump(self, variables):
+        for variable in variables:
+            self.activity[variable] = self.activity.get(variable, 0) + self.increment
+        # Growing the increment is the same as decaying every activity, without touching them
+        self.increment /= self.decay
+        if self.increment > self.RESCALE_LIMIT:
+            for variable in self.activity:
+                self.activity[variable] /= self.RESCALE_LIMIT
+            self.increment /= self.RESCALE_LIMIT
+
+    def select(self, clauses: list[tuple[int, ...]]) -> int:
+        positive, negative = {}, {}
+        for clause in clauses:
+            for literal in clause:
+                counts = positive if literal > 0 else negative
+                counts[abs(literal)] = counts.get(abs(literal), 0) + 1
+        variable = max(positive.keys() | negative.keys(), key=lambda variable: (self.activity.get(variable, 0), variable))
+        return _polarity(variable, positive.get(variable, 0), negative.get(variable, 0))
+
+
+HEURISTICS = {
+    "first": first,
+    "dlis": dlis,
+    "moms": moms,
+    "jw": jeroslow_wang,
+    "vsids": VSIDS,
+}
@@ -27,21 +27,5 @@ def check_horn_kb(kb: Conjunction) -> bool:
     
     
 def _is_horn_form(clause: Sentence) -> bool:
-    if isinstance(clause, Symbol):
-        return True
-    if isinstance(clause, Negation) and isinstance(clause.arg, Symbol):
-        return True
-    if isinstance(clause, Disjunction):
-        positive_symbols = [arg for arg in clause.args if isinstance(arg, Symbol)]
-        return len(positive_symbols) <= 1 and \
-            all(isinstance(arg, (Symbol, Negation)) for arg in clause.args)
-    if isinstance(clause, Implication):
-        if not isinstance(clause.consequent, Symbol):
-            return False
-        if isinstance(clause.antecedent, Symbol):
-            return True
-        if isinstance(clause.antecedent, Conjunction):
-            return all(isinstance(arg, Symbol) for arg in clause.antecedent.args)
-    # if isinstance(clause, Conjunction):
-    #     return all(_is_horn_form(arg) for arg in clause.args)
-    return False
\ No newline at end of file
+    # The check is cached on the clause, see Sentence.is_horn()
+    return clause.is_horn()
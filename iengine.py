@@ -1,35 +1,94 @@
-import sys
+import sys, json
+from contextlib import nullcontext
 from syntax import *
 from methods import *
 from parser import parse_kb_and_query
+from stats import Stats, DISABLED
 
-def main(method, file_name):
+def main(method, file_name, relevance_slicing=False, split_components=False, preprocess=(), heuristic=None, phase_saving=False, budget=None, restarts=None, max_flips=None, show_model=False, stats_format=None, profiler=None, backend=None, workers=None):
+    # Statistics are only recorded when they are printed
+    stats = Stats() if stats_format else DISABLED
+    # Only the selected phase is profiled
+    profile = profiler.profile if profiler else lambda phase: nullcontext()
     # Parse the knowledge base and query from the file
-    kb, query = parse_kb_and_query(file_name)
+    with stats.phase("parse"), profile("parse"):
+        kb, query = parse_kb_and_query(file_name)
+    if preprocess and (method not in ("RES", "DPLL") or split_components):
+        raise ValueError("Preprocessing is only available for the RES and DPLL methods, without --split-components")
+    if (heuristic or phase_saving) and (method != "DPLL" or split_components):
+        raise ValueError("Branching heuristics are only available for the DPLL method, without --split-components")
+    if budget and (method not in ("RES", "DPLL") or split_components):
+        raise ValueError("Budgets are only available for the RES and DPLL methods, without --split-components")
+    if restarts and (method != "DPLL" or split_components):
+        raise ValueError("Restarts are only available for the DPLL method, without --split-components")
+    if max_flips is not None and (method != "WALKSAT" or split_components):
+        raise ValueError("A flip budget is only available for the WALKSAT method, without --split-components")
+    if (backend or workers is not None) and (method != "FC" or split_components):
+        raise ValueError("Backends are only available for the FC method, without --split-components")
 
-    # Based on the method, create the appropriate object and solve
-    if method == "TT":
-        # Truth Table
-        solver = TruthTable(kb, query)
-    elif method == "FC":
-        # Forward Chaining
-        solver = ForwardChaining(kb, query)
-    elif method == "BC":
-        # Backward Chaining
-        solver = BackwardChaining(kb, query)
-    elif method == "RES":
-        # Resolution
-        solver = Resolution(kb, query)
-    elif method == "DPLL":
-        # DPLL
-        solver = DPLL(kb, query)
-    else:
-        raise ValueError("Invalid method. Please use one of the following methods: TT, FC, BC, RES, DPLL")
+    with profile("cnf"):
+        if relevance_slicing:
+            # Only keep the part of the KB the query depends on
+            from slicing import slice_kb
+            with stats.phase("slice"):
+                kb = slice_kb(kb, query)
+
+        # Based on the method, create the appropriate object and solve
+        if split_components:
+            # Solve the independent components of the problem in parallel
+            solver = Decomposition(method, kb, query, stats=stats)
+        elif method == "TT":
+            # Truth Table
+            solver = TruthTable(kb, query, stats)
+        elif method == "FC":
+            # Forward Chaining
+            # Worker processes share the arrays of the numpy backend
+            solver = ForwardChaining(kb, query, stats, backend or ("numpy" if workers is not None else "python"), workers if workers is not None else 1)
+        elif method == "BC":
+            # Backward Chaining
+            solver = BackwardChaining(kb, query, stats)
+        elif method == "RES":
+            # Resolution
+            solver = Resolution(kb, query, preprocess, budget, stats)
+        elif method == "DPLL":
+            # DPLL
+            solver = DPLL(kb, query, preprocess, heuristic or "moms", phase_saving, budget, restarts, stats)
+        elif method == "BDD":
+            # Binary Decision Diagram
+            solver = BDD(kb, query, stats)
+        elif method == "MC":
+            # Model Counting
+            solver = ModelCounting(kb, query, stats)
+        elif method == "WALKSAT":
+            # Local search, then DPLL
+            solver = WalkSAT(kb, query, max_flips, stats=stats)
+        else:
+            raise ValueError("Invalid method. Please use one of the following methods: TT, FC, BC, RES, DPLL, BDD, MC, WALKSAT")
     
-    result = solver.solve()
-    entails = "YES" if result["entails"] else "NO"
-    message = f": {result['message']}" if "message" in result.keys() else ""
-    print("\n" + entails + message + "\n")
+    for step in getattr(solver, "preprocessing_report", []):
+        print(f"Preprocessing {step['step']}: removed {step['variables_removed']} variables and {step['clauses_removed']} clauses in {step['time'] * 1000:.3f} ms")
+    with profile("solve"):
+        result = solver.solve()
+    if result["entails"] is None:
+        # The solver ran out of budget
+        print("\n" + result["message"] + "\n")
+    else:
+        entails = "YES" if result["entails"] else "NO"
+        message = f": {result['message']}" if "message" in result.keys() else ""
+        print("\n" + entails + message + "\n")
+        if show_model and "model" in result:
+            # The model of the KB in which the query is false, proving the NO answer
+            print("Counter-model: " + ", ".join(f"{symbol} = {value}" for symbol, value in result["model"].items()) + "\n")
+    if stats_format == "json":
+        # One line per run, for collecting the statistics of many runs
+        print(json.dumps({"method": method, "file": file_name, "entails": result["entails"], **stats.to_dict()}))
+    elif stats_format:
+        print("Statistics:\n" + stats.report() + "\n")
+    if profiler and profiler.output:
+        profiler.save()
+        print(f"Profile of the {profiler.phase} phase saved to {profiler.output}")
+    elif profiler:
+        print(f"Profile of the {profiler.phase} phase:\n" + profiler.report())
     
 def suggest_help():
     print("For help, use the command: './iengine help'")
@@ -43,13 +102,38 @@ def display_help():
     print("  BC   - Backward Chaining")
     print("  RES  - Resolution")
     print("  DPLL - Davis-Putnam-Logemann-Loveland (DPLL)")
+    print("  BDD  - Binary Decision Diagram (knowledge compilation)")
+    print("  MC   - Model Counting (#SAT with component caching)")
+    print("  WALKSAT - WalkSAT local search for a counter-model, then DPLL")
     print("\nFilename: The name of the file (in the data/ folder) containing the knowledge base and query. The file should be in the format specified in the assignment.")
+    print("\nOptions:")
+    print("  --slice - Restrict the knowledge base to the part relevant to the query before solving (counts are then over the symbols of that part)")
+    print("  --split-components - Split the problem into components sharing no symbol and solve them in parallel (TT, RES and DPLL only)")
+    print("  --preprocess [<steps>] - Simplify the clauses before solving (RES and DPLL only). Steps are a comma-separated list of ssr (self-subsuming resolution), els (equivalent literals), probe (failed literals) and bve (variable elimination); all by default")
+    print("  --heuristic <name> - Branching heuristic of DPLL: first (a symbol of the first clause found), dlis, moms (default), jw (Jeroslow-Wang) or vsids")
+    print("  --phase-saving - Make DPLL branch first on the value last assigned to the symbol")
+    print("  --stats [json] - Print the time of every phase and the work counters of the solver (decisions, propagations, resolvents, ...), as text or as a JSON line")
+    print("  --model - Print the counter-model proving a NO answer: a model of the KB in which the query is false (TT, DPLL and WALKSAT)")
+    print("  --backend <name> - Backend of FC: python (default) or numpy, which runs the agenda in vectorized rounds over arrays (needs NumPy)")
+    print("  --workers <n> - Shard the rules of the numpy backend of FC over worker processes, exchanging the symbols made true every round")
+    print("  --max-flips <n> - Number of WalkSAT flips before falling back to DPLL (100 per symbol by default)")
+    print("  --profile [<phase>] - Profile a phase of the run: parse, cnf (building the solver) or solve (default), printing the functions taking the most time")
+    print("  --profile-mode <mode> - cprofile (default) to trace every call, or sample to record the stack every millisecond, which slows long runs down much less")
+    print("  --profile-out <file> - Save the profile instead of printing it: pstats for cprofile (read with python -m pstats or snakeviz), collapsed stacks for sample (read by flame graph tools)")
+    print("  --restarts <policy> - Restart the DPLL search after a growing number of conflicts: luby or geometric")
+    print("  --timeout <seconds>, --max-conflicts <n>, --max-decisions <n>, --max-resolvents <n>, --max-memory <MB> - Stop RES or DPLL with UNKNOWN once the budget is exhausted")
+    print("\nBenchmark: './iengine bench [--methods <m,m,...>] [--files <f,f,...>] [--repeat <n>] [--warmup <n>] [--timeout <seconds>] [--output <results.json>] [--baseline <results.json>] [--alpha <level>] [--threshold <fraction>]'")
+    print("  Time every method on every file in a new process (all of them by default), reporting the parse, CNF and solve times, the median, p95 and min of the total time and the peak RSS. Results can be saved as JSON and compared with a baseline, exiting with status 1 on a significant regression")
+    print("\nShell: './iengine repl [<filename>]'")
+    print("  Tell sentences and ask queries interactively (TELL <sentences>, RETRACT <sentences>, ASK [<method>] <query>, METHOD, LOAD <filename>, LIST, QUIT). FC, BC and DPLL keep their state between queries and are updated by every sentence told, FC and BC by every sentence retracted")
+    print("\nServer: './iengine serve [--port <port>] [--socket <path>] [--cache-memory <MB>]'")
+    print("  Keep knowledge bases resident and answer JSON requests (TELL, ASK, RETRACT, STATUS) posted to http://127.0.0.1:<port> (8080 by default), or sent one per line to a Unix socket. The least recently used knowledge bases are evicted past the memory cap (256 MB by default)")
     print("\nExample: './iengine TT horn_1.txt'")
     print()
     
 def get_available_files():
-    import os
-    return os.listdir("data")
+    from parser import problem_files
+    return problem_files()
     
 
 if __name__ == "__main__":
@@ -58,6 +142,23 @@ if __name__ == "__main__":
         if method == "help":
             display_help()
             sys.exit()
+        if method == "bench":
+            # Benchmark a matrix of methods and files rather than solve a problem
+            import bench
+            sys.exit(0 if bench.main(**bench.parse_options(sys.argv)) else 1)
+        if method == "serve":
+            # Keep knowledge bases resident and answer queries until interrupted
+            import server
+            port = int(sys.argv[sys.argv.index("--port") + 1]) if "--port" in sys.argv else 8080
+            socket_path = sys.argv[sys.argv.index("--socket") + 1] if "--socket" in sys.argv else None
+            max_memory = float(sys.argv[sys.argv.index("--cache-memory") + 1]) if "--cache-memory" in sys.argv else server.MAX_MEMORY
+            server.main(port, socket_path, max_memory)
+            sys.exit()
+        if method == "repl":
+            # Tell and ask interactively, with the incremental solvers kept warm between queries
+            import repl
+            repl.main(sys.argv[2] if len(sys.argv) > 2 else None)
+            sys.exit()
         file_name = sys.argv[2]
         if "--analyze" in sys.argv:
             from analyze import analyze
@@ -67,7 +168,41 @@ if __name__ == "__main__":
                 number = 100
             analyze(file_name, method, number)
             sys.exit()
-        main(method, file_name)
+        preprocess = []
+        if "--preprocess" in sys.argv:
+            from preprocessing import parse_steps
+            position = sys.argv.index("--preprocess") + 1
+            # Without a list of steps, every step is applied
+            preprocess = parse_steps(sys.argv[position] if position < len(sys.argv) and not sys.argv[position].startswith("--") else "all")
+        heuristic = sys.argv[sys.argv.index("--heuristic") + 1] if "--heuristic" in sys.argv else None
+        restarts = sys.argv[sys.argv.index("--restarts") + 1] if "--restarts" in sys.argv else None
+        max_flips = int(sys.argv[sys.argv.index("--max-flips") + 1]) if "--max-flips" in sys.argv else None
+        backend = sys.argv[sys.argv.index("--backend") + 1] if "--backend" in sys.argv else None
+        workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else None
+        stats_format = None
+        if "--stats" in sys.argv:
+            position = sys.argv.index("--stats") + 1
+            stats_format = "json" if position < len(sys.argv) and sys.argv[position] == "json" else "text"
+        limits = {}
+        for option, limit, kind in (("--timeout", "timeout", float), ("--max-conflicts", "conflicts", int), ("--max-decisions", "decisions", int), ("--max-resolvents", "resolvents", int), ("--max-memory", "memory", int)):
+            if option in sys.argv:
+                limits[limit] = kind(sys.argv[sys.argv.index(option) + 1])
+        profiler = None
+        if "--profile" in sys.argv or "--profile-out" in sys.argv:
+            from profiling import Profiler, MODES
+            position = sys.argv.index("--profile") + 1 if "--profile" in sys.argv else len(sys.argv)
+            # Without a phase, the search is profiled
+            phase = sys.argv[position] if position < len(sys.argv) and not sys.argv[position].startswith("--") else "solve"
+            mode = sys.argv[sys.argv.index("--profile-mode") + 1] if "--profile-mode" in sys.argv else "cprofile"
+            if mode not in MODES:
+                raise ValueError(f"Unknown profile mode '{mode}', expected one of: {', '.join(MODES)}")
+            output = sys.argv[sys.argv.index("--profile-out") + 1] if "--profile-out" in sys.argv else None
+            profiler = Profiler(phase, mode == "sample", output)
+        budget = None
+        if limits:
+            from budget import Budget
+            budget = Budget(**limits)
+        main(method, file_name, "--slice" in sys.argv, "--split-components" in sys.argv, preprocess, heuristic, "--phase-saving" in sys.argv, budget, restarts, max_flips, "--model" in sys.argv, stats_format, profiler, backend, workers)
         
     # Handle exceptions
     # In case of missing arguments
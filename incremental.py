@@ -0,0 +1,358 @@
+"""
+This module contains the incremental solvers, which keep their state between queries and are updated sentence by sentence as a knowledge base changes, instead of being rebuilt from the whole knowledge base for every query.
+
+Every solver has tell(sentence), which adds a sentence to its state, and ask(query), which answers like solve() of the matching method:
+    - IncrementalForwardChaining keeps the symbols inferred from the knowledge base, with the premise counters of its rules. A new fact or rule only runs the agenda on what it adds, a retracted one only revisits its consequences, and a query is answered by a lookup.
+    - IncrementalBackwardChaining indexes the facts and rules by the symbol they conclude, and remembers the fact or rule each proven goal was proven by (a proven goal stays proven as sentences are added). A query only expands the goals proven by no earlier query.
+    - IncrementalDPLL keeps the integer clauses of the knowledge base with their watched literals. A query adds the clauses of its negation, runs the search and removes them.
+
+### Classes:
+    - IncrementalForwardChaining: Forward chaining over a changing knowledge base.
+    - IncrementalBackwardChaining: Backward chaining over a growing knowledge base.
+    - IncrementalDPLL: DPLL over a growing knowledge base.
+"""
+from collections import deque
+from syntax import *
+from clauses import encode
+from methods import DPLL
+from stats import DISABLED
+
+
+def _clauses(sentence:Sentence) -> tuple[Sentence, ...]:
+    # A conjunction told at once is the same as its arguments told one by one
+    return sentence.args if isinstance(sentence, Conjunction) else (sentence,)
+
+
+class IncrementalForwardChaining:
+    """
+    The class to represent a Forward Chaining Solver over a changing knowledge base.
+    The agenda is run to its end rather than up to the query, so the knowledge base is closed under its rules after every tell(): a new fact or rule only runs the agenda on the symbols it adds, and entails() is a lookup. The chain of a query is the symbols taken from the agenda up to it, as in ForwardChaining.solve().
+    Facts and rules are retracted by delete and rederive (DRed): every symbol inferred through the retracted sentence is deleted, whatever its other support, then the deleted symbols still told or concluded by a rule whose premise is inferred are inferred again by the agenda. A fact or rule told by several sentences is counted, and only removed once all of them are retracted. Only the consequences of the retracted sentence are visited, and cycles of rules do not keep each other inferred.
+    Symbols are numbered in the order they are told, and the agenda, counters and rules work on the numbers: a symbol is only hashed when it is told, retracted or asked, by its name.
+    Sentences that are neither facts nor rules concluding a symbol are ignored, like by ForwardChaining.
+
+    ### Attributes:
+        - symbols (list[Symbol]): The symbols told, by number.
+        - told (list[int]): The number of sentences of the knowledge base telling every symbol as a fact.
+        - position (list[int]): The position in the chain of the inference of every symbol, 0 if it is not inferred.
+        - count (list[int]): The number of symbols of the premise of every rule not inferred, by rule number.
+        - consequents (list[int]): The symbol concluded by every rule, by rule number.
+        - rules_told (list[int]): The number of sentences of the knowledge base telling every rule, by rule number.
+        - uses (list[list[int]]): The rules of the knowledge base with every symbol in their premise, in the order they were told.
+        - concluding (list[list[int]]): The rules of the knowledge base concluding every symbol.
+        - chain (list[int]): The symbols taken from the agenda, in order. The symbols deleted since are skipped by ask().
+        - agenda_pops (int): The number of symbols taken from the agenda.
+        - deletions (int): The number of symbols deleted by retractions, including those inferred again.
+
+    ### Methods:
+        - tell(sentence: Sentence): Add a sentence and infer its consequences.
+        - retract(sentence: Sentence): Remove a sentence and the consequences it alone supports.
+        - entails(query: Symbol): Check if the query is inferred.
+        - ask(query: Symbol): Check if the knowledge base entails the query, with the chain inferring it.
+    """
+    def __init__(self):
+        self.symbols = []
+        self.told = []
+        self.position = []
+        self.count = []
+        self.consequents = []
+        self.rules_told = []
+        self.uses = []
+        self.concluding = []
+        self.chain = []
+        self.agenda_pops = 0
+        self.deletions = 0
+        # The number of every symbol, by name, and of every rule of the knowledge base
+        self._numbers = {}
+        self._rules = {}
+        # The symbols deleted since the chain was last compacted
+        self._stale = 0
+
+    def tell(self, sentence:Sentence):
+        position, told = self.position, self.told
+        facts, ready = [], []
+        for clause in _clauses(sentence):
+            if isinstance(clause, Symbol):
+                symbol = self._number(clause)
+                told[symbol] += 1
+                if not position[symbol]:
+                    facts.append(symbol)
+            elif isinstance(clause, Implication) and isinstance(clause.consequent, Symbol):
+                if clause in self._rules:
+                    # Told by another sentence too: it stays until both are retracted
+                    self.rules_told[self._rules[clause]] += 1
+                    continue
+                rule = self._rules[clause] = len(self.count)
+                consequent = self._number(clause.consequent)
+                self.consequents.append(consequent)
+                self.rules_told.append(1)
+                self.concluding[consequent].append(rule)
+                # Only the symbols not inferred yet are counted
+                count = 0
+                for symbol in {self._number(symbol) for symbol in clause.antecedent.symbols()}:
+                    self.uses[symbol].append(rule)
+                    if not position[symbol]:
+                        count += 1
+                self.count.append(count)
+                if not count:
+                    ready.append(consequent)
+        if not facts and not ready:
+            return
+        if len(facts) > 1:
+            # The facts in the order of ForwardChaining, so a knowledge base told at once gives its chain
+            facts.sort(key=lambda symbol: self.symbols[symbol].name)
+        self._infer(deque(facts + ready))
+
+    def retract(self, sentence:Sentence):
+        deleted = []
+        for clause in _clauses(sentence):
+            if isinstance(clause, Symbol):
+                symbol = self._numbers.get(clause.name)
+                if symbol is not None and self.told[symbol]:
+                    self.told[symbol] -= 1
+                    # Still a fact while another sentence tells it
+                    if not self.told[symbol]:
+                        deleted.append(symbol)
+            elif isinstance(clause, Implication) and clause in self._rules:
+                rule = self._rules[clause]
+                self.rules_told[rule] -= 1
+                if self.rules_told[rule]:
+                    continue
+                del self._rules[clause]
+                for symbol in {self._numbers[symbol.name] for symbol in clause.antecedent.symbols()}:
+                    self.uses[symbol].remove(rule)
+                self.concluding[self.consequents[rule]].remove(rule)
+                if not self.count[rule]:
+                    # The rule fired: its conclusion may have lost its only support
+                    deleted.append(self.consequents[rule])
+        if deleted:
+            self._delete(deleted)
+
+    def entails(self, query:Symbol) -> bool:
+        symbol = self._numbers.get(query.name) if isinstance(query, Symbol) else None
+        return symbol is not None and self.position[symbol] > 0
+
+    def ask(self, query:Symbol) -> dict:
+        if not self.entails(query):
+            return { "entails": False }
+        position = self.position
+        # A symbol taken from the agenda before it was last inferred was deleted since
+        chain = [symbol for i, symbol in enumerate(self.chain[:position[self._numbers[query.name]]], start=1) if 0 < position[symbol] <= i]
+        return {
+            "entails": True,
+            "message": ', '.join([self.symbols[symbol].name for symbol in chain])
+        }
+
+    def _number(self, symbol:Symbol) -> int:
+        number = self._numbers.get(symbol.name)
+        if number is None:
+            number = self._numbers[symbol.name] = len(self.symbols)
+            self.symbols.append(symbol)
+            self.told.append(0)
+            self.position.append(0)
+            self.uses.append([])
+            self.concluding.append([])
+        return number
+
+    def _infer(self, agenda:deque[int]):
+        chain, position, count, consequents, uses = self.chain, self.position, self.count, self.consequents, self.uses
+        while agenda:
+            p = agenda.popleft()
+            self.agenda_pops += 1
+            chain.append(p)
+            if not position[p]:
+                position[p] = len(chain)
+                for rule in uses[p]:
+                    count[rule] -= 1
+                    if count[rule] == 0:
+                        agenda.append(consequents[rule])
+
+    def _delete(self, symbols:list[int]):
+        position, count, consequents, uses = self.position, self.count, self.consequents, self.uses
+        # Delete every symbol inferred through the given ones, through the rules that fired
+        deleted = []
+        stack = [symbol for symbol in symbols if position[symbol]]
+        while stack:
+            p = stack.pop()
+            if not position[p]:
+                continue
+            position[p] = 0
+            deleted.append(p)
+            for rule in uses[p]:
+                count[rule] += 1
+                if count[rule] == 1 and position[consequents[rule]]:
+                    stack.append(consequents[rule])
+        self.deletions += len(deleted)
+        # Then infer again the deleted symbols with another support, and what follows from them
+        self._infer(deque(symbol for symbol in deleted if self.told[symbol] or any(not count[rule] for rule in self.concluding[symbol])))
+        self._stale += len(deleted)
+        if self._stale > len(self.chain) // 2:
+            self._compact()
+
+    def _compact(self):
+        # Drop the entries of the chain of the symbols deleted since they were taken from the agenda, so it does not grow with the retractions
+        chain, position = [], self.position
+        for i, symbol in enumerate(self.chain, start=1):
+            if 0 < position[symbol] <= i:
+                if position[symbol] == i:
+                    position[symbol] = len(chain) + 1
+                chain.append(symbol)
+        self.chain = chain
+        self._stale = 0
+
+
+class IncrementalBackwardChaining:
+    """
+    The class to represent a Backward Chaining Solver over a growing knowledge base.
+    The goals are proven in the same order as by BackwardChaining.prove(), trying the facts and rules concluding a goal in the order they were told. The fact or rule proving a goal is remembered, so a goal proven by an earlier query is not searched again: its proof is added to the chain from the remembered facts and rules.
+
+    ### Attributes:
+        - conclusions (dict[Symbol, list[Sentence]]): The facts and rules concluding every symbol, in the order they were told.
+        - proofs (dict[Symbol, Sentence]): The fact or rule every proven goal was proven by.
+        - goals_expanded (int): The number of goals the search tried to prove.
+
+    ### Methods:
+        - tell(sentence: Sentence): Add a sentence.
+        - retract(sentence: Sentence): Remove a sentence.
+        - ask(query: Symbol): Check if the knowledge base entails the query.
+        - prove(goal: Symbol, chain: list[Symbol], proven: set[Symbol], visited: set[Symbol]): Prove the goal by proving its antecedents.
+    """
+    def __init__(self):
+        self.conclusions = {}
+        self.proofs = {}
+        self.goals_expanded = 0
+
+    def tell(self, sentence:Sentence):
+        for clause in _clauses(sentence):
+            if isinstance(clause, Symbol):
+                self.conclusions.setdefault(clause, []).append(clause)
+            elif isinstance(clause, Implication):
+                self.conclusions.setdefault(clause.consequent, []).append(clause)
+
+    def retract(self, sentence:Sentence):
+        for clause in _clauses(sentence):
+            conclusions = self.conclusions.get(clause if isinstance(clause, Symbol) else getattr(clause, "consequent", None), [])
+            if clause in conclusions:
+                conclusions.remove(clause)
+                # Any remembered proof may go through the sentence
+                self.proofs.clear()
+
+    def ask(self, query:Symbol) -> dict:
+        if query in self.conclusions.get(query, ()):
+            # A fact of the knowledge base
+            return {
+                "entails": True,
+                "message": query.name
+            }
+        chain = []
+        if self.prove(query, chain, set(), set()):
+            return {
+                "entails": True,
+                "message": ', '.join([symbol.name for symbol in chain])
+            }
+        return { "entails": False }
+
+    def prove(self, goal:Symbol, chain:list[Symbol], proven:set[Symbol], visited:set[Symbol]) -> bool:
+        if goal in self.proofs:
+            self._replay(goal, chain, proven)
+            return True
+        visited.add(goal)
+        self.goals_expanded += 1
+        for clause in self.conclusions.get(goal, ()):
+            if isinstance(clause, Symbol):
+                chain.append(goal)
+                proven.add(goal)
+                self.proofs[goal] = clause
+                return True
+            all_true = True
+            for subgoal in self._subgoals(clause):
+                if subgoal in proven:
+                    continue
+                if subgoal in visited or not self.prove(subgoal, chain, proven, visited):
+                    all_true = False
+                    break
+            if all_true:
+                chain.append(goal)
+                proven.add(goal)
+                self.proofs[goal] = clause
+                return True
+        return False
+
+    def _replay(self, goal:Symbol, chain:list[Symbol], proven:set[Symbol]):
+        # Add the proof of a goal proven by an earlier query to the chain, subgoals first
+        clause = self.proofs[goal]
+        if isinstance(clause, Implication):
+            for subgoal in self._subgoals(clause):
+                if subgoal not in proven:
+                    self._replay(subgoal, chain, proven)
+        chain.append(goal)
+        proven.add(goal)
+
+    @staticmethod
+    def _subgoals(clause:Implication) -> tuple[Sentence, ...]:
+        return clause.antecedent.args if isinstance(clause.antecedent, Conjunction) else (clause.antecedent,)
+
+
+class IncrementalDPLL(DPLL):
+    """
+    The class to represent a DPLL Solver over a growing knowledge base.
+    The clauses of every sentence are encoded once, when it is told, and added to the clause database and the watch lists; a new symbol gets the next variable. A query adds the clauses of its negation at the end of the database, runs the search from an empty trail and removes them, which leaves the watched literals of the knowledge base valid for the next query.
+    Branching uses the default heuristic of DPLL, without VSIDS or restarts.
+
+    ### Attributes:
+        - index (dict[Symbol, int]): The variable of every symbol.
+        - See DPLL for the other attributes.
+
+    ### Methods:
+        - tell(sentence: Sentence): Add the clauses of a sentence.
+        - ask(query: Sentence): Check if the knowledge base entails the query.
+    """
+    def __init__(self, heuristic:str="moms", phase_saving:bool=False):
+        self.kb = self.query = None
+        self.clauses = set()
+        self.preprocessing_report = []
+        self.stats = DISABLED
+        self._initialize_search(heuristic, phase_saving, None, None)
+        self.index = {}
+        # The clauses of the database, so a clause told twice is kept once
+        self._known = set()
+
+    def tell(self, sentence:Sentence):
+        self._add_symbols(sentence)
+        for clause in encode(sentence, self.index):
+            if clause not in self._known:
+                self._known.add(clause)
+                self._add_clause(clause)
+
+    def ask(self, query:Sentence) -> dict:
+        self._add_symbols(query)
+        size = len(self.database)
+        for clause in encode(query.negate(), self.index):
+            self._add_clause(clause)
+        try:
+            return self.solve()
+        finally:
+            # Back to an empty trail, then drop the clauses of the negated query from the database and their watch lists
+            self.backtrack(0)
+            self._branches.clear()
+            for clause in self.database[size:]:
+                if len(clause) > 1:
+                    for literal in clause[:2]:
+                        watchers = self._watches[literal]
+                        watchers.pop(next(i for i, watcher in enumerate(watchers) if watcher is clause))
+            del self.database[size:]
+
+    def _add_symbols(self, sentence:Sentence):
+        for symbol in sorted((symbol for symbol in sentence.symbols() if symbol not in self.index), key=lambda x: x.name):
+            self.symbols.append(symbol)
+            self.index[symbol] = len(self.symbols)
+            self.assignment.append(0)
+            self._watches[len(self.symbols)] = []
+            self._watches[-len(self.symbols)] = []
+
+    def _add_clause(self, clause:frozenset[int]):
+        clause = list(clause)
+        self.database.append(clause)
+        if len(clause) > 1:
+            self._watches[clause[0]].append(clause)
+            self._watches[clause[1]].append(clause)
@@ -1,7 +1,11 @@
-__all__ = ['TruthTable', 'BackwardChaining', 'ForwardChaining', 'Resolution', 'DPLL']
+__all__ = ['TruthTable', 'BackwardChaining', 'ForwardChaining', 'Resolution', 'DPLL', 'BDD', 'ModelCounting', 'Decomposition', 'WalkSAT']
 
 from .truth_table import TruthTable
 from .backward_chaining import BackwardChaining
 from .forward_chaining import ForwardChaining
 from .resolution import Resolution
-from .dpll import DPLL
\ No newline at end of file
+from .dpll import DPLL
+from .bdd import BDD
+from .model_counting import ModelCounting
+from .decomposition import Decomposition
+from .walksat import WalkSAT
\ No newline at end of file
@@ -5,6 +5,7 @@ sys.path.insert(0, parent_dir)
 
 from syntax import *
 from horn import check_horn_kb, check_horn_query
+from stats import Stats, DISABLED, instrumented
 
 
 class BackwardChaining:
@@ -16,17 +17,24 @@ class BackwardChaining:
     ### Attributes:
         - kb (Conjunction): The knowledge base.
         - query (Symbol): The query to be evaluated.
+        - stats (Stats): The statistics of the run: search time, goals expanded.
+        - goals_expanded (int): The number of goals the search tried to prove.
     
     ### Methods:
         - solve(): Solve the query using backward chaining.
         - prove(goal: Symbol, chain: list[Symbol], visited: set[Symbol]): Recursively prove the goal by proving its antecedents.
     """
-    def __init__(self, kb: Conjunction, query: Symbol):
+    STATISTICS = ("goals_expanded",)
+
+    def __init__(self, kb: Conjunction, query: Symbol, stats:Stats=None):
         self.kb = kb
         self.query = query
+        self.stats = stats if stats is not None else DISABLED
+        self.goals_expanded = 0
         check_horn_kb(self.kb)
         check_horn_query(self.query)
 
+    @instrumented
     def solve(self):
         if isinstance(self.kb, Symbol):
             if self.kb == self.query:
@@ -55,6 +63,7 @@ class BackwardChaining:
     def prove(self, goal:Symbol, chain:list[Symbol], visited:set[Symbol]):
         # print(goal, chain, visited, end=" => ")
         visited.add(goal)
+        self.goals_expanded += 1
         
         clauses = self.kb.args if isinstance(self.kb, Conjunction) else [self.kb]
         # Check if the goal is a fact in the KB
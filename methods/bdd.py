@@ -0,0 +1,356 @@
+import sys, os
+from collections import deque
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from stats import Stats, DISABLED, instrumented
+
+
+class BDDManager:
+    """
+    The class to represent a reduced ordered binary decision diagram (ROBDD) package.
+    Nodes are integers: 0 and 1 are the terminals, every other node tests the variable at its level and points to a low (False) and a high (True) child.
+    The unique table guarantees that equal functions share one node, and the computed table caches the results of apply() so shared sub-problems are solved once.
+
+    ### Attributes:
+        - order (list[Symbol]): The variable ordering, the first symbol being at the top of the diagram.
+        - level (dict[Symbol, int]): The level (position in the ordering) of each symbol.
+        - nodes (list[tuple[int, int, int]]): The (level, low, high) triple of every node.
+        - unique (dict[tuple[int, int, int], int]): The unique table, from (level, low, high) to node.
+        - computed (dict[tuple[str, int, int], int]): The computed table, from (operation, node, node) to the result node.
+
+    ### Methods:
+        - add_variable(symbol: Symbol): Append a variable at the bottom of the ordering.
+        - make(level: int, low: int, high: int): Get the node for a (level, low, high) triple, applying the reduction rules.
+        - variable(symbol: Symbol): Get the node of a single variable.
+        - apply(operation: str, u: int, v: int): Combine two nodes with a binary operation.
+        - negate(u: int): Get the node of the negation of a node.
+        - build(sentence: Sentence): Compile a sentence into a node.
+        - count(u: int): Count the models of a node over all the variables of the ordering.
+        - size(u: int): Count the nodes reachable from a node.
+    """
+    OPERATIONS = {
+        "and": lambda a, b: a and b,
+        "or": lambda a, b: a or b,
+        "implies": lambda a, b: not a or b,
+        "iff": lambda a, b: a == b,
+        "xor": lambda a, b: a != b,
+    }
+
+    def __init__(self, order:list[Symbol]):
+        self.order = []
+        self.level = {}
+        # Terminals sit below every variable; their level is updated when variables are added
+        self.nodes = [(0, 0, 0), (0, 1, 1)]
+        self.unique = {}
+        self.computed = {}
+        for symbol in order:
+            self.add_variable(symbol)
+
+    def add_variable(self, symbol:Symbol):
+        if symbol in self.level:
+            return
+        self.level[symbol] = len(self.order)
+        self.order.append(symbol)
+        self.nodes[0] = (len(self.order), 0, 0)
+        self.nodes[1] = (len(self.order), 1, 1)
+
+    def make(self, level:int, low:int, high:int) -> int:
+        if low == high:
+            # Redundant test
+            return low
+        key = (level, low, high)
+        node = self.unique.get(key)
+        if node is None:
+            node = len(self.nodes)
+            self.nodes.append(key)
+            self.unique[key] = node
+        return node
+
+    def variable(self, symbol:Symbol) -> int:
+        self.add_variable(symbol)
+        return self.make(self.level[symbol], 0, 1)
+
+    def apply(self, operation:str, u:int, v:int) -> int:
+        """
+        Combine two nodes with a binary operation (Bryant's apply), using an explicit stack so the number of variables is not limited by the recursion limit.
+
+        ### Args:
+            - operation (str): One of "and", "or", "implies", "iff" and "xor"
+            - u (int): The left operand
+            - v (int): The right operand
+
+        ### Returns:
+            - int: The node of the result
+        """
+        function = self.OPERATIONS[operation]
+        computed = self.computed
+        nodes = self.nodes
+        stack = [(u, v, False)]
+        while stack:
+            u, v, expanded = stack.pop()
+            key = (operation, u, v)
+            if key in computed:
+                continue
+            if u <= 1 and v <= 1:
+                computed[key] = int(function(bool(u), bool(v)))
+                continue
+            shortcut = self._shortcut(operation, u, v)
+            if shortcut is not None:
+                computed[key] = shortcut
+                continue
+            level_u, low_u, high_u = nodes[u]
+            level_v, low_v, high_v = nodes[v]
+            level = min(level_u, level_v)
+            # Cofactors with respect to the top variable
+            u0, u1 = (low_u, high_u) if level_u == level else (u, u)
+            v0, v1 = (low_v, high_v) if level_v == level else (v, v)
+            if expanded:
+                computed[key] = self.make(level, computed[(operation, u0, v0)], computed[(operation, u1, v1)])
+            else:
+                stack.append((u, v, True))
+                stack.append((u0, v0, False))
+                stack.append((u1, v1, False))
+        return computed[(operation, u, v)]
+
+    def _shortcut(self, operation:str, u:int, v:int):
+        # Results that do not need to look inside the non-terminal operand
+        if operation == "and":
+            if u == 0 or v == 0:
+                return 0
+            if u == 1 or u == v:
+                return v
+            if v == 1:
+                return u
+        elif operation == "or":
+            if u == 1 or v == 1:
+                return 1
+            if u == 0 or u == v:
+                return v
+            if v == 0:
+                return u
+        elif operation == "implies":
+            if u == 0 or v == 1 or u == v:
+                return 1
+            if u == 1:
+                return v
+        elif operation == "iff":
+            if u == v:
+                return 1
+            if u == 1:
+                return v
+            if v == 1:
+                return u
+        elif operation == "xor":
+            if u == v:
+                return 0
+            if u == 0:
+                return v
+            if v == 0:
+                return u
+        return None
+
+    def negate(self, u:int) -> int:
+        return self.apply("xor", 1, u)
+
+    def build(self, sentence:Sentence) -> int:
+        """
+        Compile a sentence into a node, bottom-up with an explicit stack. Symbols that are not in the ordering yet are appended to it.
+
+        ### Args:
+            - sentence (Sentence): The sentence to compile
+
+        ### Returns:
+            - int: The node of the sentence
+        """
+        results = {}
+        stack = [(sentence, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in results:
+                continue
+            if isinstance(node, Symbol):
+                results[id(node)] = self.variable(node)
+            elif not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children())
+            elif isinstance(node, Negation):
+                results[id(node)] = self.negate(results[id(node.arg)])
+            elif isinstance(node, Implication):
+                results[id(node)] = self.apply("implies", results[id(node.antecedent)], results[id(node.consequent)])
+            else:
+                operation = {Conjunction: "and", Disjunction: "or", Biconditional: "iff"}[type(node)]
+                # Combine from the top of the ordering downwards: with facts at the top (see BDD.order_variables),
+                # constraints are simplified by what is already known instead of building large intermediate diagrams
+                args = sorted((results[id(arg)] for arg in node.args), key=lambda u: self.nodes[u][0])
+                result = args[0]
+                for arg in args[1:]:
+                    result = self.apply(operation, result, arg)
+                results[id(node)] = result
+        return results[id(sentence)]
+
+    def count(self, u:int) -> int:
+        """
+        Count the models of a node over all the variables of the ordering, in time linear in the size of the diagram.
+
+        ### Args:
+            - u (int): The node to count the models of
+
+        ### Returns:
+            - int: The number of models
+        """
+        nodes = self.nodes
+        counts = {0: 0, 1: 1}
+        stack = [u]
+        while stack:
+            node = stack[-1]
+            if node in counts:
+                stack.pop()
+                continue
+            level, low, high = nodes[node]
+            if low in counts and high in counts:
+                stack.pop()
+                # Variables skipped between a node and its child are free
+                counts[node] = counts[low] * 2 ** (nodes[low][0] - level - 1) + \
+                    counts[high] * 2 ** (nodes[high][0] - level - 1)
+            else:
+                stack.extend(child for child in (low, high) if child not in counts)
+        return counts[u] * 2 ** nodes[u][0]
+
+    def size(self, u:int) -> int:
+        seen = set()
+        stack = [u]
+        while stack:
+            node = stack.pop()
+            if node <= 1 or node in seen:
+                continue
+            seen.add(node)
+            stack.extend(self.nodes[node][1:])
+        return len(seen)
+
+
+class BDD:
+    """
+    The class to represent a Binary Decision Diagram Solver.
+    The knowledge base is compiled once into a reduced ordered BDD (knowledge compilation). After that, entailment of any query is a single BDD implication check, and the number of models is counted in time linear in the size of the diagram.
+    The method is sound and complete, like the truth table.
+
+    ### Attributes:
+        - kb (Sentence): The knowledge base.
+        - query (Sentence): The query to be evaluated.
+        - manager (BDDManager): The BDD package holding the compiled knowledge base.
+        - root (int): The node of the compiled knowledge base.
+        - valid_models_count (int): The number of models of the knowledge base and the last query, over their symbols.
+        - stats (Stats): The statistics of the run: compile and search times, peak number of nodes.
+
+    ### Methods:
+        - solve(): Solve the query using the compiled knowledge base.
+        - ask(query: Sentence): Check if the compiled knowledge base entails another query.
+        - order_variables(kb: Sentence): Compute a variable ordering for the knowledge base.
+    """
+    STATISTICS = ("nodes",)
+
+    def __init__(self, kb: Sentence, query: Sentence, stats:Stats=None):
+        self.kb = kb
+        self.query = query
+        self.stats = stats if stats is not None else DISABLED
+        with self.stats.phase("compile"):
+            self.manager = BDDManager(self.order_variables(kb))
+            self.root = self.manager.build(kb)
+        self.valid_models_count = 0
+
+    @property
+    def nodes(self) -> list:
+        return self.manager.nodes
+
+    @instrumented
+    def solve(self):
+        return self.ask(self.query)
+
+    def ask(self, query:Sentence):
+        manager = self.manager
+        query_root = manager.build(query)
+        # Same answer as the truth table: YES if every model of the KB satisfies the query and there is at least one
+        entailed = self.root != 0 and manager.apply("implies", self.root, query_root) == 1
+        if not entailed:
+            return { "entails": False }
+        # The KB and the query hold in the same models, and variables outside KB and query do not change the count
+        universe = self.kb.symbols() | query.symbols()
+        self.valid_models_count = manager.count(self.root) // 2 ** (len(manager.order) - len(universe))
+        return {
+            "entails": True,
+            "message": self.valid_models_count
+        }
+
+    @staticmethod
+    def order_variables(kb:Sentence) -> list[Symbol]:
+        """
+        Compute a variable ordering for the knowledge base, so that related variables are close and the diagram stays small:
+            1. The facts (literal sentences) of the knowledge base come first, followed by the symbols in the order forward chaining over the implications would derive them.
+            2. The remaining symbols follow in breadth-first (Cuthill-McKee style) order over the symbols appearing in the same sentence, starting from the ones already ordered, then from the least frequent symbol of every other group.
+        Ties are broken by name so the ordering is deterministic.
+
+        ### Args:
+            - kb (Sentence): The knowledge base
+
+        ### Returns:
+            - list[Symbol]: The ordered symbols of the knowledge base
+        """
+        by_name = lambda x: x.name
+        sentences = list(kb.args) if isinstance(kb, Conjunction) else [kb]
+        sentence_symbols = [sorted(sentence.symbols(), key=by_name) for sentence in sentences]
+        occurrences = {}
+        for i, symbols in enumerate(sentence_symbols):
+            for symbol in symbols:
+                occurrences.setdefault(symbol, []).append(i)
+
+        # 1. Facts, then derivation order
+        facts = sorted((symbols[0] for sentence, symbols in zip(sentences, sentence_symbols)
+                        if isinstance(sentence, Symbol) or isinstance(sentence, Negation) and isinstance(sentence.arg, Symbol)),
+                       key=by_name)
+        premises = {}
+        waiting = {}
+        for i, sentence in enumerate(sentences):
+            if isinstance(sentence, Implication):
+                antecedent = sentence.antecedent.symbols()
+                premises[i] = len(antecedent)
+                for symbol in antecedent:
+                    waiting.setdefault(symbol, []).append(i)
+        order = []
+        visited = set()
+        queue = deque(facts)
+        while queue:
+            symbol = queue.popleft()
+            if symbol in visited:
+                continue
+            visited.add(symbol)
+            order.append(symbol)
+            for i in waiting.get(symbol, []):
+                premises[i] -= 1
+                if premises[i] == 0:
+                    queue.extend(sorted(sentences[i].consequent.symbols(), key=by_name))
+
+        # 2. Breadth-first over symbols sharing a sentence
+        expanded = set()
+        queue = deque(order)
+        for start in [None] + sorted(occurrences, key=lambda x: (len(occurrences[x]), x.name)):
+            if start is not None:
+                if start in visited:
+                    continue
+                visited.add(start)
+                order.append(start)
+                queue.append(start)
+            while queue:
+                symbol = queue.popleft()
+                for i in occurrences[symbol]:
+                    if i in expanded:
+                        continue
+                    expanded.add(i)
+                    for neighbour in sentence_symbols[i]:
+                        if neighbour not in visited:
+                            visited.add(neighbour)
+                            order.append(neighbour)
+                            queue.append(neighbour)
+        return order
@@ -0,0 +1,146 @@
+import sys, os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from slicing import symbol_components
+from stats import Stats, DISABLED, instrumented
+from .truth_table import TruthTable
+from .resolution import Resolution
+from .dpll import DPLL
+
+
+class Decomposition:
+    """
+    The class to represent a Component Decomposition Solver.
+    A knowledge base assembled from unrelated sub-theories is split into components that share no symbol, and every component is solved on its own by the chosen method, in parallel on a process pool:
+        - DPLL and RES: the clauses of the KB and the negated query are split. The KB entails the query if any component is unsatisfiable, so the search stops at the first one found.
+        - TT: the sentences of the KB are split, and the query joins the components it shares symbols with. The KB entails the query if it holds in every model of the query component and the KB has a model; the number of models is the product of the counts of the components.
+    The answers are the same as those of the method on the whole problem.
+
+    ### Attributes:
+        - method (str): The method solving the components (TT, RES or DPLL).
+        - kb (Sentence): The knowledge base.
+        - query (Sentence): The query to be evaluated.
+        - workers (int): The maximum number of worker processes.
+        - components (list[list[Sentence]]): The clauses (DPLL, RES) or sentences (TT) of every component. For TT the first component is the one of the query.
+        - valid_models_count (int): The number of valid models (TT only).
+        - stats (Stats): The statistics of the run: split and search times, number of components.
+
+    ### Methods:
+        - solve(): Solve the query by solving the components.
+        - split(): Split the problem into components.
+    """
+    METHODS = ("TT", "RES", "DPLL")
+
+    STATISTICS = ("components",)
+
+    def __init__(self, method:str, kb:Sentence, query:Sentence, workers:int=None, stats:Stats=None):
+        if method not in self.METHODS:
+            raise ValueError(f"Component splitting is only available for the following methods: {', '.join(self.METHODS)}")
+        self.method = method
+        self.kb = kb
+        self.query = query
+        self.workers = workers or os.cpu_count() or 1
+        self.stats = stats if stats is not None else DISABLED
+        with self.stats.phase("split"):
+            self.components = self.split()
+        self.valid_models_count = 0
+
+    def split(self) -> list[list[Sentence]]:
+        if self.method == "TT":
+            sentences = list(self.kb.args) if isinstance(self.kb, Conjunction) else [self.kb]
+            query_symbols = self.query.symbols()
+            query_component, others = [], []
+            for component in symbol_components(sentences):
+                if any(not sentence.symbols().isdisjoint(query_symbols) for sentence in component):
+                    query_component.extend(component)
+                else:
+                    others.append(component)
+            return [query_component] + others
+
+        solver = DPLL(self.kb, self.query) if self.method == "DPLL" else Resolution(self.kb, self.query)
+        return symbol_components(list(solver.clauses))
+
+    @instrumented
+    def solve(self):
+        if self.method == "TT":
+            return self._solve_truth_table()
+        batches = _batches(self.components, self.workers, len)
+        if len(batches) == 1:
+            refuted = _refute(self.method, batches[0])
+        else:
+            refuted = False
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(batches))) as executor:
+                futures = [executor.submit(_refute, self.method, batch) for batch in batches]
+                for future in as_completed(futures):
+                    if future.result():
+                        # One unsatisfiable component is enough: drop the batches that have not started
+                        refuted = True
+                        for other in futures:
+                            other.cancel()
+                        break
+        return { "entails": refuted }
+
+    def _solve_truth_table(self):
+        query_component, others = self.components[0], self.components[1:]
+        if not query_component:
+            # The query shares no symbol with the KB: there is nothing to split it from
+            solver = TruthTable(self.kb, self.query)
+            result = solver.solve()
+            self.valid_models_count = solver.valid_models_count
+            return result
+
+        # The query component is solved first with the query, the others only count the models of their sentences
+        tasks = [(query_component, self.query)] + [(component, None) for component in others]
+        batches = _batches(tasks, self.workers, lambda task: 2 ** len(_symbols(task[0])))
+        if len(batches) == 1:
+            results = _count(batches[0])
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(batches))) as executor:
+                results = [result for batch_results in executor.map(_count, batches) for result in batch_results]
+
+        valid = all(valid for valid, _ in results)
+        self.valid_models_count = 1
+        for _, count in results:
+            self.valid_models_count *= count
+        if valid and self.valid_models_count > 0:
+            return {
+                "entails": True,
+                "message": self.valid_models_count
+            }
+        return { "entails": False }
+
+
+def _batches(items:list, number:int, weight) -> list[list]:
+    # Longest processing time first: the heaviest items are spread over the batches, each new item going to the lightest batch.
+    # A few batches per worker keep the pool busy while limiting the number of tasks sent to other processes.
+    number = max(1, min(len(items), number * 4 if number > 1 else 1))
+    batches = [[] for _ in range(number)]
+    loads = [0] * number
+    for item in sorted(items, key=weight, reverse=True):
+        lightest = loads.index(min(loads))
+        batches[lightest].append(item)
+        loads[lightest] += weight(item)
+    return [batch for batch in batches if batch]
+
+def _symbols(sentences:list[Sentence]) -> set[Symbol]:
+    return set().union(*(sentence.symbols() for sentence in sentences))
+
+def _refute(method:str, components:list[list[Sentence]]) -> bool:
+    # Runs in a worker process: True if any of the components is unsatisfiable
+    solver_class = DPLL if method == "DPLL" else Resolution
+    return any(solver_class.from_clauses(component).solve()["entails"] for component in components)
+
+def _count(tasks:list[tuple[list[Sentence], Sentence]]) -> list[tuple[bool, int]]:
+    # Runs in a worker process: for every component, whether the query holds in all of its models, and the number of models
+    results = []
+    for sentences, query in tasks:
+        kb = Conjunction(*sentences) if len(sentences) > 1 else sentences[0]
+        # Without a query, the component is checked against itself, so every model of it is counted
+        solver = TruthTable(kb, query if query is not None else kb)
+        valid = solver.check_all()
+        results.append((valid, solver.valid_models_count))
+    return results
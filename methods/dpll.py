@@ -4,124 +4,287 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
 
 from syntax import *
-from cnf import to_cnf
+from cnf import cnf_clauses
+from clauses import encode_clauses
+from preprocessing import preprocess_clauses
+from heuristics import HEURISTICS, VSIDS
+from budget import Budget, BudgetExhausted, UNKNOWN, restart_limits
+from stats import Stats, DISABLED, instrumented
 
 
 class DPLL:
     """
     The class to represent a DPLL Solver.
-    DPLL is a sound and complete inference algorithm that works by recursively assigning truth values to symbols. It starts with the CNF of the KB and the negation of the query, and recursively applies unit propagation and pure literal elimination to derive new clauses until a contradiction is found.
-    
+    DPLL is a sound and complete inference algorithm that works by assigning truth values to symbols until a model is found or every assignment is refuted. It starts with the CNF of the KB and the negation of the query, and applies unit propagation and pure literal elimination after every decision; the KB entails the query if no model is found.
+    The search is iterative, over integer clauses: every assignment is pushed on a trail, and a stack records the decisions. Unit propagation watches two literals of every clause, so a clause is only visited when one of them becomes false. On a conflict the trail is undone back to the last decision whose other value has not been tried. Memory stays linear in the size of the clauses, whatever the depth of the search.
+
     ### Attributes:
         - kb (Conjunction): The knowledge base.
         - query (Symbol): The query to be evaluated.
         - clauses (set): The set of clauses.
-        
+        - preprocessing_report (list[dict]): The report of every preprocessing step applied to the clauses (see preprocessing.preprocess()).
+        - symbols (list[Symbol]): The symbols of the clauses, sorted by name. Symbol i is variable i + 1.
+        - database (list[list[int]]): The integer clauses. The first two literals of a clause are its watched literals.
+        - heuristic (str): The branching heuristic (see heuristics.HEURISTICS).
+        - vsids (VSIDS): The variable activities, when branching with VSIDS.
+        - phase_saving (bool): Whether a branch first tries the value last assigned to its variable.
+        - phases (dict[int, bool]): The value last assigned to every variable.
+        - assignment (list[int]): The value of every variable: 1 (true), -1 (false) or 0 (unassigned). Index 0 is unused.
+        - trail (list[int]): The literals made true, in order of assignment.
+        - decisions (int): The number of branches taken.
+        - conflicts (int): The number of clauses falsified.
+        - propagations (int): The number of literals assigned by unit propagation.
+        - stats (Stats): The statistics of the run: CNF, preprocessing and search times, decisions, propagations, conflicts, restarts, peak number of clauses.
+        - budget (Budget): The resource budget of the search, if any. solve() returns UNKNOWN when it runs out.
+        - restart_policy (str): The restart policy (see budget.restart_limits()), if any. A restart drops the current search but keeps the heuristic state (VSIDS activities, saved phases), so it is only useful with those. As no clause is learnt, restarts mostly help on satisfiable problems.
+        - restarts (int): The number of restarts.
+        - model (dict[Symbol, bool]): The model of the KB ^ ~Q read from the trail, when one is found. It is not given after preprocessing, which may remove symbols or change their meaning.
+
     ### Methods:
+        - from_clauses(clauses: Iterable[Sentence]) <<classmethod>>: Create a solver over an existing set of clauses.
         - initialize_clauses(): Initialize the set of clauses.
         - solve(): Solve the query using DPLL.
-        - dpll(clauses: set): Recursively apply DPLL algorithm.
-        - is_literal(clause: Sentence): Check if a clause is a literal (either a symbol or the negation of a symbol).
-        - contains_literal(literal: Symbol|Negation, clause: Sentence): Check if a clause is or contains a literal.
-        - unit_propagate(literal: Symbol|Negation, clauses: set): Apply unit propagation and return modified clauses set.
-        - is_pure_literal(literal: Symbol|Negation, clauses: set): Check if a literal is pure, meaning that only either itself or its negation (not both) appears in the clauses set.
-        - find_pure_literals(clauses: set): Find all pure literals in a set of clauses.
-        - pure_literal_assign(literal: Symbol|Negation, clauses: set): Assign a truth value to a pure literal.
+        - search(): Run DPLL on the clauses, restarting it according to the restart policy.
+        - dpll(): Search from the current trail until a model is found, every assignment is refuted, or a restart is due.
+        - propagate(): Apply unit propagation to the literals of the trail not propagated yet.
+        - unsatisfied_clauses(): Get the clauses not satisfied yet, restricted to their unassigned literals.
+        - choose_literal(clauses: list[tuple[int, ...]]): Choose the literal to branch on with the heuristic.
+        - assign(literal: int): Make a literal true and push it on the trail.
+        - backtrack(position: int): Undo the assignments of the trail from a position.
+        - trail_model(): Get the model given by the trail.
     """
-    def __init__(self, kb: Conjunction, query: Symbol):
+    # Number of conflicts of the first run of a restarting search
+    RESTART_BASE = 100
+
+    STATISTICS = ("decisions", "propagations", "conflicts", "restarts", "clauses")
+
+    def __init__(self, kb: Conjunction, query: Symbol, preprocess:list[str]=(), heuristic:str="moms", phase_saving:bool=False, budget:Budget=None, restarts:str=None, stats:Stats=None):
         self.kb = kb
         self.query = query
-        self.clauses = self.initialize_clauses()
+        self.stats = stats if stats is not None else DISABLED
+        with self.stats.phase("cnf"):
+            self.clauses = self.initialize_clauses()
+        self.preprocessing_report = []
+        if preprocess:
+            with self.stats.phase("preprocess"):
+                self.clauses, self.preprocessing_report = preprocess_clauses(self.clauses, preprocess)
+        self._initialize_search(heuristic, phase_saving, budget, restarts)
+
+    @classmethod
+    def from_clauses(cls, clauses, heuristic:str="moms", phase_saving:bool=False, budget:Budget=None, restarts:str=None):
+        # Solver over clauses that are already converted, e.g. one component of a larger problem.
+        # solve() then reports whether the clauses are unsatisfiable.
+        solver = cls.__new__(cls)
+        solver.kb = solver.query = None
+        solver.clauses = set(clauses)
+        solver.preprocessing_report = []
+        solver.stats = DISABLED
+        solver._initialize_search(heuristic, phase_saving, budget, restarts)
+        return solver
+
+    def _initialize_search(self, heuristic:str, phase_saving:bool, budget:Budget, restarts:str):
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"Unknown heuristic '{heuristic}', expected one of: {', '.join(HEURISTICS)}")
+        with self.stats.phase("cnf"):
+            self.symbols, int_clauses = encode_clauses(self.clauses)
+        self.database = [list(clause) for clause in int_clauses]
+        self.heuristic = heuristic
+        self.vsids = VSIDS(self.database) if heuristic == "vsids" else None
+        self.phase_saving = phase_saving
+        self.phases = {}
+        self.assignment = [0] * (len(self.symbols) + 1)
+        self.trail = []
+        self.decisions = 0
+        self.conflicts = 0
+        self.propagations = 0
+        self.budget = budget
+        self.restart_policy = restarts
+        self._restart_limits = restart_limits(restarts, self.RESTART_BASE) if restarts is not None else None
+        self._restart_at = None
+        self.restarts = 0
+        self.model = None
+        # Decisions of the current branch: (trail position, literal, whether it is the second value tried)
+        self._branches = []
+        # Position of the first trail literal not propagated yet
+        self._propagated = 0
+        self._watches = {literal: [] for variable in range(1, len(self.symbols) + 1) for literal in (variable, -variable)}
+        for clause in self.database:
+            if len(clause) > 1:
+                self._watches[clause[0]].append(clause)
+                self._watches[clause[1]].append(clause)
 
     def initialize_clauses(self):
-        kb_cnf = to_cnf(self.kb)
-        query_negated = to_cnf(self.query.negate())
-        combined_clauses = Conjunction(kb_cnf, query_negated)
-        return {clause for clause in combined_clauses.args}
+        return cnf_clauses(self.kb) | cnf_clauses(self.query.negate())
 
+    @instrumented
     def solve(self):
-        negation_satisfied = self.dpll(self.clauses)
+        if self.budget is not None:
+            self.budget.start()
+        try:
+            negation_satisfied = self.search()
+        except BudgetExhausted:
+            return dict(UNKNOWN)
         if negation_satisfied:
-            return { "entails": False }
+            if self.preprocessing_report:
+                return { "entails": False }
+            # The model proving the NO answer is the trail itself
+            self.model = self.trail_model()
+            return {
+                "entails": False,
+                "model": self.model
+            }
         else: # Negation of the query is unsatisfiable
             return {
                 "entails": True # The KB entails the query
             }
 
-    def dpll(self, clauses:set[Sentence]):
-        # Unit propagation
-        unit_clauses = {clause for clause in clauses if self.is_literal(clause)}
-        while unit_clauses:
-            for unit_clause in unit_clauses:
-                clauses = self.unit_propagate(unit_clause, clauses)
-            unit_clauses = {clause for clause in clauses if self.is_literal(clause)}
-            
-        # Pure literal elimination
-        pure_literals = self.find_pure_literals(clauses)
-        for literal in pure_literals:
-            clauses = self.pure_literal_assign(literal, clauses)
-        
-        # Stopping conditions
-        if not clauses:
-            return True
-        if any(clause is None for clause in clauses):
-            # Clauses contain an empty clause, which means the KB ^ ~Q is unsatisfiable
-            return False
-        
-        # DPLL recursion
-        literal = next(iter(clauses)).symbols().pop()
-        return self.dpll(clauses.union({literal})) or self.dpll(clauses.union({literal.negate()}))
-        
-    def is_literal(self, clause:Sentence) -> bool:
-        if isinstance(clause, Symbol):
-            return True
-        return isinstance(clause, Negation) and isinstance(clause.arg, Symbol)
-    
-    def contains_literal(self, literal:Symbol|Negation, clause:Sentence) -> bool:
-        if literal == clause:
-            return True
-        if isinstance(clause, CommutativeSentence):
-            return any(literal == arg for arg in clause.args)
-        return False
-    
-    def unit_propagate(self, literal:Symbol|Negation, clauses:set[Sentence]) -> set[Sentence]:
-        new_clauses = set()
-        for clause in clauses:
-            if self.contains_literal(literal, clause):
+    def search(self) -> bool:
+        # Unit clauses hold whatever the decisions, so they are assigned once, before any of them
+        for clause in self.database:
+            if not clause:
+                # An empty clause, which means the KB ^ ~Q is unsatisfiable
+                return False
+            if len(clause) == 1:
+                value = self._value(clause[0])
+                if value < 0:
+                    return False
+                if value == 0:
+                    self.assign(clause[0])
+                    self.propagations += 1
+        while True:
+            if self._restart_limits is not None:
+                self._restart_at = self.conflicts + next(self._restart_limits)
+            satisfied = self.dpll()
+            if satisfied is not None:
+                return satisfied
+            self.restarts += 1
+
+    def dpll(self) -> bool | None:
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if self.vsids is not None:
+                    self.vsids.bump(abs(literal) for literal in conflict)
+                if self.budget is not None:
+                    self.budget.check(self.conflicts, self.decisions)
+                # Drop the decisions whose both values failed
+                while self._branches and self._branches[-1][2]:
+                    self._branches.pop()
+                if not self._branches:
+                    # Every assignment is refuted: the KB ^ ~Q is unsatisfiable
+                    return False
+                if self._restart_at is not None and self.conflicts >= self._restart_at:
+                    self.backtrack(self._branches[0][0])
+                    self._branches.clear()
+                    return None
+                position, literal, _ = self._branches.pop()
+                self.backtrack(position)
+                self._branches.append((position, -literal, True))
+                self.assign(-literal)
+                continue
+
+            clauses = self.unsatisfied_clauses()
+            if not clauses:
+                # Every clause is satisfied: the trail is a model of the KB ^ ~Q
+                return True
+
+            # Pure literal elimination: a literal whose complement appears in no clause left can be made true
+            literals = {literal for clause in clauses for literal in clause}
+            pure_literals = [literal for literal in literals if -literal not in literals]
+            if pure_literals:
+                for literal in pure_literals:
+                    self.assign(literal)
                 continue
-            if self.contains_literal(literal.negate(), clause):
-                if isinstance(clause, Disjunction):
-                    args = [arg for arg in clause.args if arg != literal.negate()]
-                    # print("ARGS", args)
-                    if len(args) > 1:
-                        new_clause = Disjunction(*args)
-                    elif len(args) == 1:
-                        new_clause = args[0]
-                    else:
-                        new_clause = None
-                    new_clauses.add(new_clause)
-                elif clause == literal.negate():
-                    new_clauses.add(None)
+
+            literal = self.choose_literal(clauses)
+            self.decisions += 1
+            if self.budget is not None:
+                self.budget.check(self.conflicts, self.decisions)
+            self._branches.append((len(self.trail), literal, False))
+            self.assign(literal)
+
+    def propagate(self) -> list[int] | None:
+        """
+        Apply unit propagation to the literals of the trail that have not been propagated yet. Only the clauses watching the complement of a new literal are visited: each looks for another literal that is not false to watch, and if there is none, its other watched literal is made true, or the clause is falsified.
+
+        ### Returns:
+            - list[int] | None: The falsified clause if there is a conflict, None otherwise
+        """
+        while self._propagated < len(self.trail):
+            false_literal = -self.trail[self._propagated]
+            self._propagated += 1
+            watchers = self._watches[false_literal]
+            i = 0
+            while i < len(watchers):
+                clause = watchers[i]
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self._value(clause[0]) > 0:
+                    # Satisfied by the other watched literal
+                    i += 1
+                    continue
+                for k in range(2, len(clause)):
+                    if self._value(clause[k]) >= 0:
+                        # Watch a literal that is not false instead
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self._watches[clause[1]].append(clause)
+                        watchers[i] = watchers[-1]
+                        watchers.pop()
+                        break
                 else:
-                    new_clauses.add(clause)
+                    if self._value(clause[0]) < 0:
+                        return clause
+                    self.assign(clause[0])
+                    self.propagations += 1
+                    i += 1
+        return None
+
+    def unsatisfied_clauses(self) -> list[tuple[int, ...]]:
+        clauses = []
+        for clause in self.database:
+            unassigned = []
+            for literal in clause:
+                value = self._value(literal)
+                if value > 0:
+                    break
+                if value == 0:
+                    unassigned.append(literal)
             else:
-                new_clauses.add(clause)
-        return new_clauses
-    
-    def is_pure_literal(self, literal:Symbol|Negation, clauses:set[Sentence]) -> bool:
-        positive = any(self.contains_literal(literal, clause) for clause in clauses)
-        negative = any(self.contains_literal(literal.negate(), clause) for clause in clauses)
-        return positive != negative
-    
-    def find_pure_literals(self, clauses:set[Sentence]) -> set[Symbol|Negation]:
-        pure_literals = set()
-        for clause in clauses:
-            if clause is None:
-                continue
-            for symbol in clause.symbols():
-                if self.is_pure_literal(symbol, clauses):
-                    pure_literals.add(symbol)
-        return pure_literals
-    
-    def pure_literal_assign(self, literal:Symbol|Negation, clauses:set[Sentence]) -> set[Sentence]:
-        return set([clause for clause in clauses if not self.contains_literal(literal, clause)])
+                clauses.append(tuple(unassigned))
+        return clauses
+
+    def choose_literal(self, clauses:list[tuple[int, ...]]) -> int:
+        if self.vsids is not None:
+            literal = self.vsids.select(clauses)
+        else:
+            literal = HEURISTICS[self.heuristic](clauses)
+        if self.phase_saving and abs(literal) in self.phases:
+            literal = abs(literal) if self.phases[abs(literal)] else -abs(literal)
+        return literal
+
+    def assign(self, literal:int):
+        self.assignment[abs(literal)] = 1 if literal > 0 else -1
+        self.trail.append(literal)
+        if self.phase_saving:
+            self.phases[abs(literal)] = literal > 0
+
+    def backtrack(self, position:int):
+        # Watched literals stay valid when assignments are undone, so only the trail is restored
+        for literal in self.trail[position:]:
+            self.assignment[abs(literal)] = 0
+        del self.trail[position:]
+        self._propagated = min(self._propagated, position)
+
+    def trail_model(self) -> dict[Symbol, bool]:
+        # Every clause is satisfied by the trail: the symbols it leaves unassigned, or that appear in no clause, can take any value
+        symbols = self.kb.symbols() | self.query.symbols() if self.kb is not None else set()
+        model = {symbol: False for symbol in symbols}
+        for variable, symbol in enumerate(self.symbols, start=1):
+            model[symbol] = self.assignment[variable] > 0
+        return dict(sorted(model.items(), key=lambda item: item[0].name))
+
+    def _value(self, literal:int) -> int:
+        # 1 if the literal is true, -1 if it is false, 0 if it is unassigned
+        value = self.assignment[abs(literal)]
+        return value if literal > 0 else -value
@@ -1,10 +1,20 @@
-import sys, os
+import sys, os, itertools, multiprocessing
+from collections import deque
+from multiprocessing import shared_memory
 
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
 
 from syntax import *
 from horn import check_horn_kb, check_horn_query
+from stats import Stats, DISABLED, instrumented
+
+try:
+    import numpy as np
+except ImportError: # Optional, only needed by the numpy backend
+    np = None
+
+BACKENDS = ("python", "numpy")
 
 
 class ForwardChaining:
@@ -12,24 +22,50 @@ class ForwardChaining:
     The class to represent a Forward Chaining Solver.
     Forward chaining is a simple inference algorithm that works by repeatedly applying Modus Ponens. It starts with the symbols known to be true and iteratively adds symbols to the knowledge base.
     Forward chaining is sound and complete for Horn clauses.
+    The rules are indexed by the symbols of their premise and the agenda is a queue, so the search takes time linear in the size of the KB.
+    The numpy backend numbers the symbols, stores the rules of every symbol as compressed sparse row (CSR) arrays and runs the agenda in rounds: a round is the symbols the previous one made true, and the premise counters of all the rules of its new symbols are decremented at once. The symbols of a round come out in the order the queue would take them, so the chain is the same as with the python backend, in a fraction of the time on large knowledge bases.
+    With more than one worker, the rules are sharded by their conclusion over worker processes, each with the CSR arrays of its own rules. The premise counters are a single array in shared memory, in which every worker only decrements the counters of its rules. Every round, the new symbols are sent to all the workers, which send back the rules they made true, and the next round is their conclusions. The closure ends at the global fixpoint, when no worker made a rule true. The rules are merged in the order of the queue, so the chain is again the same.
     
     ### Attributes:
         - kb (Conjunction): The knowledge base.
         - query (Symbol): The query to be evaluated.
+        - backend (str): python, or numpy for the vectorized rounds (needs NumPy).
+        - workers (int): The number of worker processes sharing the rules of the numpy backend, 1 to run the rounds in this process.
+        - stats (Stats): The statistics of the run: search time, agenda pops.
+        - agenda_pops (int): The number of symbols taken from the agenda.
         
     ### Methods:
         - solve(): Solve the query using forward chaining.
+        - compile(): Number the symbols and build the arrays of the numpy backend, once per solver: another query is solved by setting the query and solving again.
     """
-    def __init__(self, kb: Conjunction, query: Symbol):
+    STATISTICS = ("agenda_pops",)
+
+    def __init__(self, kb: Conjunction, query: Symbol, stats:Stats=None, backend:str="python", workers:int=1):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of: {', '.join(BACKENDS)}")
+        if backend == "numpy" and np is None:
+            raise ValueError("The numpy backend needs NumPy, which is not installed")
+        if workers < 1 or (workers > 1 and backend != "numpy"):
+            raise ValueError("Worker processes are only available with the numpy backend, and there must be at least one")
         self.kb = kb
         self.query = query
+        self.backend = backend
+        self.workers = workers
+        self.stats = stats if stats is not None else DISABLED
+        self.agenda_pops = 0
+        self._arrays = None
         check_horn_kb(self.kb)
         check_horn_query(self.query)
     
+    @instrumented
     def solve(self):
+        if self.backend == "numpy":
+            return self._solve_rounds()
         # Initialize inferred and count dictionaries
         inferred = {symbol: False for symbol in self.kb.symbols()}
         count = {}
+        # The rules with every symbol in their premise, in the order of the KB, so a symbol only visits its own rules
+        rules = {}
         
         # Initialize the agenda with symbols known to be true
         if isinstance(self.kb, Symbol):
@@ -37,19 +73,26 @@ class ForwardChaining:
         elif isinstance(self.kb, Implication):
             agenda = []
             count[self.kb] = len(self.kb.antecedent.symbols())
+            for symbol in self.kb.antecedent.symbols():
+                rules.setdefault(symbol, []).append(self.kb)
         else: # Conjunction
             agenda = [symbol for symbol in self.kb.args if isinstance(symbol, Symbol)]
             for clause in self.kb.args:
                 if isinstance(clause, Implication):
                     count[clause] = len(clause.antecedent.symbols())
+                    for symbol in clause.antecedent.symbols():
+                        rules.setdefault(symbol, []).append(clause)
             # print(count)
         agenda.sort(key=lambda x: x.name)
+        # First in, first out, in constant time
+        agenda = deque(agenda)
         # print(agenda)        
         
         chain:list[Symbol] = []  # Track the result of forward chaining
         
         while agenda:
-            p = agenda.pop(0)
+            p = agenda.popleft()
+            self.agenda_pops += 1
             chain.append(p)
             if p == self.query:
                 return {
@@ -59,13 +102,168 @@ class ForwardChaining:
             # print(p, agenda, inferred, chain)
             if not inferred[p]:
                 inferred[p] = True
-                for clause in self.kb.args if isinstance(self.kb, Conjunction) else [self.kb]:
-                    if isinstance(clause, Implication):
-                        if p in clause.antecedent.symbols():
-                            # print(clause.antecedent.symbols())
-                            count[clause] -= 1
-                            if count[clause] == 0:
-                                agenda.append(clause.consequent)
+                for clause in rules.get(p, ()):
+                    count[clause] -= 1
+                    if count[clause] == 0:
+                        agenda.append(clause.consequent)
         
         return { "entails": False }
-     
\ No newline at end of file
+
+    def compile(self) -> tuple[dict[str, int], "np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Number the symbols of the KB by name and build the arrays of the numpy backend. The rules are numbered in the order of the KB, as they are visited by the python backend.
+
+        ### Returns:
+            - tuple: The number of every symbol by name, the facts sorted by name, the size of the premise and the conclusion of every rule, and the CSR arrays of the rules of every symbol (the rules of symbol i are rules[start[i]:start[i + 1]], in the order of the KB)
+        """
+        facts, counts, consequents, premises = [], [], [], []
+        clauses = self.kb.args if isinstance(self.kb, Conjunction) else (self.kb,)
+        for clause in clauses:
+            if isinstance(clause, Symbol):
+                facts.append(clause.name)
+            elif isinstance(clause, Implication) and isinstance(clause.consequent, Symbol):
+                symbols = clause.antecedent.symbols()
+                counts.append(len(symbols))
+                consequents.append(clause.consequent.name)
+                premises.extend([symbol.name for symbol in symbols])
+        facts.sort()
+        numbers = {name: number for number, name in enumerate(dict.fromkeys(itertools.chain(facts, consequents, premises)))}
+        # The names are numbered by C loops rather than one Python call per symbol
+        number = lambda names: np.fromiter(map(numbers.__getitem__, names), dtype=np.int64, count=len(names))
+        facts, consequents, premises = number(facts), number(consequents), number(premises)
+        rule_of = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+        # Stable, so the rules of a symbol stay in the order of the KB
+        order = np.argsort(premises, kind="stable")
+        rules = rule_of[order]
+        start = np.zeros(len(numbers) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(premises, minlength=len(numbers)), out=start[1:])
+        return numbers, facts, np.array(counts, dtype=np.int64), consequents, rules, start
+
+    def _solve_rounds(self):
+        if self._arrays is None:
+            self._arrays = self.compile()
+        numbers, facts, count, consequents, rules, start = self._arrays
+        query = numbers.get(self.query.name) if isinstance(self.query, Symbol) else None
+        inferred = np.zeros(len(numbers), dtype=bool)
+        if self.workers > 1:
+            shards = _Shards(count, consequents, rules, start, self.workers)
+            fire = shards.fire
+        else:
+            # Decremented in place, so every solve starts from a copy
+            count = count.copy()
+            fire = lambda symbols: _fire(count, rules, start, symbols)
+        chain = []
+        # The symbols in the queue, in order: the facts, then the conclusions of the rules each round makes true
+        agenda = facts
+        try:
+            while agenda.size:
+                if query is not None:
+                    found = np.flatnonzero(agenda == query)
+                    if found.size:
+                        chain.append(agenda[:found[0] + 1])
+                        self.agenda_pops += int(found[0]) + 1
+                        names = list(numbers)
+                        return {
+                            "entails": True,
+                            "message": ', '.join([names[symbol] for symbol in np.concatenate(chain).tolist()])
+                        }
+                chain.append(agenda)
+                self.agenda_pops += agenda.size
+                # The symbols the queue takes for the first time, in the order it takes them
+                symbols, first = np.unique(agenda, return_index=True)
+                new = ~inferred[symbols]
+                symbols = symbols[new][np.argsort(first[new])]
+                inferred[symbols] = True
+                fired, positions = fire(symbols)
+                # A rule is made true by the last of its premise symbols the queue takes, then in the order of the KB, as the queue visits them
+                agenda = consequents[fired[np.lexsort((fired, positions))]]
+        finally:
+            if self.workers > 1:
+                shards.close()
+        return { "entails": False }
+
+
+def _fire(count:"np.ndarray", rules:"np.ndarray", start:"np.ndarray", symbols:"np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+    # Decrement the counters of the rules of the symbols, and return the rules made true with the position of their last premise symbol in the round
+    sizes = start[symbols + 1] - start[symbols]
+    offsets = np.repeat(start[symbols] - np.cumsum(sizes) + sizes, sizes) + np.arange(sizes.sum())
+    visited = rules[offsets]
+    np.subtract.at(count, visited, 1)
+    reversed_rules, last = np.unique(visited[::-1], return_index=True)
+    fired = count[reversed_rules] == 0
+    positions = np.repeat(np.arange(symbols.size), sizes)[visited.size - 1 - last]
+    return reversed_rules[fired], positions[fired]
+
+
+def _shared(array:"np.ndarray") -> tuple[shared_memory.SharedMemory, "np.ndarray"]:
+    # A copy of an array in a new block of shared memory (at least one byte, the smallest block)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    copy = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    copy[:] = array
+    return block, copy
+
+
+def _attach(name:str, shape:tuple, dtype) -> tuple[shared_memory.SharedMemory, "np.ndarray"]:
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _shard_worker(connection, count:tuple, rules:tuple, start:tuple):
+    # The arrays are (name, shape, dtype) of shared memory blocks: the counters of all the rules, and the CSR arrays of the rules of the shard
+    blocks, arrays = zip(*(_attach(*array) for array in (count, rules, start)))
+    try:
+        while (symbols := connection.recv()) is not None:
+            connection.send(_fire(*arrays, symbols))
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+
+
+class _Shards:
+    # The worker processes of the rules sharded by conclusion, and the shared memory of their arrays
+    def __init__(self, count:"np.ndarray", consequents:"np.ndarray", rules:"np.ndarray", start:"np.ndarray", workers:int):
+        self.blocks, self.connections, self.processes = [], [], []
+        try:
+            count_block, _ = _shared(count)
+            self.blocks.append(count_block)
+            # The symbol of every entry of the CSR arrays, which stay in the order of the KB within a shard
+            premises = np.repeat(np.arange(start.size - 1), np.diff(start))
+            shard_of = consequents[rules] % workers
+            for shard in range(workers):
+                mask = shard_of == shard
+                shard_start = np.zeros_like(start)
+                np.cumsum(np.bincount(premises[mask], minlength=start.size - 1), out=shard_start[1:])
+                rules_block, _ = _shared(rules[mask])
+                start_block, _ = _shared(shard_start)
+                self.blocks += [rules_block, start_block]
+                connection, child = multiprocessing.Pipe()
+                arrays = [(block.name, array.shape, array.dtype) for block, array in ((count_block, count), (rules_block, rules[mask]), (start_block, shard_start))]
+                process = multiprocessing.Process(target=_shard_worker, args=(child, *arrays), daemon=True)
+                process.start()
+                child.close()
+                self.connections.append(connection)
+                self.processes.append(process)
+        except BaseException:
+            self.close()
+            raise
+
+    def fire(self, symbols:"np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+        for connection in self.connections:
+            connection.send(symbols)
+        results = [connection.recv() for connection in self.connections]
+        return np.concatenate([fired for fired, _ in results]), np.concatenate([positions for _, positions in results])
+
+    def close(self):
+        for connection in self.connections:
+            try:
+                connection.send(None)
+            except OSError:
+                # The worker already stopped
+                pass
+            connection.close()
+        for process in self.processes:
+            process.join()
+        for block in self.blocks:
+            block.close()
+            block.unlink()
@@ -0,0 +1,121 @@
+import sys, os
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from clauses import symbol_index, encode, variables, components, elimination_order, propagate
+from stats import Stats, DISABLED, instrumented
+
+
+class ModelCounting:
+    """
+    The class to represent a Model Counting (#SAT) Solver.
+    Model counting gives the same answer and count as the truth table without enumerating the models. It counts the models of the KB and of KB ∧ query with a DPLL-style search on integer clauses: after unit propagation, the clauses are split into components that share no variable, the counts of the components are multiplied, and the count of every component is cached so it is computed only once.
+    The KB entails the query if both counts are equal, i.e. no model of the KB falsifies the query. The method is sound and complete.
+
+    ### Attributes:
+        - kb (Sentence): The knowledge base.
+        - query (Sentence): The query to be evaluated.
+        - symbols (list[Symbol]): The symbols in the knowledge base and the query, sorted by name.
+        - kb_clauses (list[frozenset[int]]): The integer clauses of the knowledge base.
+        - query_clauses (list[frozenset[int]]): The integer clauses of the query.
+        - priority (dict[int, int]): The branching priority of every variable, higher first.
+        - cache (dict[frozenset[frozenset[int]], int]): The component cache, from a set of clauses to its number of models.
+        - kb_models_count (int): The number of models of the knowledge base.
+        - valid_models_count (int): The number of models of the knowledge base and the query.
+        - branches (int): The number of components split on a variable.
+        - stats (Stats): The statistics of the run: CNF and search times, branches, peak number of cached components.
+
+    ### Methods:
+        - solve(): Solve the query by counting models.
+        - count(clauses: Iterable[frozenset[int]]): Count the models of a set of clauses over all the symbols.
+        - count_component(clauses: frozenset[frozenset[int]]): Count the models of a set of clauses over their own variables.
+    """
+    STATISTICS = ("branches", "cache")
+
+    def __init__(self, kb: Sentence, query: Sentence, stats:Stats=None):
+        self.kb = kb
+        self.query = query
+        self.stats = stats if stats is not None else DISABLED
+        self.symbols = sorted(kb.symbols() | query.symbols(), key=lambda x: x.name)
+        index = symbol_index(self.symbols)
+        with self.stats.phase("cnf"):
+            self.kb_clauses = encode(kb, index)
+            self.query_clauses = encode(query, index)
+        # Branch on the variables a min-degree elimination removes last: they separate the clauses into components
+        self.priority = {variable: i for i, variable in enumerate(elimination_order(self.kb_clauses + self.query_clauses))}
+        self.cache = {}
+        self.kb_models_count = 0
+        self.valid_models_count = 0
+        self.branches = 0
+
+    @instrumented
+    def solve(self):
+        self.kb_models_count = self.count(self.kb_clauses)
+        self.valid_models_count = self.count(self.kb_clauses + self.query_clauses) if self.kb_models_count else 0
+        # Same answer as the truth table: YES if every model of the KB satisfies the query and there is at least one
+        if self.valid_models_count > 0 and self.valid_models_count == self.kb_models_count:
+            return {
+                "entails": True,
+                "message": self.valid_models_count
+            }
+        return { "entails": False }
+
+    def count(self, clauses) -> int:
+        clauses = frozenset(clauses)
+        # Symbols that appear in no clause can take any value
+        free = len(self.symbols) - len(variables(clauses))
+        return self.count_component(clauses) * 2 ** free
+
+    def count_component(self, clauses:frozenset[frozenset[int]]) -> int:
+        """
+        Count the models of a set of clauses over the variables appearing in them.
+        The search runs on an explicit stack of counting steps, so the number of nested branches is not limited by the recursion limit.
+
+        ### Args:
+            - clauses (frozenset[frozenset[int]]): The clauses to count the models of
+
+        ### Returns:
+            - int: The number of models
+        """
+        stack = [self._count_steps(clauses)]
+        value = None
+        while stack:
+            try:
+                request = stack[-1].send(value)
+            except StopIteration as stop:
+                stack.pop()
+                value = stop.value
+                continue
+            if request in self.cache:
+                value = self.cache[request]
+            else:
+                stack.append(self._count_steps(request))
+                value = None
+        return value
+
+    def _count_steps(self, clauses:frozenset[frozenset[int]]):
+        # Generator of one counting step: yields the sets of clauses it needs the count of, and returns the count of its own clauses
+        if not clauses:
+            return 1
+        simplified, assigned = propagate(clauses)
+        if simplified is None:
+            result = 0
+        else:
+            # Variables satisfied away by propagation without being assigned are free
+            result = 2 ** (len(variables(clauses)) - len(variables(simplified)) - len(assigned))
+            for component in components(simplified):
+                component = frozenset(component)
+                if component not in self.cache:
+                    # Split on the variable with the highest priority, each branch adding it as a unit clause
+                    variable = max(variables(component), key=self.priority.__getitem__)
+                    self.branches += 1
+                    positive = yield component | {frozenset((variable,))}
+                    negative = yield component | {frozenset((-variable,))}
+                    self.cache[component] = positive + negative
+                result *= self.cache[component]
+                if result == 0:
+                    break
+        self.cache[clauses] = result
+        return result
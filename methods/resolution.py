@@ -5,7 +5,10 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
 
 from syntax import *
-from cnf import to_cnf
+from cnf import cnf_clauses
+from preprocessing import preprocess_clauses
+from budget import Budget, BudgetExhausted, UNKNOWN
+from stats import Stats, DISABLED, instrumented
 
 class Resolution:
     """
@@ -16,29 +19,64 @@ class Resolution:
         - kb (Conjunction): The knowledge base.
         - query (Symbol): The query to be evaluated.
         - clauses (set): The set of clauses.
+        - preprocessing_report (list[dict]): The report of every preprocessing step applied to the clauses (see preprocessing.preprocess()).
+        - budget (Budget): The resource budget of the search, if any. solve() returns UNKNOWN when it runs out.
+        - resolvents (int): The number of resolvents generated.
+        - resolvents_kept (int): The number of new clauses added by the resolvents.
+        - stats (Stats): The statistics of the run: CNF, preprocessing and search times, resolvents generated and kept, peak number of clauses.
         
     ### Methods:
+        - from_clauses(clauses: Iterable[Sentence]) <<classmethod>>: Create a solver over an existing set of clauses.
         - initialize_clauses(): Initialize the set of clauses.
         - solve(): Solve the query using resolution.
+        - saturate(): Resolve the pairs of clauses until the empty clause is derived or no new clause is.
         - resolve(clause1: Sentence, clause2: Sentence): Resolve two clauses. Return the resolvents.
     """
-    def __init__(self, kb: Conjunction, query: Symbol):
+    STATISTICS = ("resolvents", "resolvents_kept", "clauses")
+
+    def __init__(self, kb: Conjunction, query: Symbol, preprocess:list[str]=(), budget:Budget=None, stats:Stats=None):
         self.kb = kb
         self.query = query
-        self.clauses = self.initialize_clauses()
+        self.budget = budget
+        self.stats = stats if stats is not None else DISABLED
+        self.resolvents = 0
+        self.resolvents_kept = 0
+        with self.stats.phase("cnf"):
+            self.clauses = self.initialize_clauses()
+        self.preprocessing_report = []
+        if preprocess:
+            with self.stats.phase("preprocess"):
+                self.clauses, self.preprocessing_report = preprocess_clauses(self.clauses, preprocess)
+
+    @classmethod
+    def from_clauses(cls, clauses, budget:Budget=None):
+        # Solver over clauses that are already converted, e.g. one component of a larger problem.
+        # solve() then reports whether the clauses are unsatisfiable.
+        solver = cls.__new__(cls)
+        solver.kb = solver.query = None
+        solver.budget = budget
+        solver.stats = DISABLED
+        solver.resolvents = 0
+        solver.resolvents_kept = 0
+        solver.clauses = set(clauses)
+        solver.preprocessing_report = []
+        return solver
 
     def initialize_clauses(self):
-        # Convert KB to CNF
-        kb_cnf = to_cnf(self.kb)
-        # Negate the query and convert to CNF
-        query_negated = to_cnf(self.query.negate())
-        # Combine the KB and the negated query into a single set of clauses
-        combined_clauses = Conjunction(kb_cnf, query_negated)
-        # Flatten the conjunction into individual clauses
-        # print(f"Combined Clauses: {combined_clauses}")
-        return {clause for clause in combined_clauses.args}
+        # The clauses of the KB and of the negated query, without tautologies
+        return cnf_clauses(self.kb) | cnf_clauses(self.query.negate())
 
+    @instrumented
     def solve(self):
+        if self.budget is None:
+            return self.saturate()
+        self.budget.start()
+        try:
+            return self.saturate()
+        except BudgetExhausted:
+            return dict(UNKNOWN)
+
+    def saturate(self):
         # print(f"Clauses: {self.clauses}")
         new_clauses = set()
 
@@ -47,6 +85,9 @@ class Resolution:
 
             for (clause1, clause2) in pairs:
                 resolvents = self.resolve(clause1, clause2)
+                self.resolvents += len(resolvents)
+                if self.budget is not None:
+                    self.budget.check(resolvents=self.resolvents)
                 # print(f"Resolvents: {resolvents} - {clause1} - {clause2}")
                 for resolvent in resolvents:
                     if resolvent is None:
@@ -58,7 +99,9 @@ class Resolution:
             if new_clauses.issubset(self.clauses):
                 return { "entails": False }
 
+            clauses_count = len(self.clauses)
             self.clauses = self.clauses.union(new_clauses)
+            self.resolvents_kept += len(self.clauses) - clauses_count
     
     def resolve(self, clause1, clause2):
         resolvents = []
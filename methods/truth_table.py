@@ -1,73 +1,94 @@
 import sys, os
-# from itertools import product
+from itertools import product
 from tabulate import tabulate
 
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
 
 from syntax import *
+from compiler import compile_sentence
+from stats import Stats, DISABLED, instrumented
 
 
 class TruthTable:
     """
     The class to represent a Truth Table Solver.
-    The truth table method is a sound and complete inference algorithm that works by evaluating all possible models. It starts with the symbols in the knowledge base and the query, and recursively checks all models.
+    The truth table method is a sound and complete inference algorithm that works by evaluating all possible models. It starts with the symbols in the knowledge base and the query, and checks all models.
+    The knowledge base and the query are compiled into Python functions once, so checking a model does not walk the sentence trees.
     
     ### Attributes:
         - kb (Conjunction): The knowledge base.
         - query (Sentence): The query to be evaluated.
-        - symbols (set[Symbol]): The set of symbols in the knowledge base and the query.
-        - table (list): The truth table.
+        - symbols (list[Symbol]): The symbols in the knowledge base and the query, sorted by name.
         - valid_models_count (int): The number of valid models.
+        - counter_model (dict[Symbol, bool]): The first model of the knowledge base found to falsify the query, if any.
+        - stats (Stats): The statistics of the run: compile and search times, models enumerated.
+        - models_enumerated (int): The number of models checked.
         
     ### Methods:
         - solve(): Solve the truth table.
-        - check_all(kb: Conjunction, query: Sentence, symbols: set[Symbol], model: dict): Recursively check all models.
+        - models(): Iterate over all models, as tuples of truth values ordered like the symbols.
+        - check_all(): Check all models, counting the valid ones.
         - generate_table(): Generate the truth table.
     """
-    def __init__(self, kb: Conjunction, query: Sentence):
+    STATISTICS = ("models_enumerated",)
+
+    def __init__(self, kb: Conjunction, query: Sentence, stats:Stats=None):
         self.kb = kb
         self.query = query
+        self.stats = stats if stats is not None else DISABLED
         self.symbols = sorted(kb.symbols() | query.symbols(), key=lambda x: x.name)
-        self.table = []
         self.valid_models_count = 0
+        self.counter_model = None
+        self.models_enumerated = 0
+        with self.stats.phase("compile"):
+            self._evaluate_kb = compile_sentence(kb, self.symbols)
+            self._evaluate_query = compile_sentence(query, self.symbols)
 
+    @instrumented
     def solve(self):
-        model = {}
-        valid = self.check_all(self.kb, self.query, self.symbols, model)
+        valid = self.check_all()
         if valid and self.valid_models_count > 0:
             return {
                 "entails": True,
                 "message": self.valid_models_count
             }
             # print(f'YES: {self.valid_models_count}')
+        elif self.counter_model is not None:
+            return {
+                "entails": False,
+                "model": self.counter_model
+            }
         else:
             return { "entails": False }
 
-    def check_all(self, kb: Conjunction, query: Sentence, symbols: set[Symbol], model: dict):
-        if not symbols:
-            kb_eval = kb.evaluate(model)
-            query_eval = query.evaluate(model)
-            self.table.append((model.copy(), kb_eval, query_eval))
-            if kb_eval and query_eval:
-                self.valid_models_count += 1
-            return query_eval if kb_eval else True
-        else:
-            symbol, *rest = symbols
-            return all([
-                self.check_all(kb, query, rest, {**model, symbol: True}),
-                self.check_all(kb, query, rest, {**model, symbol: False})
-            ])
+    def models(self):
+        # Same order as assigning True before False to each symbol in turn
+        return product((True, False), repeat=len(self.symbols))
+
+    def check_all(self) -> bool:
+        evaluate_kb, evaluate_query = self._evaluate_kb, self._evaluate_query
+        valid = True
+        valid_models_count = 0
+        counter_model = None
+        for model in self.models():
+            if evaluate_kb(model):
+                if evaluate_query(model):
+                    valid_models_count += 1
+                elif valid:
+                    valid = False
+                    counter_model = model
+        self.valid_models_count = valid_models_count
+        self.models_enumerated += 2 ** len(self.symbols)
+        self.counter_model = dict(zip(self.symbols, counter_model)) if counter_model is not None else None
+        return valid
 
     def generate_table(self):
-        if not self.table:
-            self.solve()
         headers = [symbol for symbol in self.symbols] 
         headers += ['KB: ' + str(self.kb), 'Query: ' + str(self.query)]
         rows = []
-        for model, kb_eval, query_eval in self.table:
-            row = [str(model[symbol]) for symbol in self.symbols] + [str(kb_eval), str(query_eval)]
+        for model in self.models():
+            row = [str(value) for value in model] + [str(self._evaluate_kb(model)), str(self._evaluate_query(model))]
             rows.append(row)
         # print(len(headers), len(rows[0]))
         return tabulate(rows, headers, tablefmt='fancy_grid')
-     
\ No newline at end of file
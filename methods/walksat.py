@@ -0,0 +1,151 @@
+import sys, os, random
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from stats import Stats, DISABLED, instrumented
+from .dpll import DPLL
+
+
+class WalkSAT:
+    """
+    The class to represent a WalkSAT Solver.
+    WalkSAT is a stochastic local search for a model of the CNF of the KB and the negation of the query. Starting from a random assignment, it repeatedly picks a falsified clause and flips one of its variables: one whose flip falsifies no other clause if there is one, otherwise a random one with probability noise, or the one falsifying the fewest clauses (its break count). The number of true literals of every clause and the break count of every variable are cached and updated at every flip, so a flip only visits the clauses of the flipped variable.
+    A model found answers NO (the KB does not entail the query) and is returned as a witness. Local search cannot prove that there is no model, so after a budget of flips the problem is handed to DPLL, which makes the method sound and complete.
+
+    ### Attributes:
+        - kb (Conjunction): The knowledge base.
+        - query (Symbol): The query to be evaluated.
+        - dpll (DPLL): The DPLL solver, whose integer clauses are searched and which is used as fallback.
+        - max_flips (int): The number of flips before falling back to DPLL.
+        - noise (float): The probability of a random walk step.
+        - rng (random.Random): The random number generator, seeded for reproducible runs.
+        - flips (int): The number of flips made.
+        - model (dict[Symbol, bool]): The model found by the local search, if any.
+        - stats (Stats): The statistics of the run: CNF and search times, flips, and those of DPLL when it is used.
+
+    ### Methods:
+        - from_clauses(clauses: Iterable[Sentence]) <<classmethod>>: Create a solver over an existing set of clauses.
+        - solve(): Solve the query with local search, then DPLL if no model is found.
+        - search(): Search for a model of the clauses.
+    """
+    # Default flip budget, per variable
+    FLIPS_PER_VARIABLE = 100
+
+    STATISTICS = ("flips",)
+
+    def __init__(self, kb: Conjunction, query: Symbol, max_flips:int=None, noise:float=0.5, seed:int=0, stats:Stats=None):
+        self.kb = kb
+        self.query = query
+        self.stats = stats if stats is not None else DISABLED
+        self._initialize_search(DPLL(kb, query, stats=self.stats), max_flips, noise, seed)
+
+    @classmethod
+    def from_clauses(cls, clauses, max_flips:int=None, noise:float=0.5, seed:int=0):
+        # Solver over clauses that are already converted; solve() then reports whether the clauses are unsatisfiable.
+        solver = cls.__new__(cls)
+        solver.kb = solver.query = None
+        solver.stats = DISABLED
+        solver._initialize_search(DPLL.from_clauses(clauses), max_flips, noise, seed)
+        return solver
+
+    def _initialize_search(self, dpll:DPLL, max_flips:int, noise:float, seed:int):
+        self.dpll = dpll
+        self.max_flips = max_flips if max_flips is not None else self.FLIPS_PER_VARIABLE * max(1, len(dpll.symbols))
+        self.noise = noise
+        self.rng = random.Random(seed)
+        self.flips = 0
+        self.model = None
+
+    @instrumented
+    def solve(self):
+        assignment = self.search()
+        if assignment is None:
+            # No model within the flip budget: it may not exist, which only a complete search can tell
+            return self.dpll.solve()
+        # Symbols that appear in no clause can take any value
+        symbols = self.kb.symbols() | self.query.symbols() if self.kb is not None else set()
+        model = {symbol: False for symbol in symbols}
+        for variable, symbol in enumerate(self.dpll.symbols, start=1):
+            model[symbol] = assignment[variable]
+        self.model = dict(sorted(model.items(), key=lambda item: item[0].name))
+        return {
+            "entails": False,
+            "model": self.model
+        }
+
+    def search(self) -> list[bool] | None:
+        """
+        Search for a model of the integer clauses of the DPLL solver.
+
+        ### Returns:
+            - list[bool] | None: The value of every variable (index 0 is unused) if a model is found within the flip budget, None otherwise
+        """
+        clauses = self.dpll.database
+        if any(not clause for clause in clauses):
+            return None
+        variable_count = len(self.dpll.symbols)
+        assignment = [False] + [self.rng.random() < 0.5 for _ in range(variable_count)]
+        occurrences = {literal: [] for variable in range(1, variable_count + 1) for literal in (variable, -variable)}
+        for i, clause in enumerate(clauses):
+            for literal in clause:
+                occurrences[literal].append(i)
+
+        # For every clause, the number of true literals and the XOR of their variables, which is the critical variable when only one is true
+        true_count = [0] * len(clauses)
+        true_xor = [0] * len(clauses)
+        # For every variable, the number of clauses it is the only true literal of (they would be falsified by flipping it)
+        break_count = [0] * (variable_count + 1)
+        # Falsified clauses, with their position in the list for constant time removal
+        falsified, position = [], {}
+        for i, clause in enumerate(clauses):
+            for literal in clause:
+                if assignment[abs(literal)] == (literal > 0):
+                    true_count[i] += 1
+                    true_xor[i] ^= abs(literal)
+            if true_count[i] == 0:
+                position[i] = len(falsified)
+                falsified.append(i)
+            elif true_count[i] == 1:
+                break_count[true_xor[i]] += 1
+
+        while falsified:
+            if self.flips >= self.max_flips:
+                return None
+            clause = clauses[self.rng.choice(falsified)]
+            candidates = [abs(literal) for literal in clause]
+            breaks = [break_count[variable] for variable in candidates]
+            best = min(breaks)
+            if best > 0 and self.rng.random() < self.noise:
+                variable = self.rng.choice(candidates)
+            else:
+                variable = self.rng.choice([variable for variable, value in zip(candidates, breaks) if value == best])
+
+            # Flip the variable and update the caches of the clauses it appears in
+            self.flips += 1
+            assignment[variable] = not assignment[variable]
+            made_true = variable if assignment[variable] else -variable
+            for i in occurrences[made_true]:
+                true_count[i] += 1
+                if true_count[i] == 1:
+                    last = falsified.pop()
+                    if last != i:
+                        falsified[position[i]] = last
+                        position[last] = position[i]
+                    del position[i]
+                    break_count[variable] += 1
+                elif true_count[i] == 2:
+                    # The clause had a critical variable, which it no longer has
+                    break_count[true_xor[i]] -= 1
+                true_xor[i] ^= variable
+            for i in occurrences[-made_true]:
+                true_count[i] -= 1
+                true_xor[i] ^= variable
+                if true_count[i] == 0:
+                    position[i] = len(falsified)
+                    falsified.append(i)
+                    break_count[variable] -= 1
+                elif true_count[i] == 1:
+                    break_count[true_xor[i]] += 1
+        return assignment
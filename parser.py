@@ -5,6 +5,7 @@ This module contains the parser for the knowledge base and query.
     - parse_kb_and_query(file_name: str) -> tuple[Sentence, Sentence]: Parse the knowledge base and query from the file.
     - sanitize(input: str) -> str: Sanitize the input string by removing all whitespaces and newlines.
     - read_file(file_name: str) -> tuple[list[str], str, bool]: Read the content of the file and return the knowledge base, query, and optionally expected result as strings.
+    - problem_files() -> list[str]: Get the names of the problem files of the data folder.
     - tokenize(text: str) -> list[tuple[str, str]]: Tokenize the input text into a list of tokens.
     - escaped_connective(connective: str) -> str: Escape the connective for regex.
     - parse(tokens: list[tuple[str, str]]) -> Sentence: Parse the tokens into a Sentence object.
@@ -55,6 +56,16 @@ def sanitize(input:str):
     return input.replace('\n', ' ').replace(' ', '').strip()
 
 
+def problem_files() -> list[str]:
+    """
+    Get the names of the problem files of the data folder, leaving out its sub-folders (the problems written by generator.py) and other files (DIMACS files).
+
+    ### Returns:
+        - list[str]: The names of the .txt files, sorted.
+    """
+    return sorted(file_name for file_name in os.listdir(INPUT_DIR) if file_name.endswith('.txt') and os.path.isfile(os.path.join(INPUT_DIR, file_name)))
+
+
 def read_file(file_name:str) -> tuple[list[str], str, bool]:
     """
     Read the content of the file and return the knowledge base and query as strings.
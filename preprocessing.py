@@ -0,0 +1,311 @@
+"""
+This module contains functions to simplify a set of clauses before a solver works on it (CNF preprocessing).
+
+Every step keeps the clauses equisatisfiable (satisfiable if and only if the original clauses are), which is what refutation solvers like Resolution and DPLL need. The steps work on integer clauses (see clauses.py) and are applied in this order:
+    - ssr: Subsumption and self-subsuming resolution. A clause containing another clause is removed, and a clause D is strengthened to D - {~l} when some clause C ∪ {l} has C ⊆ D - {~l}.
+    - els: Equivalent-literal substitution. Binary clauses are implications between literals; literals in the same strongly connected component of the implication graph are equivalent and replaced by one representative.
+    - probe: Failed-literal probing. A literal whose unit propagation leads to a conflict is false, so its complement is asserted and propagated.
+    - bve: Bounded variable elimination. A variable is eliminated by replacing the clauses containing it with all their non-tautological resolvents on it, when this does not increase the number of clauses.
+An empty clause in the result means the clauses are unsatisfiable.
+
+### Functions:
+    - preprocess(clauses: list[frozenset[int]], steps: Iterable[str]) -> tuple[list[frozenset[int]], list[dict]]: Apply the preprocessing steps to integer clauses.
+    - preprocess_clauses(clauses: Iterable[Sentence], steps: Iterable[str]) -> tuple[set[Sentence], list[dict]]: Apply the preprocessing steps to clauses produced by to_cnf().
+    - parse_steps(text: str) -> list[str]: Parse a comma-separated list of steps.
+    - self_subsuming_resolution(clauses: list[frozenset[int]]) -> list[frozenset[int]]: Remove subsumed clauses and strengthen clauses by self-subsuming resolution.
+    - equivalent_literal_substitution(clauses: list[frozenset[int]]) -> list[frozenset[int]]: Replace equivalent literals by a representative.
+    - failed_literal_probing(clauses: list[frozenset[int]]) -> list[frozenset[int]]: Assert the complement of every literal that fails by unit propagation.
+    - bounded_variable_elimination(clauses: list[frozenset[int]]) -> list[frozenset[int]]: Eliminate variables by resolution when this does not add clauses.
+    - _strongly_connected_components(graph: dict[int, set[int]]) -> list[list[int]]: Find the strongly connected components of a graph.
+"""
+import time
+from collections import deque
+from typing import Iterable
+from syntax import *
+from clauses import encode_clauses, variables, propagate
+
+UNSATISFIABLE = [frozenset()]
+
+
+def self_subsuming_resolution(clauses: list[frozenset[int]]) -> list[frozenset[int]]:
+    """
+    Remove the clauses subsumed by (containing) another clause, and strengthen clauses by self-subsuming resolution: if C ∪ {l} and D with C ⊆ D and ~l ∈ D are clauses, ~l is removed from D.
+
+    ### Args:
+        - clauses (list[frozenset[int]]): The clauses to simplify
+
+    ### Returns:
+        - list[frozenset[int]]: The simplified clauses
+    """
+    clauses = set(clauses)
+    if frozenset() in clauses:
+        return UNSATISFIABLE
+    occurrences = {}
+    for clause in clauses:
+        for literal in clause:
+            occurrences.setdefault(literal, set()).add(clause)
+    def remove(clause):
+        clauses.discard(clause)
+        for literal in clause:
+            occurrences[literal].discard(clause)
+
+    # Short clauses first: they subsume and strengthen the most. Ties are ordered by variables for a deterministic result
+    queue = deque(sorted(clauses, key=lambda clause: (len(clause), sorted(map(abs, clause)), sorted(clause))))
+    while queue:
+        clause = queue.popleft()
+        if clause not in clauses:
+            continue
+        # Any clause subsumed or strengthened by this one contains its rarest variable, with either sign
+        rarest = min(clause, key=lambda x: len(occurrences.get(x, ())) + len(occurrences.get(-x, ())))
+        for other in list(occurrences.get(rarest, ())) + list(occurrences.get(-rarest, ())):
+            if other is clause or other not in clauses or len(other) < len(clause):
+                continue
+            missing = clause - other
+            if not missing:
+                remove(other)
+            elif len(missing) == 1:
+                literal = next(iter(missing))
+                if -literal in other:
+                    remove(other)
+                    strengthened = other - {-literal}
+                    if not strengthened:
+                        return UNSATISFIABLE
+                    if strengthened not in clauses:
+                        clauses.add(strengthened)
+                        for other_literal in strengthened:
+                            occurrences.setdefault(other_literal, set()).add(strengthened)
+                        queue.append(strengthened)
+    return list(clauses)
+
+def equivalent_literal_substitution(clauses: list[frozenset[int]]) -> list[frozenset[int]]:
+    """
+    Replace equivalent literals by a representative. Every binary clause a || b gives the implications ~a => b and ~b => a; the literals of a strongly connected component of the implication graph are all equivalent.
+
+    ### Args:
+        - clauses (list[frozenset[int]]): The clauses to simplify
+
+    ### Returns:
+        - list[frozenset[int]]: The clauses with every literal replaced by the representative of its component, without tautologies and duplicates
+    """
+    graph = {}
+    for clause in clauses:
+        if len(clause) == 2:
+            a, b = clause
+            graph.setdefault(-a, set()).add(b)
+            graph.setdefault(-b, set()).add(a)
+
+    representative = {}
+    for component in _strongly_connected_components(graph):
+        if len(component) < 2:
+            continue
+        members = set(component)
+        if any(-literal in members for literal in members):
+            # A literal equivalent to its complement
+            return UNSATISFIABLE
+        # The complementary component gets the complementary representative
+        chosen = min(component, key=abs)
+        for literal in component:
+            representative[literal] = chosen
+            representative[-literal] = -chosen
+    if not representative:
+        return list(clauses)
+
+    substituted = []
+    for clause in clauses:
+        clause = frozenset(representative.get(literal, literal) for literal in clause)
+        if not any(-literal in clause for literal in clause):
+            substituted.append(clause)
+    return list(dict.fromkeys(substituted))
+
+def failed_literal_probing(clauses: list[frozenset[int]]) -> list[frozenset[int]]:
+    """
+    Probe every literal with unit propagation: if assuming it leads to a conflict, its complement is implied by the clauses, so it is asserted and propagated.
+
+    ### Args:
+        - clauses (list[frozenset[int]]): The clauses to simplify
+
+    ### Returns:
+        - list[frozenset[int]]: The clauses after propagating the complements of the failed literals (and the units of the input)
+    """
+    current, _ = propagate(frozenset(clauses))
+    if current is None:
+        return UNSATISFIABLE
+    for variable in sorted(variables(current)):
+        for literal in (variable, -variable):
+            if not any(literal in clause or -literal in clause for clause in current):
+                # Assigned by an earlier failed literal
+                break
+            result, _ = propagate(current | {frozenset((literal,))})
+            if result is None:
+                current, _ = propagate(current | {frozenset((-literal,))})
+                if current is None:
+                    return UNSATISFIABLE
+                break
+    return list(current)
+
+def bounded_variable_elimination(clauses: list[frozenset[int]]) -> list[frozenset[int]]:
+    """
+    Eliminate variables by clause distribution: the clauses containing a variable are replaced by all their non-tautological resolvents on it, if there are no more resolvents than removed clauses. Variables with the fewest possible resolvents are tried first.
+
+    ### Args:
+        - clauses (list[frozenset[int]]): The clauses to simplify
+
+    ### Returns:
+        - list[frozenset[int]]: The clauses without the eliminated variables
+    """
+    clauses = set(clauses)
+    if frozenset() in clauses:
+        return UNSATISFIABLE
+    occurrences = {}
+    for clause in clauses:
+        for literal in clause:
+            occurrences.setdefault(literal, set()).add(clause)
+
+    candidates = sorted(variables(clauses), key=lambda x: (len(occurrences.get(x, ())) * len(occurrences.get(-x, ())), x))
+    for variable in candidates:
+        positive, negative = occurrences.get(variable, set()), occurrences.get(-variable, set())
+        if not positive and not negative:
+            continue
+        limit = len(positive) + len(negative)
+        resolvents = set()
+        for clause in positive:
+            for other in negative:
+                resolvent = (clause | other) - {variable, -variable}
+                if any(-literal in resolvent for literal in resolvent):
+                    continue
+                if not resolvent:
+                    return UNSATISFIABLE
+                resolvents.add(resolvent)
+            if len(resolvents) > limit:
+                break
+        if len(resolvents) > limit:
+            continue
+
+        for clause in positive | negative:
+            clauses.discard(clause)
+            for literal in clause:
+                occurrences[literal].discard(clause)
+        for resolvent in resolvents - clauses:
+            clauses.add(resolvent)
+            for literal in resolvent:
+                occurrences.setdefault(literal, set()).add(resolvent)
+    return list(clauses)
+
+def _strongly_connected_components(graph: dict[int, set[int]]) -> list[list[int]]:
+    # Tarjan's algorithm with an explicit stack of (node, iterator over successors)
+    index, lowlink = {}, {}
+    on_stack, stack, result = set(), [], []
+    for root in list(graph):
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph.get(root, ())))]
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(graph.get(successor, ()))))
+                    break
+                elif successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    result.append(component)
+    return result
+
+
+STEPS = {
+    "ssr": self_subsuming_resolution,
+    "els": equivalent_literal_substitution,
+    "probe": failed_literal_probing,
+    "bve": bounded_variable_elimination,
+}
+
+def parse_steps(text: str) -> list[str]:
+    """
+    Parse a comma-separated list of preprocessing steps, "all" standing for every step.
+
+    ### Args:
+        - text (str): The list of steps, e.g. "ssr,bve"
+
+    ### Returns:
+        - list[str]: The names of the steps
+
+    ### Raises:
+        - ValueError: If a step does not exist
+    """
+    steps = [step.strip().lower() for step in text.split(",") if step.strip()]
+    if steps == ["all"]:
+        return list(STEPS)
+    unknown = [step for step in steps if step not in STEPS]
+    if unknown:
+        raise ValueError(f"Unknown preprocessing steps {unknown}. Please use some of the following steps: {', '.join(STEPS)} (or all)")
+    return steps
+
+def preprocess(clauses: list[frozenset[int]], steps: Iterable[str]) -> tuple[list[frozenset[int]], list[dict]]:
+    """
+    Apply the preprocessing steps to integer clauses, in the order of STEPS.
+
+    ### Args:
+        - clauses (list[frozenset[int]]): The clauses to simplify
+        - steps (Iterable[str]): The names of the steps to apply
+
+    ### Returns:
+        - tuple[list[frozenset[int]], list[dict]]: The simplified clauses, and for every step applied a report with its name ("step"), the number of variables and clauses it removed ("variables_removed", "clauses_removed") and the time it took in seconds ("time")
+    """
+    steps = set(steps)
+    report = []
+    for name, step in STEPS.items():
+        if name not in steps:
+            continue
+        start = time.perf_counter()
+        variables_before, clauses_before = len(variables(clauses)), len(clauses)
+        clauses = step(clauses)
+        report.append({
+            "step": name,
+            "variables_removed": variables_before - len(variables(clauses)),
+            "clauses_removed": clauses_before - len(clauses),
+            "time": time.perf_counter() - start
+        })
+        if clauses == UNSATISFIABLE:
+            break
+    return clauses, report
+
+def preprocess_clauses(clauses: Iterable[Sentence], steps: Iterable[str]) -> tuple[set[Sentence], list[dict]]:
+    """
+    Apply the preprocessing steps to clauses produced by to_cnf(): literals and disjunctions of literals.
+
+    ### Args:
+        - clauses (Iterable[Sentence]): The clauses to simplify
+        - steps (Iterable[str]): The names of the steps to apply
+
+    ### Returns:
+        - tuple[set[Sentence], list[dict]]: The simplified clauses, and the report of every step (see preprocess()). Unsatisfiable clauses are returned as a pair of complementary unit clauses, which every solver refutes.
+    """
+    symbols, int_clauses = encode_clauses(clauses)
+    int_clauses, report = preprocess(int_clauses, steps)
+
+    if frozenset() in int_clauses:
+        return {symbols[0], Negation(symbols[0])}, report
+    from_literal = lambda literal: symbols[literal - 1] if literal > 0 else Negation(symbols[-literal - 1])
+    result = set()
+    for clause in int_clauses:
+        literals = [from_literal(literal) for literal in sorted(clause, key=abs)]
+        result.add(Disjunction(*literals) if len(literals) > 1 else literals[0])
+    return result, report
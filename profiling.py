@@ -0,0 +1,136 @@
+"""
+This module contains the profilers of a run, which profile a single phase of it: parse (reading the file), cnf (building the solver: slicing, CNF conversion, compilation or preprocessing) or solve.
+
+Two profilers are available. cProfile traces every call, giving exact call counts and times, but slows the run down several times. The sampling profiler instead records the stack of the profiled thread at a regular interval from a background thread, which costs little even on long runs; its stacks are saved in the collapsed format read by flame graph tools (one line per stack, root first, with the number of samples).
+
+### Functions:
+    - frame_name(frame: FrameType) -> str: Get the name of the function of a frame, with its file relative to the project.
+
+### Classes:
+    - Profiler: The profiler of a phase of a run.
+"""
+import os, sys, io, threading, cProfile, pstats
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from types import FrameType
+
+PHASES = ("parse", "cnf", "solve")
+MODES = ("cprofile", "sample")
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def frame_name(frame:FrameType) -> str:
+    file_name = frame.f_code.co_filename
+    if file_name.startswith(PROJECT_DIR):
+        # syntax/sentence.py rather than the absolute path, so the modules of the project stand out
+        file_name = os.path.relpath(file_name, PROJECT_DIR).replace(os.sep, "/")
+    else:
+        file_name = os.path.basename(file_name)
+    return f"{file_name}:{frame.f_code.co_name}"
+
+
+class Profiler:
+    """
+    The class to represent the profiler of a phase of a run.
+
+    ### Attributes:
+        - phase (str): The profiled phase: parse, cnf or solve.
+        - sampling (bool): Whether stacks are sampled, rather than every call traced by cProfile.
+        - interval (float): The time between two samples, in seconds.
+        - output (str): The file the profile is saved to (pstats for cProfile, collapsed stacks for sampling), or None to print a summary.
+        - samples (Counter[tuple[str, ...]]): The number of samples of every stack, root first.
+
+    ### Methods:
+        - profile(phase: str): Context manager profiling a phase, if it is the profiled one.
+        - report(limit: int): Get a summary of the profile, with the functions taking the most time.
+        - collapsed(): Get the sampled stacks in the collapsed format.
+        - save(): Save the profile to the output file.
+    """
+    def __init__(self, phase:str="solve", sampling:bool=False, output:str=None, interval:float=0.001):
+        if phase not in PHASES:
+            raise ValueError(f"Unknown phase '{phase}', expected one of: {', '.join(PHASES)}")
+        self.phase = phase
+        self.sampling = sampling
+        self.interval = interval
+        self.output = output
+        self.samples = Counter()
+        self._profile = None
+
+    def profile(self, phase:str):
+        if phase != self.phase:
+            return nullcontext()
+        return self._sample() if self.sampling else self._trace()
+
+    @contextmanager
+    def _trace(self):
+        self._profile = self._profile or cProfile.Profile()
+        self._profile.enable()
+        try:
+            yield
+        finally:
+            self._profile.disable()
+
+    @contextmanager
+    def _sample(self):
+        target = threading.get_ident()
+        # The frame of the with statement, above this generator and the __enter__() of contextmanager
+        caller = sys._getframe(2)
+        stop = threading.Event()
+
+        def sample():
+            while not stop.wait(self.interval):
+                frame = sys._current_frames().get(target)
+                if stop.is_set():
+                    # The phase is over, and the profiled thread is waiting for this one
+                    break
+                stack = []
+                # The stack stops at the function running the phase, the root of every sample
+                while frame is not None:
+                    stack.append(frame_name(frame))
+                    if frame is caller:
+                        break
+                    frame = frame.f_back
+                if stack:
+                    self.samples[tuple(reversed(stack))] += 1
+
+        # The sampler only runs when the profiled thread releases the interpreter, every switch interval
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(switch_interval, self.interval))
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            sampler.join()
+            sys.setswitchinterval(switch_interval)
+
+    def collapsed(self) -> str:
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in sorted(self.samples.items()))
+
+    def report(self, limit:int=20) -> str:
+        if not self.sampling:
+            if self._profile is None:
+                return "No profile recorded"
+            stream = io.StringIO()
+            pstats.Stats(self._profile, stream=stream).sort_stats("cumulative").print_stats(limit)
+            return stream.getvalue()
+        total = sum(self.samples.values())
+        if not total:
+            return "No samples recorded (the phase was shorter than the sampling interval)"
+        # Samples in which a function is running (self) or on the stack (total)
+        own, inclusive = Counter(), Counter()
+        for stack, count in self.samples.items():
+            own[stack[-1]] += count
+            for name in set(stack):
+                inclusive[name] += count
+        lines = [f"{total} samples of the {self.phase} phase (at most one every {self.interval * 1000:g} ms)", f"{'Self':>7}{'Total':>8}  Function"]
+        lines += [f"{own[name] / total:>7.1%}{inclusive[name] / total:>8.1%}  {name}" for name, _ in own.most_common(limit)]
+        return "\n".join(lines)
+
+    def save(self):
+        if self.sampling:
+            with open(self.output, "w") as file:
+                file.write(self.collapsed())
+        elif self._profile is not None:
+            self._profile.dump_stats(self.output)
@@ -0,0 +1,204 @@
+"""
+This module contains the interactive shell of the inference engine, to explore a knowledge base without editing a file and running the engine again. Run it with `./iengine repl [<filename>]`.
+
+Sentences are told and retracted one line at a time and queries asked with any method. The FC, BC and DPLL solvers are incremental (see incremental.py): they are built by the first query with their method, then updated by every sentence told, so a query on a large knowledge base answers in milliseconds. FC and BC are also updated by the sentences retracted, while DPLL is built again by its next query. The other methods solve every query from the whole knowledge base.
+
+### Classes:
+    - Session: A knowledge base explored in the shell, with its incremental solvers.
+    - Shell: The interactive shell.
+"""
+import cmd, time
+from syntax import *
+from parser import read_file, KB_SEPARATOR
+from horn import check_horn_kb, check_horn_query
+from analyze import get_solver
+from server import parse_sentence
+from incremental import IncrementalForwardChaining, IncrementalBackwardChaining, IncrementalDPLL
+
+METHODS = ("TT", "FC", "BC", "RES", "DPLL", "BDD", "MC", "WALKSAT")
+INCREMENTAL = { "FC": IncrementalForwardChaining, "BC": IncrementalBackwardChaining, "DPLL": IncrementalDPLL }
+
+
+class Session:
+    """
+    The class to represent a knowledge base explored in the shell.
+
+    ### Attributes:
+        - sentences (dict[Sentence, str]): The sentences told, with their text, in the order they were told.
+        - solvers (dict[str, object]): The incremental solver of every method asked so far (FC, BC and DPLL).
+
+    ### Methods:
+        - tell(text: str): Add the sentences of a text, separated by semicolons.
+        - retract(text: str): Remove the sentences of a text, separated by semicolons.
+        - ask(query: str, method: str): Check if the knowledge base entails a query.
+        - sentence(): Get the knowledge base as a single sentence.
+    """
+    def __init__(self):
+        self.sentences = {}
+        self.solvers = {}
+        self._sentence = None
+        self._horn = True
+
+    def tell(self, text:str) -> int:
+        # Parse everything first, so a syntax error leaves the knowledge base unchanged
+        parsed = [(parse_sentence(part), part.strip()) for part in text.split(KB_SEPARATOR) if part.strip()]
+        added = 0
+        for sentence, text in parsed:
+            if sentence in self.sentences:
+                continue
+            self.sentences[sentence] = text
+            self._horn = self._horn and sentence.is_horn()
+            for solver in self.solvers.values():
+                solver.tell(sentence)
+            added += 1
+        if added:
+            self._sentence = None
+        return added
+
+    def retract(self, text:str) -> int:
+        parsed = [parse_sentence(part) for part in text.split(KB_SEPARATOR) if part.strip()]
+        removed = 0
+        for sentence in parsed:
+            if self.sentences.pop(sentence, None) is None:
+                continue
+            # The clauses of a sentence may be shared with others, so the DPLL database is not updated
+            self.solvers.pop("DPLL", None)
+            for solver in self.solvers.values():
+                solver.retract(sentence)
+            removed += 1
+        if removed:
+            self._sentence = None
+            self._horn = all(sentence.is_horn() for sentence in self.sentences)
+        return removed
+
+    def ask(self, query:str, method:str) -> dict:
+        query = parse_sentence(query)
+        if method not in METHODS:
+            raise ValueError(f"Invalid method. Please use one of the following methods: {', '.join(METHODS)}")
+        if not self.sentences:
+            raise ValueError("The knowledge base is empty: TELL a sentence first")
+        if method not in INCREMENTAL:
+            return get_solver(method, self.sentence(), query).solve()
+        if method in ("FC", "BC"):
+            # The warnings of the solvers, which only check the knowledge base when it is not in Horn form
+            if not self._horn:
+                check_horn_kb(self.sentence())
+            check_horn_query(query)
+        if method not in self.solvers:
+            self.solvers[method] = INCREMENTAL[method]()
+            for sentence in self.sentences:
+                self.solvers[method].tell(sentence)
+        return self.solvers[method].ask(query)
+
+    def sentence(self) -> Sentence:
+        if self._sentence is None:
+            sentences = list(self.sentences)
+            self._sentence = Conjunction(*sentences) if len(sentences) > 1 else sentences[0]
+        return self._sentence
+
+
+class Shell(cmd.Cmd):
+    """
+    The class to represent the interactive shell. Commands are case insensitive.
+
+    ### Attributes:
+        - session (Session): The knowledge base explored.
+        - method (str): The method of the queries that do not name one.
+
+    ### Methods:
+        - do_tell(arg: str): TELL <sentence>; <sentence>; ...
+        - do_retract(arg: str): RETRACT <sentence>; <sentence>; ...
+        - do_ask(arg: str): ASK [<method>] <query>
+        - do_method(arg: str): METHOD <method>
+        - do_load(arg: str): LOAD <filename>
+        - do_list(arg: str): LIST
+        - do_quit(arg: str): QUIT
+    """
+    intro = "Inference Engine for Propositional Logic. Type HELP for the commands, QUIT to exit."
+    prompt = "iengine> "
+
+    def __init__(self, method:str="DPLL", **kwargs):
+        super().__init__(**kwargs)
+        self.session = Session()
+        self.method = method
+
+    def precmd(self, line:str) -> str:
+        command, _, arg = line.strip().partition(" ")
+        return f"{command.lower()} {arg}"
+
+    def emptyline(self):
+        # Do not repeat the last command
+        pass
+
+    def default(self, line:str):
+        self._print(f"ERROR: Unknown command '{line.split()[0]}'. Type HELP for the commands.")
+
+    def onecmd(self, line:str) -> bool:
+        try:
+            return super().onecmd(line)
+        except (ValueError, SyntaxError, FileNotFoundError) as e:
+            self._print(f"ERROR: {e}")
+
+    def do_tell(self, arg:str):
+        """TELL <sentence>; <sentence>; ... - Add sentences to the knowledge base."""
+        added = self.session.tell(arg)
+        self._print(f"{added} sentence{'s' if added != 1 else ''} added ({len(self.session.sentences)} in the knowledge base)")
+
+    def do_retract(self, arg:str):
+        """RETRACT <sentence>; <sentence>; ... - Remove sentences from the knowledge base."""
+        removed = self.session.retract(arg)
+        self._print(f"{removed} sentence{'s' if removed != 1 else ''} removed ({len(self.session.sentences)} in the knowledge base)")
+
+    def do_ask(self, arg:str):
+        """ASK [<method>] <query> - Check if the knowledge base entails a query, with a method or the current one (see METHOD)."""
+        method, _, query = arg.strip().partition(" ")
+        if method.upper() not in METHODS or not query.strip():
+            # No method named: the whole argument is the query
+            method, query = self.method, arg
+        start = time.perf_counter()
+        result = self.session.ask(query, method.upper())
+        elapsed = (time.perf_counter() - start) * 1000
+        if result["entails"] is None:
+            answer = result["message"]
+        else:
+            answer = ("YES" if result["entails"] else "NO") + (f": {result['message']}" if "message" in result else "")
+        self._print(f"{answer}\n({method.upper()}, {elapsed:.2f} ms)")
+
+    def do_method(self, arg:str):
+        """METHOD <method> - Set the method of the queries that do not name one: TT, FC, BC, RES, DPLL (default), BDD, MC or WALKSAT."""
+        if arg.strip().upper() not in METHODS:
+            raise ValueError(f"Invalid method. Please use one of the following methods: {', '.join(METHODS)}")
+        self.method = arg.strip().upper()
+        self._print(f"Method: {self.method}")
+
+    def do_load(self, arg:str):
+        """LOAD <filename> - Add the knowledge base of a file of the data/ directory, and show its query."""
+        kb, query, _ = read_file(arg.strip())
+        self.do_tell(KB_SEPARATOR.join(kb))
+        self._print(f"Query of the file: {query}")
+
+    def do_list(self, arg:str):
+        """LIST - Show the sentences of the knowledge base."""
+        for text in self.session.sentences.values():
+            self._print(text)
+
+    def do_quit(self, arg:str) -> bool:
+        """QUIT - Exit the shell."""
+        return True
+
+    do_exit = do_quit
+
+    def do_eof(self, arg:str) -> bool:
+        # Ctrl-D, read as the EOF command
+        self._print("")
+        return True
+
+    def _print(self, text:str):
+        self.stdout.write(text + "\n")
+
+
+def main(file_name:str=None):
+    shell = Shell()
+    if file_name:
+        shell.onecmd(f"load {file_name}")
+    shell.cmdloop()
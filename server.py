@@ -0,0 +1,399 @@
+"""
+This module contains the inference server, which keeps knowledge bases resident between queries instead of paying for the start of Python, the imports and the parsing of the whole knowledge base on every query. Run it with `./iengine serve`.
+
+Requests and responses are JSON objects, sent as the body of a POST request to a localhost HTTP server, or one per line over a Unix socket. Every request has a command:
+    - TELL: add sentences to a knowledge base: {"command": "TELL", "kb": "<id>", "sentences": ["a => b", "a"]}. Without an id, the knowledge base is named by the hash of its sentences, so clients telling the same sentences share it.
+    - ASK: check if a knowledge base entails a query with a method (DPLL by default): {"command": "ASK", "kb": "<id>", "query": "b", "method": "FC"}. The knowledge base can be given by its sentences instead of its id, in which case it is cached under their hash, apart from the knowledge bases named by TELL, so no other request can change it.
+    - RETRACT: remove sentences from a knowledge base: {"command": "RETRACT", "kb": "<id>", "sentences": ["a"]}.
+    - STATUS: get the knowledge bases in the cache and their estimated memory.
+Errors are returned as {"error": "<message>"}.
+
+Knowledge bases are kept parsed, with the solvers of the methods they were asked with: the compiled BDD, and the incremental FC, BC and DPLL solvers (see incremental.py), which a TELL or RETRACT updates rather than rebuilds. The other methods have no form independent of the query, so their answers are kept instead. The cache is least recently used: once the estimated memory of the knowledge bases passes its cap, the ones unused for the longest are evicted. Clients are served concurrently, each in its own thread; solving a query holds the lock of its knowledge base.
+
+### Functions:
+    - parse_sentence(text: str) -> Sentence: Parse a sentence.
+    - sentence_memory(sentences: Iterable[Sentence]) -> int: Estimate the memory of sentences.
+    - serve_http(server: InferenceServer, host: str, port: int) -> ThreadingHTTPServer: Create an HTTP server for the inference server.
+    - serve_unix(server: InferenceServer, path: str) -> ThreadingUnixStreamServer: Create a Unix socket server for the inference server.
+    - main(port: int, socket_path: str, max_memory: float): Run the inference server until interrupted.
+
+### Classes:
+    - KnowledgeBase: A knowledge base kept by the server.
+    - KnowledgeBaseCache: The least recently used cache of knowledge bases, under a memory cap.
+    - InferenceServer: The handler of the requests, independent of the transport.
+"""
+import os, sys, json, hashlib, threading, socketserver
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Iterable
+from syntax import *
+from parser import parse, tokenize, sanitize
+from analyze import get_solver
+from incremental import IncrementalForwardChaining, IncrementalBackwardChaining, IncrementalDPLL
+
+# Default memory cap of the cache, in MB
+MAX_MEMORY = 256
+
+# The methods whose solver is kept and updated as the knowledge base changes
+INCREMENTAL = { "FC": IncrementalForwardChaining, "BC": IncrementalBackwardChaining, "DPLL": IncrementalDPLL }
+
+
+def parse_sentence(text:str) -> Sentence:
+    try:
+        return parse(tokenize(sanitize(text)))
+    except IndexError:
+        # The parser runs out of tokens
+        raise SyntaxError(f"Incomplete sentence '{text}'")
+
+
+def sentence_memory(sentences:Iterable[Sentence]) -> int:
+    """
+    Estimate the memory of sentences: the size of their distinct nodes, with their attributes and arguments. Sub-sentences shared by sentences are counted once.
+
+    ### Args:
+        - sentences (Iterable[Sentence]): The sentences
+
+    ### Returns:
+        - int: The estimated memory in bytes
+    """
+    seen, memory = set(), 0
+    for sentence in sentences:
+        for node in sentence.walk():
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            memory += sys.getsizeof(node) + sys.getsizeof(node.__dict__)
+            if isinstance(node, CommutativeSentence):
+                memory += sys.getsizeof(node.args)
+            elif isinstance(node, Symbol):
+                memory += sys.getsizeof(node.name)
+    return memory
+
+
+class KnowledgeBase:
+    """
+    The class to represent a knowledge base kept by the server.
+
+    ### Attributes:
+        - id (str): The name of the knowledge base, or the hash of its sentences.
+        - inline (bool): Whether the knowledge base was given by its sentences in an ASK, so TELL and RETRACT cannot reach it.
+        - sentences (dict[Sentence, str]): The sentences, with the text they were told as, in the order they were told.
+        - compiled (dict[str, object]): The solvers kept for the knowledge base and reused by the queries: the BDD until it changes, and the incremental FC, BC and DPLL solvers, updated as it changes.
+        - answers (dict[tuple[str, Sentence], dict]): The answers of the other methods, by method and query, until the knowledge base changes.
+        - memory (int): The estimated memory of the knowledge base and its compiled solvers, in bytes.
+        - lock (threading.Lock): The lock held while the knowledge base is changed or queried.
+
+    ### Methods:
+        - tell(texts: list[str]): Add sentences.
+        - retract(texts: list[str]): Remove sentences.
+        - ask(query: str, method: str): Check if the knowledge base entails a query.
+        - sentence(): Get the knowledge base as a single sentence.
+    """
+    def __init__(self, id:str, inline:bool=False):
+        self.id = id
+        self.inline = inline
+        self.sentences = {}
+        self.compiled = {}
+        self.answers = {}
+        self.memory = self._sentence_memory = 0
+        self.lock = threading.Lock()
+        self._sentence = None
+
+    def tell(self, texts:list[str]) -> int:
+        # Parse everything first, so a syntax error leaves the knowledge base unchanged
+        parsed = [(parse_sentence(text), text) for text in texts]
+        added = 0
+        for sentence, text in parsed:
+            if sentence not in self.sentences:
+                self.sentences[sentence] = text
+                for method in INCREMENTAL:
+                    if method in self.compiled:
+                        self.compiled[method].tell(sentence)
+                added += 1
+        if added:
+            self._changed()
+        return added
+
+    def retract(self, texts:list[str]) -> int:
+        removed = 0
+        for sentence in [parse_sentence(text) for text in texts]:
+            if self.sentences.pop(sentence, None) is not None:
+                # The clauses of a sentence may be shared with others, so the DPLL database is built again by the next query
+                self.compiled.pop("DPLL", None)
+                for method in ("FC", "BC"):
+                    if method in self.compiled:
+                        self.compiled[method].retract(sentence)
+                removed += 1
+        if removed:
+            self._changed()
+        return removed
+
+    def _changed(self):
+        self.compiled.pop("BDD", None)
+        self.answers.clear()
+        self._sentence = None
+        self._sentence_memory = self.memory = sentence_memory(self.sentences)
+
+    def sentence(self) -> Sentence:
+        if not self.sentences:
+            raise ValueError(f"The knowledge base '{self.id}' is empty")
+        if self._sentence is None:
+            # Built once until the knowledge base changes, as hashing a large conjunction takes time
+            sentences = list(self.sentences)
+            self._sentence = Conjunction(*sentences) if len(sentences) > 1 else sentences[0]
+        return self._sentence
+
+    def ask(self, query:str, method:str) -> dict:
+        query = parse_sentence(query)
+        if not self.sentences:
+            raise ValueError(f"The knowledge base '{self.id}' is empty")
+        if method == "BDD":
+            # The knowledge base is compiled once, then every query is a single check
+            if "BDD" not in self.compiled:
+                self.compiled["BDD"] = get_solver("BDD", self.sentence(), query)
+            result = self.compiled["BDD"].ask(query)
+            # The diagram grows with the nodes of every query
+            manager = self.compiled["BDD"].manager
+            self.memory = self._sentence_memory + sys.getsizeof(manager.nodes) + len(manager.nodes) * sys.getsizeof((0, 0, 0)) + sys.getsizeof(manager.unique) + sys.getsizeof(manager.computed)
+            return result
+        if method in INCREMENTAL:
+            if method not in self.compiled:
+                solver = INCREMENTAL[method]()
+                # Sentence by sentence, as they are retracted
+                for sentence in self.sentences:
+                    solver.tell(sentence)
+                self.compiled[method] = solver
+            return self.compiled[method].ask(query)
+        if (method, query) not in self.answers:
+            self.answers[(method, query)] = get_solver(method, self.sentence(), query).solve()
+        return self.answers[(method, query)]
+
+
+class KnowledgeBaseCache:
+    """
+    The class to represent the least recently used cache of knowledge bases, under a memory cap. The most recently used knowledge base is never evicted, even if it is larger than the cap.
+
+    ### Attributes:
+        - max_memory (int): The memory cap, in bytes.
+        - entries (OrderedDict[str | tuple[str, str], KnowledgeBase]): The knowledge bases, from the least to the most recently used, by name, or by ("inline", hash) for those given by their sentences.
+        - evictions (int): The number of knowledge bases evicted.
+
+    ### Methods:
+        - get(id: str, create: bool, inline: bool): Get a knowledge base, marking it as the most recently used.
+        - evict(): Evict the least recently used knowledge bases until the cache is under its cap.
+        - memory(): Get the estimated memory of the knowledge bases.
+    """
+    def __init__(self, max_memory:float=MAX_MEMORY):
+        self.max_memory = max_memory * 2 ** 20
+        self.entries = OrderedDict()
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, id:str, create:bool=False, inline:bool=False) -> KnowledgeBase:
+        # The key of a knowledge base given by its sentences is not a string, so no name given by a client can reach it
+        key = ("inline", id) if inline else id
+        with self._lock:
+            if key not in self.entries:
+                if not create:
+                    raise ValueError(f"Unknown knowledge base '{id}'")
+                self.entries[key] = KnowledgeBase(id, inline)
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def memory(self) -> int:
+        return sum(entry.memory for entry in list(self.entries.values()))
+
+    def evict(self):
+        with self._lock:
+            while len(self.entries) > 1 and self.memory() > self.max_memory:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+
+class InferenceServer:
+    """
+    The class to represent the handler of the requests of the inference server, independent of the transport.
+
+    ### Attributes:
+        - cache (KnowledgeBaseCache): The knowledge bases.
+
+    ### Methods:
+        - handle(request: dict): Handle a request and get its response.
+    """
+    METHODS = ("TT", "FC", "BC", "RES", "DPLL", "BDD", "MC", "WALKSAT")
+
+    def __init__(self, max_memory:float=MAX_MEMORY):
+        self.cache = KnowledgeBaseCache(max_memory)
+
+    def handle(self, request:dict) -> dict:
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("A request must be a JSON object")
+            command = str(request.get("command", "")).upper()
+            if command == "TELL":
+                return self._tell(request)
+            elif command == "ASK":
+                return self._ask(request)
+            elif command == "RETRACT":
+                return self._retract(request)
+            elif command == "STATUS":
+                return self._status()
+            raise ValueError("Invalid command. Please use one of the following commands: TELL, ASK, RETRACT, STATUS")
+        except (ValueError, SyntaxError) as e:
+            return {"error": str(e)}
+        except Exception as e:
+            # A failing solver must not take the server down
+            return {"error": f"{type(e).__name__}: {e}"}
+
+    @staticmethod
+    def _sentences(request:dict) -> list[str]:
+        sentences = request.get("sentences")
+        if not isinstance(sentences, list) or not all(isinstance(text, str) for text in sentences):
+            raise ValueError("'sentences' must be a list of strings")
+        return sentences
+
+    @staticmethod
+    def _hash(sentences:list[str]) -> str:
+        # The same sentences in any order give the same knowledge base
+        return hashlib.sha256("\n".join(sorted({sanitize(text) for text in sentences})).encode()).hexdigest()[:16]
+
+    def _tell(self, request:dict) -> dict:
+        sentences = self._sentences(request)
+        entry = self.cache.get(request.get("kb") or self._hash(sentences), create=True)
+        with entry.lock:
+            added = entry.tell(sentences)
+            size = len(entry.sentences)
+        self.cache.evict()
+        return {"kb": entry.id, "added": added, "sentences": size}
+
+    def _retract(self, request:dict) -> dict:
+        entry = self.cache.get(request.get("kb"))
+        with entry.lock:
+            removed = entry.retract(self._sentences(request))
+            size = len(entry.sentences)
+        return {"kb": entry.id, "removed": removed, "sentences": size}
+
+    def _ask(self, request:dict) -> dict:
+        method = str(request.get("method", "DPLL")).upper()
+        if method not in self.METHODS:
+            raise ValueError(f"Invalid method. Please use one of the following methods: {', '.join(self.METHODS)}")
+        if not isinstance(request.get("query"), str):
+            raise ValueError("'query' must be a string")
+        if "kb" in request:
+            entry = self.cache.get(request["kb"])
+        else:
+            sentences = self._sentences(request)
+            entry = self.cache.get(self._hash(sentences), create=True, inline=True)
+        with entry.lock:
+            if entry.inline and not entry.sentences:
+                # Told once, by the first query with these sentences, then only asked
+                entry.tell(sentences)
+            result = entry.ask(request["query"], method)
+        self.cache.evict()
+        # The hash of inline sentences is not the name of a knowledge base other requests can use
+        response = {"entails": result["entails"]} if entry.inline else {"kb": entry.id, "entails": result["entails"]}
+        if "message" in result:
+            response["message"] = result["message"]
+        if "model" in result:
+            response["model"] = {symbol.name: value for symbol, value in result["model"].items()}
+        return response
+
+    def _status(self) -> dict:
+        entries = list(self.cache.entries.values())
+        return {
+            "kbs": [{"kb": entry.id, "inline": entry.inline, "sentences": len(entry.sentences), "memory": entry.memory, "compiled": list(entry.compiled)} for entry in entries],
+            "memory": self.cache.memory(),
+            "max_memory": self.cache.max_memory,
+            "evictions": self.cache.evictions
+        }
+
+
+def serve_http(server:InferenceServer, host:str="127.0.0.1", port:int=8080) -> ThreadingHTTPServer:
+    """
+    Create an HTTP server for the inference server, taking requests as the JSON body of POST requests. Run it with serve_forever().
+
+    ### Args:
+        - server (InferenceServer): The handler of the requests
+        - host (str): The address to listen on, localhost by default
+        - port (int): The port to listen on, 0 for any free port
+
+    ### Returns:
+        - ThreadingHTTPServer: The HTTP server
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                response = server.handle(request)
+            except json.JSONDecodeError as e:
+                response = {"error": f"Invalid JSON: {e}"}
+            self._send(400 if "error" in response else 200, response)
+
+        def do_GET(self):
+            self._send(200, server.handle({"command": "STATUS"}))
+
+        def _send(self, status:int, response:dict):
+            body = json.dumps(response).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    transport = ThreadingHTTPServer((host, port), Handler)
+    # Closing the server does not wait for idle clients
+    transport.daemon_threads = True
+    return transport
+
+
+def serve_unix(server:InferenceServer, path:str) -> socketserver.ThreadingUnixStreamServer:
+    """
+    Create a Unix socket server for the inference server, taking one JSON request per line and answering each with one JSON line. Run it with serve_forever().
+
+    ### Args:
+        - server (InferenceServer): The handler of the requests
+        - path (str): The path of the socket
+
+    ### Returns:
+        - socketserver.ThreadingUnixStreamServer: The socket server
+    """
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    response = server.handle(json.loads(line))
+                except json.JSONDecodeError as e:
+                    response = {"error": f"Invalid JSON: {e}"}
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+                self.wfile.flush()
+
+    transport = socketserver.ThreadingUnixStreamServer(path, Handler)
+    # Closing the server does not wait for connected clients
+    transport.daemon_threads = True
+    return transport
+
+
+def main(port:int=8080, socket_path:str=None, max_memory:float=MAX_MEMORY):
+    server = InferenceServer(max_memory)
+    transport = serve_unix(server, socket_path) if socket_path else serve_http(server, port=port)
+    print(f"Serving on {socket_path if socket_path else f'http://127.0.0.1:{transport.server_address[1]}'} (cache of {max_memory:g} MB), press Ctrl+C to stop")
+    try:
+        transport.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        transport.server_close()
+        if socket_path:
+            os.remove(socket_path)
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[sys.argv.index("--port") + 1]) if "--port" in sys.argv else 8080
+    socket_path = sys.argv[sys.argv.index("--socket") + 1] if "--socket" in sys.argv else None
+    max_memory = float(sys.argv[sys.argv.index("--cache-memory") + 1]) if "--cache-memory" in sys.argv else MAX_MEMORY
+    main(port, socket_path, max_memory)
@@ -0,0 +1,125 @@
+"""
+This module contains functions to restrict a knowledge base to the part that is relevant to a query (relevance slicing), so solvers do not work on unrelated sentences and symbols.
+
+The slice depends on the knowledge base:
+    - A definite Horn knowledge base (facts and rules with exactly one positive literal) is restricted to the cone of influence of the query: the rules whose head can take part in deriving a query symbol, found backward from the query. Any model of the cone extends to a model of the whole KB by making every other symbol true, so entailment of the query is unchanged.
+    - Any other knowledge base is split into the connected components of its symbol graph (symbols are linked if they appear in the same sentence), and only the components sharing symbols with the query are kept. The other components can only change the answer by being inconsistent, so they are checked for consistency separately, and the KB is kept whole if they are not.
+
+Entailment is preserved, but model counts (e.g. from Truth Table) are over the symbols of the slice.
+
+### Functions:
+    - slice_kb(kb: Sentence, query: Sentence) -> Sentence: Restrict the knowledge base to the sentences relevant to the query.
+    - cone_of_influence(sentences: list[Sentence], query: Sentence) -> list[Sentence]: Get the rules of a definite Horn knowledge base that can derive the query symbols.
+    - symbol_components(sentences: list[Sentence]) -> list[list[Sentence]]: Split sentences into groups that share no symbol.
+    - is_consistent(sentences: list[Sentence]) -> bool: Check if a list of sentences has a model.
+    - _head_and_body(sentence: Sentence) -> tuple[Symbol, frozenset[Symbol]] | None: Get the head and body symbols of a definite Horn clause.
+"""
+from syntax import *
+from clauses import symbol_index, encode, satisfiable
+
+
+def slice_kb(kb: Sentence, query: Sentence) -> Sentence:
+    """
+    Restrict the knowledge base to the sentences relevant to the query.
+
+    ### Args:
+        - kb (Sentence): The knowledge base
+        - query (Sentence): The query
+
+    ### Returns:
+        - Sentence: The sliced knowledge base, or the knowledge base itself if nothing can be removed
+    """
+    sentences = list(kb.args) if isinstance(kb, Conjunction) else [kb]
+    if all(_head_and_body(sentence) is not None for sentence in sentences):
+        relevant = cone_of_influence(sentences, query)
+    else:
+        query_symbols = query.symbols()
+        relevant, others = [], []
+        for component in symbol_components(sentences):
+            if any(not sentence.symbols().isdisjoint(query_symbols) for sentence in component):
+                relevant.extend(component)
+            else:
+                others.extend(component)
+        if others and not is_consistent(others):
+            # An inconsistent KB entails everything: keep it whole so every method sees the contradiction
+            return kb
+
+    if not relevant or len(relevant) == len(sentences):
+        return kb
+    return Conjunction(*relevant) if len(relevant) > 1 else relevant[0]
+
+def cone_of_influence(sentences: list[Sentence], query: Sentence) -> list[Sentence]:
+    """
+    Get the rules of a definite Horn knowledge base that can take part in deriving a symbol of the query, by walking backward from the query symbols through the rule bodies.
+
+    ### Args:
+        - sentences (list[Sentence]): The definite Horn clauses of the knowledge base
+        - query (Sentence): The query
+
+    ### Returns:
+        - list[Sentence]: The sentences in the cone of influence, in their original order
+    """
+    rules = {}
+    for i, sentence in enumerate(sentences):
+        head, body = _head_and_body(sentence)
+        rules.setdefault(head, []).append((i, body))
+
+    kept = set()
+    visited = set(query.symbols())
+    stack = list(visited)
+    while stack:
+        for i, body in rules.get(stack.pop(), []):
+            kept.add(i)
+            for symbol in body - visited:
+                visited.add(symbol)
+                stack.append(symbol)
+    return [sentence for i, sentence in enumerate(sentences) if i in kept]
+
+def symbol_components(sentences: list[Sentence]) -> list[list[Sentence]]:
+    """
+    Split sentences into the connected components of the symbol graph: two sentences are in the same component if they are linked by a chain of sentences sharing symbols.
+
+    ### Args:
+        - sentences (list[Sentence]): The sentences to split
+
+    ### Returns:
+        - list[list[Sentence]]: The sentences of every component, in order of first appearance
+    """
+    occurrences = {}
+    for i, sentence in enumerate(sentences):
+        for symbol in sentence.symbols():
+            occurrences.setdefault(symbol, []).append(i)
+
+    groups = []
+    grouped = set()
+    for i in range(len(sentences)):
+        if i in grouped:
+            continue
+        grouped.add(i)
+        group = [i]
+        visited = set()
+        for member in group:
+            for symbol in sentences[member].symbols() - visited:
+                visited.add(symbol)
+                for neighbour in occurrences[symbol]:
+                    if neighbour not in grouped:
+                        grouped.add(neighbour)
+                        group.append(neighbour)
+        groups.append([sentences[member] for member in sorted(group)])
+    return groups
+
+def is_consistent(sentences: list[Sentence]) -> bool:
+    index = symbol_index(sorted(set().union(*(sentence.symbols() for sentence in sentences)), key=lambda x: x.name))
+    return satisfiable(clause for sentence in sentences for clause in encode(sentence, index))
+
+def _head_and_body(sentence: Sentence):
+    # A fact, a rule from a symbol or a conjunction of symbols to a symbol, or a disjunction of literals with exactly one positive literal
+    if isinstance(sentence, Symbol):
+        return sentence, frozenset()
+    if isinstance(sentence, Implication) and sentence.is_horn():
+        return sentence.consequent, sentence.antecedent.symbols()
+    if isinstance(sentence, Disjunction) and sentence.is_horn():
+        positive = [arg for arg in sentence.args if isinstance(arg, Symbol)]
+        if len(positive) == 1:
+            return positive[0], frozenset(arg.arg for arg in sentence.args if isinstance(arg, Negation))
+    return None
@@ -0,0 +1,107 @@
+"""
+This module contains the statistics that solvers record about a run: the time spent in every phase (parse, cnf, preprocess, search, ...) and counters of the work done (decisions, propagations, conflicts, resolvents, agenda pops, models enumerated, peak clause count, ...).
+
+Solvers take an optional Stats object. They count in plain attributes while they search, and the counters named in their STATISTICS class attribute are only copied to the Stats once solve() returns (see instrumented()), so the search itself pays nothing for the statistics. Without a Stats object, solvers use DISABLED, whose methods do nothing.
+
+### Functions:
+    - instrumented(solve: Callable) -> Callable: Decorate the solve() method of a solver to time its search and record its counters.
+
+### Classes:
+    - Stats: The timings and counters of a run.
+"""
+import time, json, functools
+from contextlib import contextmanager, nullcontext
+
+
+class Stats:
+    """
+    The class to represent the statistics of a run.
+
+    ### Attributes:
+        - enabled (bool): Whether anything is recorded.
+        - timings (dict[str, float]): The time spent in every phase, in seconds.
+        - counters (dict[str, int]): The counters, in order of first appearance.
+
+    ### Methods:
+        - phase(name: str): Context manager timing a phase. A phase nested in another phase of the same name is not counted twice.
+        - count(name: str, amount: int): Add to a counter.
+        - peak(name: str, value: int): Raise a counter to a value, if it is higher.
+        - to_dict(): Get the statistics as a dictionary.
+        - to_json(): Get the statistics as a JSON string.
+        - report(): Get the statistics as readable lines.
+    """
+    def __init__(self, enabled:bool=True):
+        self.enabled = enabled
+        self.timings = {}
+        self.counters = {}
+        self._active = set()
+
+    def phase(self, name:str):
+        if not self.enabled or name in self._active:
+            return nullcontext()
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name:str):
+        self._active.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0) + time.perf_counter() - start
+            self._active.discard(name)
+
+    def count(self, name:str, amount:int=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def peak(self, name:str, value:int):
+        if self.enabled and (name not in self.counters or value > self.counters[name]):
+            self.counters[name] = value
+
+    def to_dict(self) -> dict:
+        return {
+            "timings": dict(self.timings),
+            "counters": dict(self.counters)
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    def report(self) -> str:
+        lines = [f"{name}: {seconds * 1000:.3f} ms" for name, seconds in self.timings.items()]
+        lines += [f"{name}: {value}" for name, value in self.counters.items()]
+        return "\n".join(lines)
+
+
+# Statistics of the solvers that were not given any
+DISABLED = Stats(enabled=False)
+
+
+def instrumented(solve):
+    """
+    Decorate the solve() method of a solver: the call is timed as the search phase, then the counters named in the STATISTICS attribute of the solver are added to its stats. A counter is an int attribute, or a collection whose size is recorded as a peak, named peak_<name> (e.g. peak_clauses for the clauses of resolution).
+
+    ### Args:
+        - solve (Callable): The solve() method
+
+    ### Returns:
+        - Callable: The decorated method
+    """
+    @functools.wraps(solve)
+    def wrapper(self, *args, **kwargs):
+        stats = self.stats
+        if not stats.enabled:
+            return solve(self, *args, **kwargs)
+        before = {name: getattr(self, name) for name in self.STATISTICS if isinstance(getattr(self, name), int)}
+        with stats.phase("search"):
+            result = solve(self, *args, **kwargs)
+        for name in self.STATISTICS:
+            value = getattr(self, name)
+            if isinstance(value, int):
+                # Only the work of this call, as solve() may be called more than once
+                stats.count(name, value - before[name])
+            else:
+                stats.peak(f"peak_{name}", len(value))
+        return result
+    return wrapper
@@ -24,17 +24,19 @@ class Biconditional(CommutativeSentence):
         arg_1, arg_2 = self.args
         return Biconditional(arg_1, arg_2.negate())
 
-    def evaluate(self, model:dict[Symbol, bool]) -> bool:
+    def _evaluate(self, model:dict[Symbol, bool]) -> bool:
+        return self._combine([arg._evaluate(model) for arg in self.args])
+
+    def _combine(self, values:list[bool]) -> bool:
         """
-        Evaluates the biconditional given a model. Returns True if both arguments have the same truth value, False otherwise.
+        Combines the truth values of the arguments of the biconditional. Returns True if both arguments have the same truth value, False otherwise.
 
         ### Args:
-            - model (dict[Symbol, bool]): The model to evaluate the biconditional
+            - values (list[bool]): The truth values of the arguments
             
         ### Returns:
             - bool: The result of the evaluation
         """
-        values = [arg.evaluate(model) for arg in self.args]
         if None in values:
             return None
         return values[0] == values[1]
\ No newline at end of file
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from abc import abstractmethod
 from .connective import Connective
-from .sentence import Sentence
+from .sentence import Sentence, MAX_RECURSION_DEPTH
 from .symbol import Symbol
 
 
@@ -15,8 +15,7 @@ class CommutativeSentence(Sentence):
         - args(set[Sentence]): The arguments of the sentence
         
     ### Methods:
-        - evaluate(model:dict[Symbol, bool]): Evaluates the sentence given a model
-        - symbols(): Returns the set of symbols in the sentence
+        - children(): Returns the arguments of the sentence
     """
     def __init__(self, connective:Connective, *args:Sentence):
         if len(args) < 2:
@@ -25,34 +24,57 @@ class CommutativeSentence(Sentence):
             raise ValueError(f"Connective {connective.name} is not commutative")
         self.connective = connective
         self.args = frozenset(args)
+        # Sentences are immutable, so the hash is computed once instead of re-walking the tree
+        self._hash = hash(self.args)
 
-    def __repr__(self):
-        from .symbol import Symbol
-        from .negation import Negation
-        arg_strs = []
+    def _parts(self, order) -> list:
         args = list(self.args)
-        args.sort(key=lambda x: str(x))
+        args.sort(key=order)
+        parts = []
         for arg in args:
-            if not isinstance(arg, (Symbol, Negation)):
-                arg_strs.append(f"({arg})")
-            else:
-                arg_strs.append(str(arg))
-        return f" {self.connective.value} ".join(arg_strs)
+            if parts:
+                parts.append(f" {self.connective.value} ")
+            parts.extend(arg._wrap())
+        return parts
         
     def __hash__(self):
-        return hash(self.args)
+        return self._hash
     
     def __eq__(self, other: CommutativeSentence):
-        if super().__eq__(other):
-            return self.args == other.args
+        if self is other:
+            return True
+        if super().__eq__(other) and self._hash == other._hash:
+            if self.depth < MAX_RECURSION_DEPTH:
+                return self.args == other.args
+            return self._equals_iterative(other)
         return False
 
-    @abstractmethod
-    def evaluate(self, model) -> bool:
-        pass
-    
-    def symbols(self) -> set[Symbol]:
-        symbols = set()
+    def __reduce__(self):
+        # Rebuild through the constructor so the cached hash matches the unpickling process
+        return (type(self), tuple(self.args))
+
+    def children(self) -> frozenset[Sentence]:
+        return self.args
+
+    def _pairs(self, other:CommutativeSentence) -> list[tuple[Sentence, Sentence]]:
+        # Every argument is paired with the argument of the same hash of the other sentence
+        if len(self.args) != len(other.args):
+            return None
+        by_hash = {}
+        for arg in other.args:
+            by_hash.setdefault(hash(arg), []).append(arg)
+        pairs = []
         for arg in self.args:
-            symbols |= arg.symbols()
-        return symbols
\ No newline at end of file
+            candidates = by_hash.get(hash(arg))
+            if not candidates:
+                return None
+            if len(candidates) == 1:
+                pairs.append((arg, candidates[0]))
+            elif arg not in other.args:
+                # Arguments of the same hash are rare, and looked up in the set instead
+                return None
+        return pairs
+
+    @abstractmethod
+    def _combine(self, values:list[bool]) -> bool:
+        pass
\ No newline at end of file
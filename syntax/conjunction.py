@@ -28,17 +28,22 @@ class Conjunction(CommutativeSentence):
         from .disjunction import Disjunction
         return Disjunction(*[arg.negate() for arg in self.args])
 
-    def evaluate(self, model:dict[Symbol, bool]) -> bool:
+    def _evaluate(self, model:dict[Symbol, bool]) -> bool:
+        values = [arg._evaluate(model) for arg in self.args]
+        if None in values:
+            return None
+        return all(values)
+
+    def _combine(self, values:list[bool]) -> bool:
         """
-        Evaluates the conjunction given a model. Returns True if all arguments are True, False otherwise.
+        Combines the truth values of the arguments of the conjunction. Returns True if all arguments are True, False otherwise.
 
         ### Args:
-            - model (dict[Symbol, bool]): The model to evaluate the conjunction
+            - values (list[bool]): The truth values of the arguments
             
         ### Returns:
             - bool: The result of the evaluation
         """
-        values = [arg.evaluate(model) for arg in self.args]
         if None in values:
             return None
         return all(values)
\ No newline at end of file
@@ -28,17 +28,28 @@ class Disjunction(CommutativeSentence):
         from .conjunction import Conjunction
         return Conjunction(*[arg.negate() for arg in self.args])
 
-    def evaluate(self, model:dict[Symbol, bool]) -> bool:
+    def _is_horn(self) -> bool:
+        from .negation import Negation
+        positive_symbols = [arg for arg in self.args if isinstance(arg, Symbol)]
+        return len(positive_symbols) <= 1 and \
+            all(isinstance(arg, (Symbol, Negation)) for arg in self.args)
+
+    def _evaluate(self, model:dict[Symbol, bool]) -> bool:
+        values = [arg._evaluate(model) for arg in self.args]
+        if None in values:
+            return None
+        return any(values)
+
+    def _combine(self, values:list[bool]) -> bool:
         """
-        Evaluates the disjunction given a model. Returns True if any argument is True, False otherwise.
+        Combines the truth values of the arguments of the disjunction. Returns True if any argument is True, False otherwise.
 
         ### Args:
-            - model (dict[Symbol, bool]): The model to evaluate the conjunction
+            - values (list[bool]): The truth values of the arguments
 
         ### Returns:
             - bool: The result of the evaluation
         """
-        values = [arg.evaluate(model) for arg in self.args]
         if None in values:
             return None
         return any(values)
\ No newline at end of file
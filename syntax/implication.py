@@ -1,6 +1,6 @@
 from __future__ import annotations
 from .connective import Connective
-from .sentence import Sentence
+from .sentence import Sentence, MAX_RECURSION_DEPTH
 from .symbol import Symbol
 
 
@@ -20,40 +20,63 @@ class Implication(Sentence):
     def __init__(self, antecedent:Sentence, consequent:Sentence):
         self.antecedent = antecedent
         self.consequent = consequent
+        # Sentences are immutable, so the hash is computed once instead of re-walking the tree
+        self._hash = hash((antecedent, consequent))
 
-    def __repr__(self):
-        from .negation import Negation
-        antecedent = self.antecedent if isinstance(self.antecedent, (Symbol, Negation)) else f"({self.antecedent})"
-        consequent = self.consequent if isinstance(self.consequent, (Symbol, Negation)) else f"({self.consequent})"
-        return f"{antecedent} {Connective.IMPLICATION.value} {consequent}"
+    def _parts(self, order) -> list:
+        return [*self.antecedent._wrap(), f" {Connective.IMPLICATION.value} ", *self.consequent._wrap()]
         
     def __hash__(self):
-        return hash((self.antecedent, self.consequent))
+        return self._hash
     
     def __eq__(self, other:Implication):
-        if super().__eq__(other):
-            return self.antecedent == other.antecedent and self.consequent == other.consequent
+        if self is other:
+            return True
+        if super().__eq__(other) and self._hash == other._hash:
+            if self.depth < MAX_RECURSION_DEPTH:
+                return self.antecedent == other.antecedent and self.consequent == other.consequent
+            return self._equals_iterative(other)
         return False
 
+    def __reduce__(self):
+        # Rebuild through the constructor so the cached hash matches the unpickling process
+        return (Implication, (self.antecedent, self.consequent))
+
     def negate(self) -> Sentence:
         from .conjunction import Conjunction
         return Conjunction(self.antecedent, self.consequent.negate())
 
-    def evaluate(self, model:dict[Symbol, bool]) -> bool:
+    def children(self) -> tuple[Sentence, ...]:
+        return (self.antecedent, self.consequent)
+
+    def _is_horn(self) -> bool:
+        from .conjunction import Conjunction
+        if not isinstance(self.consequent, Symbol):
+            return False
+        if isinstance(self.antecedent, Symbol):
+            return True
+        if isinstance(self.antecedent, Conjunction):
+            return all(isinstance(arg, Symbol) for arg in self.antecedent.args)
+        return False
+
+    def _evaluate(self, model:dict[Symbol, bool]) -> bool:
+        antedecent = self.antecedent._evaluate(model)
+        consequent = self.consequent._evaluate(model)
+        if antedecent is None or consequent is None:
+            return None
+        return not antedecent or consequent
+
+    def _combine(self, values:list[bool]) -> bool:
         """
-        Evaluates the implication given a model. Returns True if the antecedent is False or the consequent is True, False otherwise.
+        Combines the truth values of the antecedent and the consequent. Returns True if the antecedent is False or the consequent is True, False otherwise.
 
         ### Args:
-            - model (dict[Symbol, bool]): The model to evaluate the implication
+            - values (list[bool]): The truth values of the antecedent and the consequent
             
         ### Returns:
             - bool: The result of the evaluation
         """
-        antedecent = self.antecedent.evaluate(model)
-        consequent = self.consequent.evaluate(model)
+        antedecent, consequent = values
         if antedecent is None or consequent is None:
             return None
         return not antedecent or consequent
-    
-    def symbols(self) -> set[Symbol]:
-        return self.antecedent.symbols() | self.consequent.symbols()
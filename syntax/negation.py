@@ -1,6 +1,6 @@
 from __future__ import annotations
 from .connective import Connective
-from .sentence import Sentence
+from .sentence import Sentence, MAX_RECURSION_DEPTH
 from .symbol import Symbol
 
 
@@ -16,31 +16,52 @@ class Negation(Sentence):
         - evaluate(model:dict[Symbol, bool]): Evaluates the negation of the argument sentence given a model
         - symbols(): Returns the set of symbols in the argument sentence
     """
+    _atomic = True
+
     def __init__(self, arg:Sentence):
         self.arg = arg
+        # Sentences are immutable, so the hash is computed once instead of re-walking the tree
+        self._hash = hash(arg)
 
-    def __repr__(self):
+    def _parts(self, order) -> list:
         # For example, "~A" or "~(A & B)"
         if isinstance(self.arg, Symbol):
-            return f"{Connective.NEGATION.value}{self.arg}"
-        return f"{Connective.NEGATION.value}({self.arg})"
+            return [Connective.NEGATION.value, self.arg]
+        return [Connective.NEGATION.value, "(", self.arg, ")"]
     
     def __hash__(self):
-        return hash(self.arg)
+        return self._hash
     
     def __eq__(self, other:Negation):
-        if super().__eq__(other):
-            return self.arg == other.arg
+        if self is other:
+            return True
+        if super().__eq__(other) and self._hash == other._hash:
+            if self.depth < MAX_RECURSION_DEPTH:
+                return self.arg == other.arg
+            return self._equals_iterative(other)
         return False
+
+    def __reduce__(self):
+        # Rebuild through the constructor so the cached hash matches the unpickling process
+        return (Negation, (self.arg,))
     
     def negate(self) -> Sentence:
         return self.arg
 
-    def evaluate(self, model) -> bool:
-        result = self.arg.evaluate(model)
+    def children(self) -> tuple[Sentence, ...]:
+        return (self.arg,)
+
+    def _is_horn(self) -> bool:
+        return isinstance(self.arg, Symbol)
+
+    def _evaluate(self, model:dict[Symbol, bool]) -> bool:
+        result = self.arg._evaluate(model)
+        if result is None:
+            return None
+        return not result
+
+    def _combine(self, values:list[bool]) -> bool:
+        result, = values
         if result is None:
             return None
         return not result
-    
-    def symbols(self) -> set[Symbol]:
-        return self.arg.symbols()
\ No newline at end of file
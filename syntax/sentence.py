@@ -1,39 +1,259 @@
 from __future__ import annotations
 from abc import abstractmethod
+from functools import cmp_to_key, partial
+
+# Sentences nested deeper than this are evaluated and compared with an explicit stack instead of Python recursion
+MAX_RECURSION_DEPTH = 256
 
 
 class Sentence:
     """
     This class represents a sentence in propositional logic. It is an abstract class that is inherited by other classes.
-    
+
+    ### Attributes:
+        - depth(int): The nesting depth of the sentence (0 for a symbol), computed on first access
+        - size(int): The number of nodes (symbols and connectives) in the sentence, computed on first access
+
     ### Methods:
-        - __repr__() <<abstract>>: Returns a string representation of the sentence
+        - __repr__(): Returns a string representation of the sentence, built from its parts without recursion
         - __hash__() <<abstract>>: Returns the hash value of the sentence
         - __eq__(other:Sentence): Compares the hash values of two sentences
         - negate() <<abstract>>: Returns the negation of the sentence
-        - evaluate(model:dict[Symbol, bool]) <<abstract>>: Evaluates the sentence given
-        - symbols() <<abstract>>: Returns the set of symbols in the sentence
+        - children() <<abstract>>: Returns the direct sub-sentences of the sentence
+        - walk(): Iterates over every distinct sub-sentence without recursion
+        - evaluate(model:dict[Symbol, bool]): Evaluates the sentence given a model
+        - symbols(): Returns the set of symbols in the sentence, computed on the first call
+        - is_horn(): Checks if the sentence is a Horn clause, computed on the first call
     """
-    @abstractmethod
+    # Sentences are immutable, so structural metadata is computed once on demand and cached on the node
+    _depth = None
+    _size = None
+    _symbols = None
+    _horn = None
+    # Printed without parentheses as an argument of another sentence
+    _atomic = False
+
     def __repr__(self):
+        # Sub-sentences are printed from the deepest up: shallow ones to their whole text, deep ones only
+        # to their parts, as their texts would add up to the square of the depth
+        texts = {}
+        parts = {}
+        by_text = lambda sentence: texts[id(sentence)]
+        by_pieces = cmp_to_key(partial(_compare_text, texts=texts, parts=parts))
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in texts or id(node) in parts:
+                continue
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children())
+            elif node.depth < MAX_RECURSION_DEPTH:
+                texts[id(node)] = "".join(part if isinstance(part, str) else texts[id(part)] for part in node._parts(by_text))
+            else:
+                # Arguments are ordered by their text, read only up to their first difference
+                parts[id(node)] = node._parts(by_text if all(id(child) in texts for child in node.children()) else by_pieces)
+        if id(self) in texts:
+            return texts[id(self)]
+        return "".join(_pieces(self, texts, parts))
+
+    @abstractmethod
+    def _parts(self, order) -> list:
+        # The text of the sentence, as strings and sub-sentences to print in their place, with the
+        # arguments of commutative sentences sorted by the given key
         pass
-    
+
+    def _wrap(self) -> list:
+        return [self] if self._atomic else ["(", self, ")"]
+
     @abstractmethod
     def __hash__(self):
         pass
-    
+
     @abstractmethod
     def __eq__(self, other:Sentence):
         return type(self) == type(other)
-    
+
+    def _equals_iterative(self, other:Sentence) -> bool:
+        """
+        Compares the sub-sentences of two deep sentences of the same type and hash, with an explicit stack of the pairs of sub-sentences to compare. Shallow pairs are compared recursively.
+
+        ### Args:
+            - other (Sentence): The sentence to compare with
+
+        ### Returns:
+            - bool: Whether the sentences are equal
+        """
+        stack = [(self, other)]
+        while stack:
+            node, other_node = stack.pop()
+            if node is other_node:
+                continue
+            if type(node) != type(other_node) or hash(node) != hash(other_node):
+                return False
+            if node.depth < MAX_RECURSION_DEPTH:
+                if node != other_node:
+                    return False
+                continue
+            pairs = node._pairs(other_node)
+            if pairs is None:
+                return False
+            stack.extend(pairs)
+        return True
+
+    def _pairs(self, other:Sentence) -> list[tuple[Sentence, Sentence]]:
+        # The pairs of sub-sentences that must be equal, or None if the sentences differ otherwise
+        return list(zip(self.children(), other.children()))
+
     @abstractmethod
     def negate(self) -> Sentence:
         pass
 
     @abstractmethod
-    def evaluate(self, model:dict) -> bool:
+    def children(self) -> tuple[Sentence, ...]:
         pass
-    
+
+    @property
+    def depth(self) -> int:
+        if self._depth is None:
+            self._fill_metadata()
+        return self._depth
+
+    @property
+    def size(self) -> int:
+        if self._size is None:
+            self._fill_metadata()
+        return self._size
+
+    def _fill_metadata(self):
+        # Post-order over the sub-sentences whose depth and size are not known yet
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if node._size is not None:
+                continue
+            # CNF conversion may leave None (an empty clause) among the arguments
+            children = [child for child in node.children() if child is not None]
+            if expanded:
+                node._depth = 1 + max(child._depth for child in children) if children else 0
+                node._size = 1 + sum(child._size for child in children)
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in children)
+
+    def walk(self):
+        """
+        Iterates over the sentence and all of its sub-sentences (pre-order) using an explicit stack, so arbitrarily deep sentences can be traversed. Shared sub-sentences are only visited once.
+
+        ### Yields:
+            - Sentence: Each distinct sub-sentence, starting with the sentence itself
+        """
+        visited = set()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            yield node
+            stack.extend(node.children())
+
+    def evaluate(self, model:dict) -> bool:
+        """
+        Evaluates the sentence given a model. Returns None if a symbol of the sentence is not assigned in the model.
+        Shallow sentences are evaluated recursively, deep ones with an explicit stack.
+
+        ### Args:
+            - model (dict[Symbol, bool]): The model to evaluate the sentence
+
+        ### Returns:
+            - bool: The result of the evaluation
+        """
+        if self.depth < MAX_RECURSION_DEPTH:
+            return self._evaluate(model)
+        return self._evaluate_iterative(model)
+
+    def _evaluate(self, model:dict) -> bool:
+        return self._combine([child._evaluate(model) for child in self.children()])
+
+    def _evaluate_iterative(self, model:dict) -> bool:
+        values = {}
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in values:
+                continue
+            if node.depth < MAX_RECURSION_DEPTH:
+                values[id(node)] = node._evaluate(model)
+            elif expanded:
+                values[id(node)] = node._combine([values[id(child)] for child in node.children()])
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children())
+        return values[id(self)]
+
     @abstractmethod
-    def symbols(self):
+    def _combine(self, values:list[bool]) -> bool:
         pass
+
+    def symbols(self) -> frozenset:
+        if self._symbols is None:
+            # Only the requested node caches its set: caching every sub-sentence would take quadratic memory on deep sentences
+            symbols = set()
+            stack = [self]
+            while stack:
+                node = stack.pop()
+                if node._symbols is not None:
+                    symbols |= node._symbols
+                    continue
+                children = node.children()
+                if children:
+                    stack.extend(children)
+                else:
+                    symbols.add(node)
+            self._symbols = frozenset(symbols)
+        return self._symbols
+
+    def is_horn(self) -> bool:
+        """
+        Checks if the sentence is a Horn clause: a symbol, a negated symbol, a disjunction of literals with at most one positive literal, or an implication from a symbol or a conjunction of symbols to a symbol.
+
+        ### Returns:
+            - bool: True if the sentence is a Horn clause, False otherwise
+        """
+        if self._horn is None:
+            self._horn = self._is_horn()
+        return self._horn
+
+    def _is_horn(self) -> bool:
+        return False
+
+
+def _pieces(sentence:Sentence, texts:dict[int, str], parts:dict[int, list]):
+    # The text of a sentence piece by piece, expanding the parts of deep sub-sentences with an explicit stack
+    stack = [sentence]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+        elif id(item) in texts:
+            yield texts[id(item)]
+        else:
+            stack.extend(reversed(parts[id(item)]))
+
+
+def _compare_text(sentence:Sentence, other:Sentence, texts:dict[int, str], parts:dict[int, list]) -> int:
+    # Compare the texts of two sentences like strings, reading them only up to their first difference
+    pieces, other_pieces = _pieces(sentence, texts, parts), _pieces(other, texts, parts)
+    text = other_text = ""
+    while True:
+        if not text:
+            text = next(pieces, None)
+        if not other_text:
+            other_text = next(other_pieces, None)
+        if text is None or other_text is None:
+            return (text is not None) - (other_text is not None)
+        n = min(len(text), len(other_text))
+        if text[:n] != other_text[:n]:
+            return -1 if text[:n] < other_text[:n] else 1
+        text, other_text = text[n:], other_text[n:]
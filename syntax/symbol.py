@@ -13,26 +13,40 @@ class Symbol(Sentence): # atomic sentence
         - evaluate(model:dict[Symbol, bool]): Evaluates the symbol given a model
         - symbols(): Returns the set of symbols in the symbol
     """
+    _depth = 0
+    _size = 1
+    _atomic = True
+
     def __init__(self, name:str):
         self.name = name
 
     def __repr__(self):
         return self.name
+
+    def _parts(self, order) -> list:
+        return [self.name]
     
     def __hash__(self):
         return hash(self.name)
 
     def __eq__(self, other:Symbol):
         return super().__eq__(other) and self.name == other.name
+
+    def __reduce__(self):
+        # Rebuild from the name only: the cached symbol set refers to the symbol itself
+        return (Symbol, (self.name,))
     
     def negate(self) -> Sentence:
         from .negation import Negation
         return Negation(self)
 
+    def children(self) -> tuple[Sentence, ...]:
+        return ()
+
     def evaluate(self, model:dict[Symbol, bool]) -> bool:
-        return model[self] if self in model else None
-    
-    def symbols(self) -> set[Symbol]:
-        return {self}
-    
-    
\ No newline at end of file
+        return model.get(self)
+
+    _evaluate = evaluate
+
+    def _is_horn(self) -> bool:
+        return True
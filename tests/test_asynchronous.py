@@ -0,0 +1,96 @@
+import unittest, sys, os, time, asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from parser import parse_kb_and_query, problem_files
+from analyze import get_solver
+from budget import Budget, UNKNOWN
+from asynchronous import solve_async
+from test_budget import pigeonhole
+
+# Unsatisfiable: DPLL takes seconds to refute it
+HARD_KB = Conjunction(*pigeonhole(8))
+
+class TestAsynchronous(unittest.TestCase):
+
+    def test_results(self):
+        cases = [(file_name, method) for file_name in problem_files() for method in ("TT", "FC", "BC", "DPLL", "BDD")]
+
+        async def solve_all():
+            # Every query in flight at once
+            return await asyncio.gather(*(solve_async(*parse_kb_and_query(file_name), method) for file_name, method in cases))
+
+        for (file_name, method), result in zip(cases, asyncio.run(solve_all())):
+            self.assertEqual(result["entails"], get_solver(method, *parse_kb_and_query(file_name)).solve()["entails"], f"{method} {file_name}")
+
+    def test_timeout(self):
+        for method in ("RES", "DPLL"):
+            start = time.perf_counter()
+            result = asyncio.run(solve_async(HARD_KB, Symbol("q"), method, timeout=0.2))
+            # The solver itself stopped, as the result is its own
+            self.assertEqual(result, UNKNOWN)
+            self.assertLess(time.perf_counter() - start, 3)
+        self.assertEqual(asyncio.run(solve_async(*parse_kb_and_query("horn_1.txt"), "FC", timeout=10))["entails"], True)
+
+    def test_cancel(self):
+        budget = Budget(timeout=60)
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        async def cancel():
+            task = asyncio.create_task(solve_async(HARD_KB, Symbol("q"), "DPLL", budget=budget, executor=executor))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel())
+        # The solver stopped at its next check, freeing the thread
+        start = time.perf_counter()
+        executor.shutdown(wait=True)
+        self.assertLess(time.perf_counter() - start, 3)
+        # The budget of the caller was copied, not cancelled, so it still serves other queries
+        self.assertFalse(budget.cancelled)
+        self.assertIsNone(budget.reason)
+        self.assertTrue(asyncio.run(solve_async(*parse_kb_and_query("horn_1.txt"), "DPLL", budget=budget))["entails"])
+
+    def test_shared_budget(self):
+        # One budget for queries in flight at once: the timeout of one does not stop the others
+        budget = Budget(conflicts=10 ** 6)
+
+        async def solve_all():
+            hard = solve_async(HARD_KB, Symbol("q"), "DPLL", timeout=0.2, budget=budget)
+            easy = [solve_async(*parse_kb_and_query(file_name), "DPLL", budget=budget) for file_name in ("horn_1.txt", "generic_1.txt")]
+            return await asyncio.gather(hard, *easy)
+
+        hard, *easy = asyncio.run(solve_all())
+        self.assertEqual(hard, UNKNOWN)
+        for result, file_name in zip(easy, ("horn_1.txt", "generic_1.txt")):
+            self.assertEqual(result["entails"], get_solver("DPLL", *parse_kb_and_query(file_name)).solve()["entails"], file_name)
+        self.assertFalse(budget.cancelled)
+
+    def test_event_loop(self):
+        async def responsive():
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            ticker = asyncio.create_task(tick())
+            result = await solve_async(HARD_KB, Symbol("q"), "DPLL", timeout=0.5)
+            ticker.cancel()
+            return result, ticks
+
+        result, ticks = asyncio.run(responsive())
+        self.assertEqual(result, UNKNOWN)
+        # The loop kept running while the solver searched
+        self.assertGreater(ticks, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest, sys, os
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from parser import parse_kb_and_query, problem_files
+from methods import BDD, TruthTable
+from methods.bdd import BDDManager
+
+def answer(result:dict) -> dict:
+    # The counter-model depends on the method, only the answer is compared
+    return {key: value for key, value in result.items() if key != "model"}
+
+class TestBDD(unittest.TestCase):
+
+    def setUp(self):
+        self.p = Symbol("p")
+        self.q = Symbol("q")
+        self.r = Symbol("r")
+        self.manager = BDDManager([self.p, self.q, self.r])
+
+    def test_reduction(self):
+        # Equivalent sentences share one node
+        u = self.manager.build(Implication(self.p, self.q))
+        v = self.manager.build(Disjunction(self.p.negate(), self.q))
+        self.assertEqual(u, v)
+        self.assertEqual(self.manager.build(Disjunction(self.p, self.p.negate())), 1)
+        self.assertEqual(self.manager.build(Conjunction(self.p, self.p.negate())), 0)
+        self.assertEqual(self.manager.build(Negation(Negation(self.q))), self.manager.variable(self.q))
+
+    def test_count(self):
+        self.assertEqual(self.manager.count(1), 8)
+        self.assertEqual(self.manager.count(0), 0)
+        self.assertEqual(self.manager.count(self.manager.build(self.q)), 4)
+        self.assertEqual(self.manager.count(self.manager.build(Conjunction(self.p, self.r))), 2)
+        self.assertEqual(self.manager.count(self.manager.build(Biconditional(self.p, self.r))), 4)
+
+    def test_repeated_queries(self):
+        # p => q; q => r; p
+        bdd = BDD(Conjunction(Implication(self.p, self.q), Implication(self.q, self.r), self.p), self.r)
+        self.assertEqual(bdd.solve(), {"entails": True, "message": 1})
+        self.assertEqual(bdd.ask(Conjunction(self.p, self.q)), {"entails": True, "message": 1})
+        self.assertEqual(bdd.ask(Symbol("s")), {"entails": False})
+        self.assertEqual(bdd.ask(Disjunction(self.r, Symbol("s"))), {"entails": True, "message": 2})
+
+    def test_same_result_as_truth_table(self):
+        for file_name in problem_files():
+            kb, query = parse_kb_and_query(file_name)
+            self.assertEqual(BDD(kb, query).solve(), answer(TruthTable(kb, query).solve()), file_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
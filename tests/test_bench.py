@@ -0,0 +1,83 @@
+import unittest, sys, os, random
+from unittest import mock
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from bench import *
+
+def results(samples:dict) -> dict:
+    # Results of bench() with only the total times that compare() reads
+    return {"cases": {case: {"times": {"total": times}, "peak_rss": 1000} for case, times in samples.items()}}
+
+class TestBench(unittest.TestCase):
+
+    def test_summarize(self):
+        summary = summarize([float(i) for i in range(1, 21)])
+        self.assertEqual(summary["median"], 10.5)
+        self.assertEqual(summary["min"], 1)
+        self.assertAlmostEqual(summary["p95"], 19.05)
+        self.assertEqual(summarize([2.0]), {"median": 2.0, "p95": 2.0, "min": 2.0})
+
+    def test_mann_whitney(self):
+        rng = random.Random(0)
+        fast = [1 + rng.random() * 0.1 for _ in range(20)]
+        slow = [1.2 + rng.random() * 0.1 for _ in range(20)]
+        self.assertLess(mann_whitney(slow, fast), 0.001)
+        self.assertGreater(mann_whitney(fast, slow), 0.999)
+        # Samples from the same distribution are not significantly different
+        same = [1 + rng.random() * 0.1 for _ in range(20)]
+        self.assertGreater(mann_whitney(same, fast), 0.01)
+        # Identical samples
+        self.assertEqual(mann_whitney([1.0] * 5, [1.0] * 5), 1.0)
+
+    def test_compare(self):
+        rng = random.Random(0)
+        noise = lambda base: [base + rng.random() * 0.01 for _ in range(10)]
+        baseline = results({"slower": noise(1), "faster": noise(1), "same": noise(1), "outlier": noise(1)})
+        current = results({"slower": noise(1.5), "faster": noise(0.5), "same": noise(1), "outlier": noise(1)[:-1] + [10], "new": noise(1)})
+        changes = {change["case"]: change for change in compare(current, baseline)}
+        self.assertEqual(changes.keys(), {"slower", "faster", "same", "outlier"})
+        self.assertEqual(changes["slower"]["status"], "regression")
+        self.assertEqual(changes["faster"]["status"], "improvement")
+        self.assertEqual(changes["same"]["status"], "")
+        # A single slow run is not a regression
+        self.assertEqual(changes["outlier"]["status"], "")
+        # Significant but below the threshold
+        baseline = results({"case": noise(1)})
+        current = results({"case": noise(1.02)})
+        self.assertEqual(compare(current, baseline)[0]["status"], "")
+        self.assertEqual(compare(current, baseline, threshold=0.01)[0]["status"], "regression")
+
+    def test_without_resource(self):
+        # Where the resource module is missing (Windows), the peak RSS is unknown and reported as n/a
+        with mock.patch("budget.resource", None):
+            self.assertIsNone(peak_memory())
+        current, baseline = results({"case": [1.0] * 5}), results({"case": [1.0] * 5})
+        current["cases"]["case"]["peak_rss"] = None
+        change, = compare(current, baseline)
+        self.assertIsNone(change["rss_ratio"])
+        self.assertIn("n/a", report_comparison([change]))
+        current["cases"]["case"].update({"method": "FC", "file": "horn_1.txt", "entails": True, "summary": {phase: summarize([1.0]) for phase in PHASES}})
+        self.assertIn("n/a", report(current))
+
+    def test_run_case(self):
+        case = run_case("FC", "horn_1.txt", repeat=3, warmup=1)
+        self.assertTrue(case["entails"])
+        self.assertEqual(case["times"].keys(), {"parse", "cnf", "solve", "total"})
+        for phase in PHASES:
+            self.assertEqual(len(case["times"][phase]), 3)
+        for i in range(3):
+            self.assertAlmostEqual(case["times"]["total"][i], sum(case["times"][phase][i] for phase in ("parse", "cnf", "solve")))
+        self.assertGreater(case["peak_rss"], 0)
+
+    def test_run_isolated(self):
+        case = run_isolated("DPLL", "horn_1.txt", repeat=2, warmup=0, timeout=60)
+        self.assertTrue(case["entails"])
+        self.assertEqual(len(case["times"]["solve"]), 2)
+        self.assertIn("error", run_isolated("DPLL", "missing.txt", repeat=1, warmup=0, timeout=60))
+        self.assertEqual(run_isolated("RES", "generic_7.txt", repeat=1, warmup=0, timeout=0.5), {"error": "timeout after 0.5 s"})
+
+
+if __name__ == '__main__':
+    unittest.main()
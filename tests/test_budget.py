@@ -0,0 +1,83 @@
+import unittest, sys, os, time, itertools
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from parser import parse_kb_and_query, problem_files
+from budget import *
+from methods import DPLL, Resolution
+
+def pigeonhole(holes:int) -> list[Sentence]:
+    # holes + 1 pigeons in holes holes: unsatisfiable, and hard for DPLL and resolution
+    pigeons = range(holes + 1)
+    symbol = lambda pigeon, hole: Symbol(f"p{pigeon}h{hole}")
+    clauses = [Disjunction(*(symbol(pigeon, hole) for hole in range(holes))) for pigeon in pigeons]
+    for hole in range(holes):
+        for first, second in itertools.combinations(pigeons, 2):
+            clauses.append(Disjunction(Negation(symbol(first, hole)), Negation(symbol(second, hole))))
+    return clauses
+
+class TestBudget(unittest.TestCase):
+
+    def test_luby(self):
+        self.assertEqual([luby(i) for i in range(1, 16)], [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8])
+
+    def test_restart_limits(self):
+        self.assertEqual(list(itertools.islice(restart_limits("luby", 10), 7)), [10, 10, 20, 10, 10, 20, 40])
+        self.assertEqual(list(itertools.islice(restart_limits("geometric", 100, 2), 4)), [100, 200, 400, 800])
+        with self.assertRaises(ValueError):
+            restart_limits("never")
+
+    def test_check(self):
+        budget = Budget(conflicts=2, decisions=5)
+        budget.start()
+        budget.check(conflicts=2, decisions=5)
+        with self.assertRaises(BudgetExhausted):
+            budget.check(conflicts=3)
+        self.assertEqual(budget.reason, "conflicts")
+        budget = Budget(memory=1)
+        with self.assertRaises(BudgetExhausted):
+            budget.check()
+        self.assertEqual(budget.reason, "memory")
+        Budget(memory=10**6).check()
+        budget = Budget()
+        budget.cancel()
+        budget.start()
+        with self.assertRaises(BudgetExhausted):
+            budget.check()
+        self.assertEqual(budget.reason, "cancelled")
+
+    def test_dpll_budget(self):
+        clauses = pigeonhole(6)
+        solver = DPLL.from_clauses(clauses, budget=Budget(conflicts=10))
+        self.assertEqual(solver.solve(), UNKNOWN)
+        self.assertEqual(solver.conflicts, 11)
+        solver = DPLL.from_clauses(clauses, budget=Budget(decisions=10))
+        self.assertEqual(solver.solve(), UNKNOWN)
+        self.assertEqual(solver.decisions, 11)
+        # Enough budget for the whole search
+        self.assertEqual(DPLL.from_clauses(pigeonhole(3), budget=Budget(timeout=60)).solve(), { "entails": True })
+
+    def test_resolution_budget(self):
+        clauses = pigeonhole(4)
+        solver = Resolution.from_clauses(clauses, budget=Budget(resolvents=100))
+        self.assertEqual(solver.solve(), UNKNOWN)
+        start = time.perf_counter()
+        self.assertEqual(Resolution.from_clauses(clauses, budget=Budget(timeout=0.2)).solve(), UNKNOWN)
+        self.assertLess(time.perf_counter() - start, 5)
+
+    def test_restarts(self):
+        class QuickRestarts(DPLL):
+            RESTART_BASE = 2
+        solver = QuickRestarts.from_clauses(pigeonhole(4), heuristic="vsids", phase_saving=True, restarts="luby")
+        self.assertEqual(solver.solve(), { "entails": True })
+        self.assertGreater(solver.restarts, 0)
+        for file_name in problem_files():
+            kb, query = parse_kb_and_query(file_name)
+            for policy in RESTART_POLICIES:
+                self.assertEqual(DPLL(kb, query, heuristic="vsids", restarts=policy).solve(), DPLL(kb, query).solve(), file_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest, sys, os
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from clauses import symbol_index, encode, variables, components, elimination_order
+
+class TestClauses(unittest.TestCase):
+
+    def setUp(self):
+        self.p = Symbol("p")
+        self.q = Symbol("q")
+        self.r = Symbol("r")
+        self.index = symbol_index([self.p, self.q, self.r])
+
+    def test_encode(self):
+        self.assertEqual(encode(Implication(self.p, self.q), self.index), [frozenset((-1, 2))])
+        self.assertEqual(set(encode(Biconditional(self.p, self.r), self.index)), {frozenset((-1, 3)), frozenset((1, -3))})
+        self.assertEqual(set(encode(Conjunction(self.p, Negation(self.q)), self.index)), {frozenset((1,)), frozenset((-2,))})
+
+    def test_encode_tautology(self):
+        # A tautological clause is dropped instead of shortened
+        self.assertEqual(encode(Disjunction(self.p, Negation(self.p), self.q), self.index), [])
+        self.assertEqual(encode(Conjunction(Disjunction(self.p, Negation(self.p)), self.r), self.index), [frozenset((3,))])
+
+    def test_components(self):
+        clauses = [frozenset((1, 2)), frozenset((3, 4)), frozenset((-2, 5)), frozenset((6,))]
+        self.assertEqual(components(clauses), [[clauses[0], clauses[2]], [clauses[1]], [clauses[3]]])
+        self.assertEqual(variables(clauses), {1, 2, 3, 4, 5, 6})
+
+    def test_elimination_order(self):
+        # A star: the centre separates the other variables, so it stays until only one leaf is left
+        clauses = [frozenset((1, 2)), frozenset((1, 3)), frozenset((-1, 4))]
+        self.assertEqual(elimination_order(clauses)[:2], [2, 3])
+        self.assertEqual(sorted(elimination_order(clauses)), [1, 2, 3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
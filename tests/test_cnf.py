@@ -51,6 +51,8 @@ class TestCNF(unittest.TestCase):
         cnf_sentence = to_cnf(sentence)
         # True
         self.assertIsNone(cnf_sentence)
+        # (p ∨ ¬p ∨ q) ∧ r: the tautology is dropped, not shortened to q
+        self.assertEqual(to_cnf(Conjunction(Disjunction(self.p, Negation(self.p), self.q), self.r)), self.r)
 
     def test_conjunction_of_disjunctions(self):
         # (p ∨ q) ∧ (r ∨ t)
@@ -127,16 +129,8 @@ class TestCNF(unittest.TestCase):
                 )
             )
         cnf_sentence = to_cnf(sentence)
-        # (¬q ∨ t) ∧ (¬r ∨ t) ∧ (¬p ∨ ¬q ∨ ¬t) ∧ (¬p ∨ ¬r ∨ ¬t)
+        # (¬p ∨ ¬q ∨ ¬t) ∧ (¬p ∨ ¬r ∨ ¬t), the clauses with both p and ¬p being always true
         self.assertEqual(cnf_sentence, Conjunction(
-            Disjunction(
-                self.q.negate(), 
-                self.t
-                ), 
-            Disjunction(
-                self.r.negate(), 
-                self.t
-                ), 
             Disjunction(
                 self.p.negate(), 
                 self.q.negate(), 
@@ -170,6 +164,32 @@ class TestCNF(unittest.TestCase):
                 )
             )
         )
+
+
+    def test_negation_of_biconditional(self):
+        # ¬(p ↔ q)
+        sentence = Negation(Biconditional(self.p, self.q))
+        cnf_sentence = to_cnf(sentence)
+        # (p ∨ q) ∧ (¬p ∨ ¬q)
+        self.assertEqual(cnf_sentence, Conjunction(Disjunction(self.p, self.q), Disjunction(self.p.negate(), self.q.negate())))
+
+    def test_deep_implication_chain(self):
+        # a0 → (a1 → (... → an)), nested far beyond the recursion limit
+        symbols = [Symbol(f"a{i}") for i in range(10**5 + 1)]
+        sentence = symbols[-1]
+        for symbol in reversed(symbols[:-1]):
+            sentence = Implication(symbol, sentence)
+        cnf_sentence = to_cnf(sentence)
+        # ¬a0 ∨ ¬a1 ∨ ... ∨ an
+        self.assertEqual(cnf_sentence, Disjunction(*[symbol.negate() for symbol in symbols[:-1]], symbols[-1]))
+
+    def test_deep_negation_chain(self):
+        # ¬¬...¬p with an even number of negations
+        sentence = self.p
+        for _ in range(10**5):
+            sentence = Negation(sentence)
+        self.assertEqual(to_cnf(sentence), self.p)
+        self.assertEqual(to_cnf(Negation(sentence)), self.p.negate())
             
             
 if __name__ == '__main__':
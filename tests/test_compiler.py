@@ -0,0 +1,54 @@
+import unittest, sys, os
+from itertools import product
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from compiler import compile_sentence
+
+class TestCompiler(unittest.TestCase):
+
+    def setUp(self):
+        self.p = Symbol("p")
+        self.q = Symbol("q")
+        self.r = Symbol("r")
+        self.symbols = [self.p, self.q, self.r]
+
+    def assertMatchesEvaluate(self, sentence):
+        evaluate = compile_sentence(sentence, self.symbols)
+        for model in product((True, False), repeat=len(self.symbols)):
+            self.assertEqual(evaluate(model), sentence.evaluate(dict(zip(self.symbols, model))), f"{sentence} on {model}")
+
+    def test_connectives(self):
+        self.assertMatchesEvaluate(self.p)
+        self.assertMatchesEvaluate(Negation(self.p))
+        self.assertMatchesEvaluate(Conjunction(self.p, self.q, self.r))
+        self.assertMatchesEvaluate(Disjunction(self.p, self.q, self.r))
+        self.assertMatchesEvaluate(Implication(self.p, self.q))
+        self.assertMatchesEvaluate(Biconditional(self.p, self.q))
+
+    def test_complex_sentences(self):
+        # (p & (q || r)) => (r <=> ~p)
+        self.assertMatchesEvaluate(Implication(Conjunction(self.p, Disjunction(self.q, self.r)), Biconditional(self.r, Negation(self.p))))
+        # ~((p => q) & ~(q || ~r))
+        self.assertMatchesEvaluate(Negation(Conjunction(Implication(self.p, self.q), Negation(Disjunction(self.q, Negation(self.r))))))
+
+    def test_missing_symbol(self):
+        with self.assertRaises(ValueError):
+            compile_sentence(Conjunction(self.p, Symbol("s")), self.symbols)
+
+    def test_deep_sentence(self):
+        # p0 => (p1 => (... => pn)), nested beyond the limits of the Python parser
+        symbols = [Symbol(f"p{i}") for i in range(5001)]
+        sentence = symbols[-1]
+        for symbol in reversed(symbols[:-1]):
+            sentence = Implication(symbol, sentence)
+        evaluate = compile_sentence(sentence, symbols)
+        self.assertTrue(evaluate([True] * len(symbols)))
+        self.assertFalse(evaluate([True] * (len(symbols) - 1) + [False]))
+        self.assertTrue(evaluate([False] + [True] * (len(symbols) - 2) + [False]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest, sys, os, io, contextlib
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from parser import parse_kb_and_query, problem_files
+from methods import Decomposition, TruthTable, Resolution, DPLL
+
+def answer(result:dict) -> dict:
+    # The counter-model depends on the method, only the answer is compared
+    return {key: value for key, value in result.items() if key != "model"}
+
+class TestDecomposition(unittest.TestCase):
+
+    def setUp(self):
+        # Two unrelated theories: a; a => b and c || d; ~d
+        self.a, self.b, self.c, self.d = (Symbol(name) for name in "abcd")
+        self.kb = Conjunction(self.a, Implication(self.a, self.b), Disjunction(self.c, self.d), Negation(self.d))
+
+    def test_split(self):
+        # a; ~a || b; ~b and c || d; ~d
+        self.assertEqual(len(Decomposition("DPLL", self.kb, self.b).components), 2)
+        components = Decomposition("TT", self.kb, self.b).components
+        self.assertEqual(set(components[0]), {self.a, Implication(self.a, self.b)})
+        self.assertEqual(len(components), 2)
+
+    def test_truth_table_count(self):
+        # The query component has 1 model, the other one 1: c is true and d is false
+        self.assertEqual(Decomposition("TT", self.kb, self.b).solve(), {"entails": True, "message": 1})
+        self.assertEqual(Decomposition("TT", self.kb, Disjunction(self.b, Symbol("e"))).solve(), answer(TruthTable(self.kb, Disjunction(self.b, Symbol("e"))).solve()))
+        self.assertEqual(answer(Decomposition("TT", self.kb, Symbol("e")).solve()), {"entails": False})
+
+    def test_inconsistent_component(self):
+        kb = Conjunction(self.a, self.c, Negation(self.c))
+        self.assertEqual(Decomposition("DPLL", kb, self.b).solve(), {"entails": True})
+        self.assertEqual(Decomposition("TT", kb, self.b).solve(), answer(TruthTable(kb, self.b).solve()))
+
+    def test_process_pool(self):
+        theories = [sentence for i in range(4) for sentence in
+                    (Symbol(f"a{i}"), Implication(Symbol(f"a{i}"), Symbol(f"b{i}")), Disjunction(Symbol(f"c{i}"), Negation(Symbol(f"b{i}"))))]
+        kb = Conjunction(*theories)
+        for method, solver_class in (("TT", TruthTable), ("RES", Resolution), ("DPLL", DPLL)):
+            for query in (Symbol("c3"), Symbol("d")):
+                self.assertEqual(answer(Decomposition(method, kb, query, workers=2).solve()), answer(solver_class(kb, query).solve()), f"{method} {query}")
+
+    def test_invalid_method(self):
+        with self.assertRaises(ValueError):
+            Decomposition("FC", self.kb, self.b)
+
+    def test_same_result_as_method(self):
+        for file_name in problem_files():
+            kb, query = parse_kb_and_query(file_name)
+            # Resolution is too slow on some of the generic problems
+            methods = (("TT", TruthTable), ("RES", Resolution), ("DPLL", DPLL)) if file_name.startswith("horn") else (("TT", TruthTable), ("DPLL", DPLL))
+            for method, solver_class in methods:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    expected = answer(solver_class(kb, query).solve())
+                self.assertEqual(answer(Decomposition(method, kb, query, workers=1).solve()), expected, f"{method} {file_name}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest, sys, os, random
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from clauses import satisfiable
+from parser import parse_kb_and_query, problem_files
+from methods import DPLL, TruthTable, Resolution
+
+def random_clauses(rng:random.Random, symbols:list[Symbol], count:int) -> list[Sentence]:
+    clauses = []
+    for _ in range(count):
+        literals = [symbol if rng.random() < 0.5 else Negation(symbol) for symbol in rng.sample(symbols, rng.randint(1, 3))]
+        clauses.append(Disjunction(*literals) if len(literals) > 1 else literals[0])
+    return clauses
+
+class TestDPLL(unittest.TestCase):
+
+    def test_random_clauses(self):
+        rng = random.Random(0)
+        symbols = [Symbol(f"x{i}") for i in range(8)]
+        for _ in range(500):
+            solver = DPLL.from_clauses(random_clauses(rng, symbols, rng.randint(1, 30)))
+            expected = not satisfiable(frozenset(clause) for clause in solver.database)
+            self.assertEqual(solver.solve()["entails"], expected)
+
+    def test_empty_clause(self):
+        p = Symbol("p")
+        self.assertEqual(DPLL.from_clauses([p, Negation(p)]).solve(), { "entails": True })
+
+    def test_tautology(self):
+        # s0 ∧ (s0 ∨ ¬s0) ∧ s1 ∧ (¬s0 → s1): the tautology is always true, not an empty clause
+        s0, s1 = Symbol("s0"), Symbol("s1")
+        kb = Conjunction(s0, Disjunction(s0, Negation(s0)), s1, Implication(Negation(s0), s1))
+        for query, expected in ((Negation(s1), False), (s1, True)):
+            self.assertEqual(DPLL(kb, query).solve()["entails"], expected, query)
+            self.assertEqual(DPLL(kb, query, preprocess=["subsumption"]).solve()["entails"], expected, query)
+            self.assertEqual(Resolution(kb, query).solve()["entails"], expected, query)
+            self.assertEqual(TruthTable(kb, query).solve()["entails"], expected, query)
+
+    def test_deep_search(self):
+        # Every pair needs a decision, so the search goes deeper than the recursion limit
+        clauses = []
+        for i in range(sys.getrecursionlimit() + 500):
+            x, y = Symbol(f"x{i}"), Symbol(f"y{i}")
+            clauses += [Disjunction(x, y), Disjunction(Negation(x), Negation(y))]
+        solver = DPLL.from_clauses(clauses)
+        self.assertFalse(solver.solve()["entails"])
+        self.assertGreater(solver.decisions, sys.getrecursionlimit())
+        self.assertEqual(len(solver.trail), len(solver.symbols))
+
+    def test_backtrack(self):
+        p, q, r = Symbol("p"), Symbol("q"), Symbol("r")
+        solver = DPLL.from_clauses([Disjunction(Negation(p), q), Disjunction(Negation(q), r)])
+        solver.assign(1)
+        self.assertIsNone(solver.propagate())
+        self.assertEqual(solver.trail, [1, 2, 3])
+        solver.backtrack(0)
+        self.assertEqual(solver.trail, [])
+        self.assertEqual(solver.assignment, [0, 0, 0, 0])
+        # The watches are still valid after backtracking
+        solver.assign(-3)
+        self.assertIsNone(solver.propagate())
+        self.assertEqual(solver.trail, [-3, -2, -1])
+
+    def test_counter_model(self):
+        for file_name in problem_files():
+            kb, query = parse_kb_and_query(file_name)
+            for solver in (DPLL(kb, query), TruthTable(kb, query)):
+                result = solver.solve()
+                if result["entails"]:
+                    self.assertNotIn("model", result)
+                    continue
+                # The model is over every symbol and proves the NO answer
+                model = result["model"]
+                self.assertEqual(set(model), kb.symbols() | query.symbols(), file_name)
+                self.assertTrue(kb.evaluate(model), file_name)
+                self.assertFalse(query.evaluate(model), file_name)
+        # Preprocessing may remove symbols, so no model is given
+        kb, query = parse_kb_and_query("generic_3.txt")
+        self.assertEqual(DPLL(kb, query, ["bve"]).solve(), { "entails": False })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest, sys, os, io, random, contextlib
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from parser import parse_kb_and_query, problem_files
+from generator import generate
+from server import parse_sentence
+from methods.forward_chaining import ForwardChaining, np
+
+def solve(kb:Sentence, query:Sentence, backend:str, workers:int=1) -> tuple[dict, int]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Without the Horn form warnings
+        solver = ForwardChaining(kb, query, backend=backend, workers=workers)
+        return solver.solve(), solver.agenda_pops
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestNumpyBackend(unittest.TestCase):
+
+    def test_files(self):
+        for file_name in problem_files():
+            kb, query = parse_kb_and_query(file_name)
+            self.assertEqual(solve(kb, query, "numpy"), solve(kb, query, "python"), file_name)
+
+    def test_generated(self):
+        # The same chain and agenda pops, for symbols entailed or not, and a symbol of no sentence
+        for seed in range(5):
+            text = generate("horn", 500, seed, fan_in=seed % 3 + 1)[0]
+            sentences = [parse_sentence(sentence) for sentence in text.split("\n")[1].split(";") if sentence.strip()]
+            kb = Conjunction(*sentences)
+            symbols = sorted(kb.symbols(), key=lambda x: x.name)
+            for query in random.Random(seed).sample(symbols, 10) + [Symbol("unknown")]:
+                self.assertEqual(solve(kb, query, "numpy"), solve(kb, query, "python"), f"{seed} {query}")
+
+    def test_single_sentence(self):
+        self.assertEqual(solve(Symbol("a"), Symbol("a"), "numpy")[0], { "entails": True, "message": "a" })
+        self.assertEqual(solve(parse_sentence("a => b"), Symbol("b"), "numpy")[0], { "entails": False })
+
+    def test_compile(self):
+        kb = Conjunction(*[parse_sentence(sentence) for sentence in "c & a => b; a; b => d; c".split(";")])
+        numbers, facts, count, consequents, rules, start = ForwardChaining(kb, Symbol("d"), backend="numpy").compile()
+        self.assertEqual([name for name in numbers if numbers[name] in facts.tolist()], ["a", "c"])
+        self.assertEqual(sorted(count.tolist()), [1, 2])
+        for name, consequent in (("a", "b"), ("b", "d"), ("c", "b")):
+            # The rules of every symbol are those with it in their premise
+            rules_of = rules[start[numbers[name]]:start[numbers[name] + 1]].tolist()
+            self.assertEqual([consequents[rule] for rule in rules_of], [numbers[consequent]])
+        self.assertEqual(start[numbers["d"] + 1] - start[numbers["d"]], 0)
+
+    def test_query_again(self):
+        # The arrays are built once, and the counts start over for every query
+        kb, _ = parse_kb_and_query("horn_1.txt")
+        solver = ForwardChaining(kb, Symbol("d"), backend="numpy")
+        first = solver.solve()
+        solver.query = Symbol("p1")
+        self.assertEqual(solver.solve(), solve(kb, Symbol("p1"), "python")[0])
+        solver.query = Symbol("d")
+        self.assertEqual(solver.solve(), first)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestWorkers(unittest.TestCase):
+
+    def test_workers(self):
+        # Sharded rules give the same chain as the python backend, whatever the number of workers
+        text = generate("horn", 2000, 3)[0]
+        kb = Conjunction(*[parse_sentence(sentence) for sentence in text.split("\n")[1].split(";") if sentence.strip()])
+        symbols = sorted(kb.symbols(), key=lambda x: x.name)
+        for query in random.Random(3).sample(symbols, 3) + [Symbol("unknown")]:
+            expected = solve(kb, query, "python")
+            for workers in (2, 3):
+                self.assertEqual(solve(kb, query, "numpy", workers), expected, f"{workers} {query}")
+        kb, query = parse_kb_and_query("horn_1.txt")
+        self.assertEqual(solve(kb, query, "numpy", 4), solve(kb, query, "python"))
+
+
+class TestBackends(unittest.TestCase):
+
+    def test_backends(self):
+        # Checked before any array is built, so NumPy is not needed
+        kb, query = parse_kb_and_query("horn_1.txt")
+        with self.assertRaises(ValueError):
+            ForwardChaining(kb, query, backend="gpu")
+        for backend, workers in (("python", 2), ("numpy", 0)):
+            with self.assertRaises(ValueError):
+                ForwardChaining(kb, query, backend=backend, workers=workers)
+
+    @unittest.skipIf(np is not None, "NumPy is installed")
+    def test_without_numpy(self):
+        kb, query = parse_kb_and_query("horn_1.txt")
+        with self.assertRaises(ValueError):
+            ForwardChaining(kb, query, backend="numpy")
+        self.assertTrue(solve(kb, query, "python")[0]["entails"])
+
+if __name__ == '__main__':
+    unittest.main()
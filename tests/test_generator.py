@@ -0,0 +1,102 @@
+import unittest, sys, os, tempfile
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from parser import parse_kb_and_query, read_file
+from generator import *
+from methods import DPLL, ForwardChaining, ModelCounting
+
+class TestGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def parse(self, text:str):
+        # An absolute path is read as is by the parser
+        path = os.path.join(self.directory.name, "problem.txt")
+        with open(path, "w") as file:
+            file.write(text)
+        kb, query = parse_kb_and_query(path)
+        return kb, query, read_file(path)[2]
+
+    def test_expected(self):
+        # The expected answer is the one of the methods answering NO without a model of the KB, and DIMACS gives the one of the refutation
+        answers = set()
+        for family in FAMILIES:
+            for seed in range(10):
+                text, dimacs, expected = generate(family, 30, seed)
+                kb, query, written = self.parse(text)
+                self.assertEqual(written, expected, (family, seed))
+                self.assertEqual(ModelCounting(kb, query).solve()["entails"], expected, (family, seed))
+                entailed = DPLL(kb, query).solve()["entails"]
+                self.assertIn(f"c expect {'YES (UNSAT)' if entailed else 'NO (SAT)'}", dimacs, (family, seed))
+                answers.add((entailed, expected))
+        # Including a KB without a model, entailing the query with the answer NO
+        self.assertIn((True, False), answers)
+
+    def test_pigeonhole(self):
+        text, dimacs, expected = generate("pigeonhole", 100, 0)
+        self.assertFalse(expected)
+        self.assertIn("EXPECT\nNO", text)
+        self.assertIn("c expect YES (UNSAT)", dimacs)
+
+    def test_horn(self):
+        answers = set()
+        for seed in range(10):
+            text, _, expected = generate("horn", 200, seed, depth=3, fan_in=3)
+            kb, query, _ = self.parse(text)
+            self.assertTrue(all(clause.is_horn() for clause in kb.args))
+            self.assertEqual(ForwardChaining(kb, query).solve()["entails"], expected)
+            answers.add(expected)
+        self.assertEqual(answers, {True, False})
+
+    def test_horn_entails(self):
+        self.assertTrue(horn_entails([[1], [-1, 2], [-2, -1, 3]], 3))
+        self.assertFalse(horn_entails([[1], [-1, -4, 3]], 3))
+        # Inconsistent clauses entail anything
+        self.assertTrue(horn_entails([[1], [-1]], 5))
+
+    def test_sizes(self):
+        for clauses in (10, 100, 1000):
+            self.assertEqual(len(horn(clauses, 0)[1]), clauses)
+            self.assertEqual(len(k_cnf(clauses, 0)[1]), clauses)
+            self.assertLessEqual(len(pigeonhole(clauses, 0)[1]), clauses)
+            self.assertEqual(len(biconditional_chain(clauses, 0)[1]), clauses - (clauses % 2 == 0))
+        self.assertEqual(len(pigeonhole(100, 0)[1]), 6 + 5 * 15)
+        self.assertTrue(all(len(clause) == 4 for clause in k_cnf(50, 0, k=4)[1]))
+
+    def test_seed(self):
+        for family in FAMILIES:
+            self.assertEqual(generate(family, 50, 1), generate(family, 50, 1))
+        self.assertNotEqual(generate("kcnf", 50, 1), generate("kcnf", 50, 2))
+
+    def test_dimacs(self):
+        sentences, clauses, query, _, _ = k_cnf(20, 0)
+        lines = to_dimacs(clauses, query, False).splitlines()
+        self.assertEqual(lines[0], f"c query {'~' if query < 0 else ''}x{abs(query)}")
+        self.assertEqual(lines[1], "c expect NO (SAT)")
+        header = lines[2].split()
+        self.assertEqual(header[:2], ["p", "cnf"])
+        self.assertEqual(int(header[2]), max(abs(literal) for clause in clauses for literal in clause + [query]))
+        self.assertEqual(int(header[3]), 21)
+        # The negated query is the last clause
+        self.assertEqual(lines[-1], f"{-query} 0")
+        self.assertEqual([[int(literal) for literal in line.split()[:-1]] for line in lines[3:-1]], clauses)
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            generate("unknown", 10)
+        # The answer is left out when the reference solver is stopped
+        text, dimacs, expected = generate("kcnf", 3000, 0, timeout=0)
+        self.assertIsNone(expected)
+        self.assertNotIn("EXPECT", text)
+        self.assertNotIn("c expect", dimacs)
+
+
+if __name__ == '__main__':
+    unittest.main()
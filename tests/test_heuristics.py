@@ -0,0 +1,72 @@
+import unittest, sys, os
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from parser import parse_kb_and_query, problem_files
+from heuristics import *
+from methods import DPLL, TruthTable
+
+p, q, r, s = Symbol("p"), Symbol("q"), Symbol("r"), Symbol("s")
+
+class TestHeuristics(unittest.TestCase):
+
+    def test_first(self):
+        self.assertEqual(first([(-3, 1), (2,)]), 3)
+
+    def test_dlis(self):
+        # -2 appears in three clauses
+        clauses = [(1, -2), (-2, 3), (-2, 4), (1, 3, 4)]
+        self.assertEqual(dlis(clauses), -2)
+
+    def test_moms(self):
+        # 1 appears most in the shortest clauses, more often negated
+        clauses = [(-1, 2), (-1, 3), (1, 4), (2, 3, 4)]
+        self.assertEqual(moms(clauses), -1)
+
+    def test_jeroslow_wang(self):
+        # 1 is in a short clause and two long ones; then 2, in a short clause, outweighs 3 and 4
+        clauses = [(1, 2), (1, 3, 4), (-1, 3, 4), (2, 3, 4)]
+        self.assertEqual(jeroslow_wang(clauses), 1)
+        self.assertEqual(jeroslow_wang([(1, 2), (2, 3, 4)]), 2)
+
+    def test_vsids(self):
+        clauses = [(1, 2), (1, -3), (-3, 4)]
+        vsids = VSIDS(clauses, decay=0.5)
+        # Activities start from the occurrences, ties going to the highest variable
+        self.assertEqual(vsids.activity, {1: 2, 2: 1, 3: 2, 4: 1})
+        self.assertEqual(vsids.select(clauses), -3)
+        # A later bump outweighs an earlier one
+        vsids.bump([2])
+        vsids.bump([4])
+        self.assertGreater(vsids.activity[4], vsids.activity[2])
+        self.assertEqual(vsids.select(clauses), 4)
+        for _ in range(400):
+            vsids.bump([2])
+        self.assertLess(vsids.increment, VSIDS.RESCALE_LIMIT)
+        self.assertEqual(vsids.select(clauses), 2)
+
+    def test_invalid_heuristic(self):
+        with self.assertRaises(ValueError):
+            DPLL(p, p, heuristic="random")
+
+    def test_same_result(self):
+        for file_name in problem_files():
+            kb, query = parse_kb_and_query(file_name)
+            expected = TruthTable(kb, query).solve()["entails"]
+            for heuristic in HEURISTICS:
+                for phase_saving in (False, True):
+                    solver = DPLL(kb, query, heuristic=heuristic, phase_saving=phase_saving)
+                    self.assertEqual(solver.solve()["entails"], expected, f"{file_name} {heuristic} {phase_saving}")
+
+    def test_decisions(self):
+        # The negated query is refuted by unit propagation alone
+        solver = DPLL(Conjunction(p, Implication(p, q)), q)
+        solver.solve()
+        self.assertEqual(solver.decisions, 0)
+        self.assertEqual(solver.conflicts, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
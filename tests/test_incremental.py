@@ -0,0 +1,180 @@
+import unittest, sys, os, io, random, contextlib
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from parser import parse_kb_and_query, problem_files
+from analyze import get_solver
+from generator import generate
+from server import parse_sentence
+from incremental import *
+
+INCREMENTAL = { "FC": IncrementalForwardChaining, "BC": IncrementalBackwardChaining, "DPLL": IncrementalDPLL }
+
+def solve(method:str, sentences:list[Sentence], query:Sentence) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Without the Horn form warnings
+        return get_solver(method, Conjunction(*sentences) if len(sentences) > 1 else sentences[0], query).solve()
+
+class TestIncremental(unittest.TestCase):
+
+    def test_files(self):
+        for file_name in problem_files():
+            kb, query = parse_kb_and_query(file_name)
+            for method, solver in INCREMENTAL.items():
+                incremental = solver()
+                incremental.tell(kb)
+                self.assertEqual(incremental.ask(query)["entails"], solve(method, [kb], query)["entails"], f"{method} {file_name}")
+
+    def test_growing(self):
+        # Every query after every sentence told, against a solver of the knowledge base so far
+        for family, methods in (("horn", ("FC", "BC", "DPLL")), ("kcnf", ("DPLL",))):
+            text = generate(family, 40, seed=1)[0]
+            sentences = [parse_sentence(sentence) for sentence in text.split("\n")[1].split(";") if sentence.strip()]
+            symbols = sorted(set().union(*(sentence.symbols() for sentence in sentences)), key=lambda x: x.name)
+            for method in methods:
+                incremental = INCREMENTAL[method]()
+                for i, sentence in enumerate(sentences):
+                    incremental.tell(sentence)
+                    for query in random.Random(i).sample(symbols, 3):
+                        self.assertEqual(incremental.ask(query)["entails"], solve(method, sentences[:i + 1], query)["entails"], f"{method} {family} {i}")
+
+    def test_forward_chaining(self):
+        solver = IncrementalForwardChaining()
+        solver.tell(parse_sentence("a => b"))
+        solver.tell(parse_sentence("b & c => d"))
+        self.assertEqual(solver.ask(Symbol("b")), { "entails": False })
+        solver.tell(Conjunction(Symbol("c"), Symbol("a")))
+        self.assertEqual(solver.ask(Symbol("d")), { "entails": True, "message": "a, c, b, d" })
+        self.assertEqual(solver.ask(Symbol("b")), { "entails": True, "message": "a, c, b" })
+        self.assertTrue(solver.entails(Symbol("d")))
+        self.assertFalse(solver.entails(Symbol("e")))
+        pops = solver.agenda_pops
+        # A fact already inferred adds nothing, and a rule whose premise is inferred fires at once
+        solver.tell(Symbol("b"))
+        self.assertEqual(solver.agenda_pops, pops)
+        solver.tell(parse_sentence("a & d => e"))
+        self.assertEqual(solver.ask(Symbol("e")), { "entails": True, "message": "a, c, b, d, e" })
+        # Ignored, like by ForwardChaining
+        solver.tell(parse_sentence("e => f || g"))
+        solver.tell(parse_sentence("~h"))
+        self.assertEqual(solver.agenda_pops, pops + 1)
+        self.assertCountEqual(solver.symbols, [Symbol(name) for name in "abcde"])
+
+    def test_retract(self):
+        solver = IncrementalForwardChaining()
+        solver.tell(parse_sentence("a => b"))
+        solver.tell(parse_sentence("c => b"))
+        solver.tell(parse_sentence("b => d"))
+        solver.tell(parse_sentence("d => e"))
+        solver.tell(parse_sentence("e => d"))
+        solver.tell(Conjunction(Symbol("a"), Symbol("c")))
+        self.assertTrue(solver.entails(Symbol("e")))
+        # b is still concluded from c
+        solver.retract(Symbol("a"))
+        self.assertFalse(solver.entails(Symbol("a")))
+        self.assertEqual(solver.ask(Symbol("e")), { "entails": True, "message": "c, b, d, e" })
+        # d and e only support each other
+        solver.retract(parse_sentence("c => b"))
+        for name in "abde":
+            self.assertFalse(solver.entails(Symbol(name)), name)
+        self.assertTrue(solver.entails(Symbol("c")))
+        # A derived symbol told as a fact stays when its rule is retracted
+        solver.tell(Symbol("d"))
+        solver.tell(Symbol("a"))
+        solver.retract(parse_sentence("a => b"))
+        self.assertEqual([solver.entails(Symbol(name)) for name in "abcde"], [True, False, True, True, True])
+        # Retracting a sentence that is not in the knowledge base changes nothing
+        deletions = solver.deletions
+        solver.retract(Symbol("b"))
+        solver.retract(parse_sentence("a => e"))
+        self.assertEqual(solver.deletions, deletions)
+        # The rule can be told again
+        solver.tell(parse_sentence("a => b"))
+        self.assertTrue(solver.entails(Symbol("b")))
+        self.assertEqual(solver.ask(Symbol("b"))["message"].split(", ")[-1], "b")
+
+    def test_retract_shared(self):
+        # A fact or rule told by several sentences stays until all of them are retracted
+        for told, retracted in ((["a", "a & b", "a => c"], "a & b"), (["a", "b => c", "a & (b => c)", "b"], "a & (b => c)")):
+            sentences = [parse_sentence(sentence) for sentence in told]
+            left = [sentence for sentence in sentences if sentence != parse_sentence(retracted)]
+            self.assertTrue(solve("TT", left, Symbol("c"))["entails"])
+            for method in ("FC", "BC"):
+                incremental = INCREMENTAL[method]()
+                for sentence in sentences:
+                    incremental.tell(sentence)
+                incremental.retract(parse_sentence(retracted))
+                self.assertTrue(incremental.ask(Symbol("c"))["entails"], f"{method} {retracted}")
+        solver = IncrementalForwardChaining()
+        for sentence in ("a", "a & b", "a => c"):
+            solver.tell(parse_sentence(sentence))
+        solver.retract(parse_sentence("a & b"))
+        self.assertEqual([solver.entails(Symbol(name)) for name in "abc"], [True, False, True])
+        solver.retract(Symbol("a"))
+        self.assertEqual([solver.entails(Symbol(name)) for name in "abc"], [False, False, False])
+
+    def test_retract_random(self):
+        # Random sequences of tell and retract, against a solver of the knowledge base so far
+        symbols = [Symbol(f"s{i}") for i in range(8)]
+        for seed in range(50):
+            rng = random.Random(seed)
+            pool = [Implication(Conjunction(*rng.sample(symbols, 2)) if rng.random() < 0.5 else rng.choice(symbols), rng.choice(symbols)) for _ in range(14)] + rng.sample(symbols, 4)
+            # Conjunctions telling facts and rules of the pool again
+            pool += [Conjunction(*rng.sample(pool, 2)) for _ in range(4)]
+            # Every sentence told, once per time it was told: it stays until retracted as many times
+            kb, solver = [], IncrementalForwardChaining()
+            for step in range(40):
+                if kb and rng.random() < 0.4:
+                    sentence = kb.pop(rng.randrange(len(kb)))
+                    solver.retract(sentence)
+                else:
+                    sentence = rng.choice(pool)
+                    kb.append(sentence)
+                    solver.tell(sentence)
+                fresh = IncrementalForwardChaining()
+                for sentence in kb:
+                    fresh.tell(sentence)
+                for symbol in symbols:
+                    self.assertEqual(solver.entails(symbol), fresh.entails(symbol), f"{seed} {step} {symbol}")
+                    if solver.entails(symbol):
+                        # The chain only has symbols inferred, ending with the query
+                        chain = solver.ask(symbol)["message"].split(", ")
+                        self.assertTrue(all(fresh.entails(Symbol(name)) for name in chain))
+                        self.assertEqual(chain[-1], symbol.name)
+
+    def test_backward_chaining(self):
+        solver = IncrementalBackwardChaining()
+        solver.tell(parse_sentence("a => b"))
+        solver.tell(parse_sentence("b => c"))
+        self.assertEqual(solver.ask(Symbol("c")), { "entails": False })
+        solver.tell(Symbol("a"))
+        self.assertEqual(solver.ask(Symbol("c")), { "entails": True, "message": "a, b, c" })
+        self.assertEqual(solver.ask(Symbol("a")), { "entails": True, "message": "a" })
+        expanded = solver.goals_expanded
+        # The proof of b is remembered
+        solver.tell(parse_sentence("b => d"))
+        self.assertEqual(solver.ask(Symbol("d")), { "entails": True, "message": "a, b, d" })
+        self.assertEqual(solver.goals_expanded, expanded + 1)
+        solver.retract(parse_sentence("a => b"))
+        self.assertEqual(solver.ask(Symbol("d")), { "entails": False })
+        self.assertEqual(solver.ask(Symbol("a")), { "entails": True, "message": "a" })
+
+    def test_dpll(self):
+        solver = IncrementalDPLL()
+        solver.tell(parse_sentence("a || b"))
+        result = solver.ask(Symbol("a"))
+        self.assertFalse(result["entails"])
+        self.assertEqual(result["model"], { Symbol("a"): False, Symbol("b"): True })
+        solver.tell(parse_sentence("b => a"))
+        self.assertEqual(solver.ask(Symbol("a")), { "entails": True })
+        # The clauses of a query are removed after it
+        self.assertEqual(solver.ask(parse_sentence("~a"))["entails"], False)
+        self.assertEqual(len(solver.database), 2)
+        self.assertEqual(solver.ask(parse_sentence("a || c")), { "entails": True })
+        self.assertEqual(solver.symbols, [Symbol("a"), Symbol("b"), Symbol("c")])
+
+
+if __name__ == '__main__':
+    unittest.main()
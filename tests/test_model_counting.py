@@ -0,0 +1,57 @@
+import unittest, sys, os
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from parser import parse_kb_and_query, problem_files
+from methods import ModelCounting, TruthTable
+
+def answer(result:dict) -> dict:
+    # The counter-model depends on the method, only the answer is compared
+    return {key: value for key, value in result.items() if key != "model"}
+
+class TestModelCounting(unittest.TestCase):
+
+    def setUp(self):
+        self.p = Symbol("p")
+        self.q = Symbol("q")
+        self.r = Symbol("r")
+
+    def test_counts(self):
+        # p => q; q => r over {p, q, r} has 4 models, 3 of them with r
+        solver = ModelCounting(Conjunction(Implication(self.p, self.q), Implication(self.q, self.r)), self.r)
+        self.assertEqual(solver.solve(), {"entails": False})
+        self.assertEqual(solver.kb_models_count, 4)
+        self.assertEqual(solver.valid_models_count, 3)
+
+    def test_tautology_and_contradiction(self):
+        solver = ModelCounting(Conjunction(self.p, Disjunction(self.q, Negation(self.q))), self.p)
+        self.assertEqual(solver.solve(), {"entails": True, "message": 2})
+        solver = ModelCounting(Conjunction(self.p, Negation(self.p)), self.q)
+        self.assertEqual(solver.solve(), {"entails": False})
+        self.assertEqual(solver.kb_models_count, 0)
+
+    def test_chain(self):
+        # x0 => x1; ...; x199 => x200 has a model for every position where the chain turns true
+        symbols = [Symbol(f"x{i}") for i in range(201)]
+        solver = ModelCounting(Conjunction(*[Implication(symbols[i], symbols[i + 1]) for i in range(200)]), symbols[-1])
+        self.assertEqual(solver.solve(), {"entails": False})
+        self.assertEqual(solver.kb_models_count, 202)
+        self.assertEqual(solver.valid_models_count, 201)
+
+    def test_many_symbols(self):
+        # Far too many symbols for the truth table
+        symbols = [Symbol(f"x{i}") for i in range(3000)]
+        kb = Conjunction(symbols[0], *[Implication(symbols[i], symbols[i + 1]) for i in range(len(symbols) - 1)])
+        self.assertEqual(ModelCounting(kb, symbols[-1]).solve(), {"entails": True, "message": 1})
+        self.assertEqual(ModelCounting(kb, Negation(symbols[-1])).solve(), {"entails": False})
+
+    def test_same_result_as_truth_table(self):
+        for file_name in problem_files():
+            kb, query = parse_kb_and_query(file_name)
+            self.assertEqual(ModelCounting(kb, query).solve(), answer(TruthTable(kb, query).solve()), file_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
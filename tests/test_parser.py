@@ -1,8 +1,9 @@
-import unittest, sys, os
+import unittest, sys, os, tempfile
 
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
 
+import parser
 from parser import *
 from syntax import *
 
@@ -100,6 +101,22 @@ class TestParser(unittest.TestCase):
         )
         self.assertEqual(parsed_sentence, expected_sentence)
         
+    def test_problem_files(self):
+        files = problem_files()
+        self.assertIn(self.file_name, files)
+        self.assertEqual(files, sorted(files))
+        self.assertTrue(all(file_name.endswith('.txt') for file_name in files))
+        # The DIMACS files and the folder of generated problems are left out
+        with tempfile.TemporaryDirectory() as directory:
+            for file_name in ('b.txt', 'a.txt', 'a.cnf'):
+                open(os.path.join(directory, file_name), 'w').close()
+            os.mkdir(os.path.join(directory, 'generated.txt'))
+            input_dir, parser.INPUT_DIR = parser.INPUT_DIR, directory
+            try:
+                self.assertEqual(problem_files(), ['a.txt', 'b.txt'])
+            finally:
+                parser.INPUT_DIR = input_dir
+
     def test_parse_kb_and_query(self):
         kb, query = parse_kb_and_query(self.file_name)
         expected_kb = Conjunction(
@@ -0,0 +1,84 @@
+import unittest, sys, os
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from parser import parse_kb_and_query, problem_files
+from clauses import satisfiable
+from preprocessing import *
+from methods import DPLL, Resolution
+
+def clauses(*literals):
+    return [frozenset(clause) for clause in literals]
+
+def answer(result:dict) -> dict:
+    # The counter-model depends on the method, only the answer is compared
+    return {key: value for key, value in result.items() if key != "model"}
+
+class TestPreprocessing(unittest.TestCase):
+
+    def test_self_subsuming_resolution(self):
+        # 1 || 2 subsumes 1 || 2 || 3, and strengthens ~1 || 2 || 4 to 2 || 4
+        result = self_subsuming_resolution(clauses((1, 2), (1, 2, 3), (-1, 2, 4)))
+        self.assertCountEqual(result, clauses((1, 2), (2, 4)))
+        self.assertEqual(self_subsuming_resolution(clauses((1,), (-1,))), UNSATISFIABLE)
+
+    def test_equivalent_literal_substitution(self):
+        # 1 => 2 and 2 => 1: 2 is replaced by 1
+        result = equivalent_literal_substitution(clauses((-1, 2), (-2, 1), (2, 3), (-2, -3, 4)))
+        self.assertCountEqual(result, clauses((1, 3), (-1, -3, 4)))
+        # 1 => ~1 and ~1 => 1
+        self.assertEqual(equivalent_literal_substitution(clauses((-1, 2), (-2, -1), (1, 3), (-3, 1), (1, -2), (2, -1))), UNSATISFIABLE)
+
+    def test_failed_literal_probing(self):
+        # Assuming 1 propagates 2 and ~2, so ~1 holds and satisfies the clauses it appears in
+        result = failed_literal_probing(clauses((-1, 2), (-1, -2), (1, 3, 4)))
+        self.assertCountEqual(result, clauses((3, 4)))
+
+    def test_bounded_variable_elimination(self):
+        # Resolving on 2 replaces two clauses with one
+        result = bounded_variable_elimination(clauses((1, 2), (-2, 3)))
+        self.assertEqual(result, [])
+        self.assertEqual(bounded_variable_elimination(clauses((1,), (-1,))), UNSATISFIABLE)
+
+    def test_report(self):
+        result, report = preprocess(clauses((1, 2), (1, 2, 3), (-2, 3)), ["ssr", "bve"])
+        self.assertEqual([step["step"] for step in report], ["ssr", "bve"])
+        self.assertEqual((report[0]["variables_removed"], report[0]["clauses_removed"]), (0, 1))
+        self.assertTrue(all(step["time"] >= 0 for step in report))
+        self.assertEqual(result, [])
+
+    def test_parse_steps(self):
+        self.assertEqual(parse_steps("all"), list(STEPS))
+        self.assertEqual(parse_steps("bve, SSR"), ["bve", "ssr"])
+        with self.assertRaises(ValueError):
+            parse_steps("ssr,unknown")
+
+    def test_equisatisfiable(self):
+        for literals in [((1, 2, 3), (-1, 2), (-2, 3), (-3, 1), (-1, -2, -3)),
+                         ((1, 2), (-1, 2), (1, -2), (-1, -2)),
+                         ((1, -2), (2, -3), (3, -1), (1, 4), (-4, 5, 6), (-5, -6))]:
+            for step in STEPS:
+                result, _ = preprocess(clauses(*literals), [step])
+                self.assertEqual(satisfiable(result), satisfiable(clauses(*literals)), f"{step} on {literals}")
+
+    def test_preprocess_clauses(self):
+        p, q, r = Symbol("p"), Symbol("q"), Symbol("r")
+        result, _ = preprocess_clauses([Disjunction(p, q), Disjunction(p, q, r), Negation(r)], ["ssr"])
+        self.assertEqual(result, {Disjunction(p, q), Negation(r)})
+        # Unsatisfiable clauses become complementary units
+        result, _ = preprocess_clauses([p, Negation(p), q], ["ssr"])
+        self.assertEqual(result, {p, Negation(p)})
+
+    def test_same_result_as_solver(self):
+        for file_name in problem_files():
+            kb, query = parse_kb_and_query(file_name)
+            self.assertEqual(DPLL(kb, query, list(STEPS)).solve(), answer(DPLL(kb, query).solve()), file_name)
+            if file_name.startswith("horn"):
+                # Resolution is too slow on some of the generic problems without preprocessing
+                self.assertEqual(Resolution(kb, query, list(STEPS)).solve(), Resolution(kb, query).solve(), file_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
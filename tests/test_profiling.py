@@ -0,0 +1,66 @@
+import unittest, sys, os, io, time, tempfile, pstats
+from contextlib import redirect_stdout
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from profiling import *
+from iengine import main
+
+def busy(seconds:float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+class TestProfiling(unittest.TestCase):
+
+    def test_phase(self):
+        profiler = Profiler("solve")
+        with profiler.profile("parse"):
+            busy(0.01)
+        self.assertEqual(profiler.report(), "No profile recorded")
+        with profiler.profile("solve"):
+            busy(0.01)
+        self.assertIn("busy", profiler.report())
+        with self.assertRaises(ValueError):
+            Profiler("search")
+
+    def test_pstats(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "profile.prof")
+            profiler = Profiler("cnf", output=output)
+            with profiler.profile("cnf"):
+                busy(0.01)
+            profiler.save()
+            functions = {function for _, _, function in pstats.Stats(output).stats}
+            self.assertIn("busy", functions)
+
+    def test_sampling(self):
+        profiler = Profiler("solve", sampling=True)
+        with profiler.profile("solve"):
+            busy(0.3)
+        self.assertGreater(sum(profiler.samples.values()), 10)
+        for stack in profiler.samples:
+            # Every stack starts from the function running the phase
+            self.assertEqual(stack[0], "tests/test_profiling.py:test_sampling")
+        self.assertIn("tests/test_profiling.py:busy", {name for stack in profiler.samples for name in stack})
+        for line in profiler.collapsed().splitlines():
+            stack, count = line.rsplit(" ", 1)
+            self.assertTrue(stack.startswith("tests/test_profiling.py:test_sampling"))
+            self.assertGreater(int(count), 0)
+        self.assertIn("tests/test_profiling.py:busy", profiler.report())
+
+    def test_iengine(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "profile.folded")
+            with redirect_stdout(io.StringIO()) as stdout:
+                main("FC", "horn_1.txt", profiler=Profiler("solve", sampling=True, output=output))
+            self.assertIn("YES", stdout.getvalue())
+            self.assertTrue(os.path.exists(output))
+            with redirect_stdout(io.StringIO()) as stdout:
+                main("DPLL", "horn_1.txt", profiler=Profiler("cnf"))
+            self.assertIn("encode_clauses", stdout.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest, sys, os, io
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from repl import Session, Shell
+
+def run(commands:str) -> list[str]:
+    output = io.StringIO()
+    shell = Shell(stdin=io.StringIO(commands), stdout=output)
+    shell.use_rawinput = False
+    shell.prompt = ""
+    shell.cmdloop(intro="")
+    return output.getvalue().splitlines()
+
+class TestRepl(unittest.TestCase):
+
+    def test_session(self):
+        session = Session()
+        with self.assertRaises(ValueError):
+            session.ask("a", "FC")
+        self.assertEqual(session.tell("a; a => b; b & c => d"), 3)
+        self.assertEqual(session.ask("d", "FC"), { "entails": False })
+        self.assertEqual(session.ask("d", "DPLL")["entails"], False)
+        # The incremental solvers are updated by the sentences told after them
+        self.assertEqual(session.tell("c; a"), 1)
+        self.assertEqual(set(session.solvers), {"FC", "DPLL"})
+        self.assertEqual(session.ask("d", "FC"), { "entails": True, "message": "a, b, c, d" })
+        self.assertEqual(session.ask("d", "DPLL"), { "entails": True })
+        self.assertEqual(session.ask("d", "TT")["entails"], True)
+        with self.assertRaises(SyntaxError):
+            session.tell("e; (a")
+        self.assertEqual(len(session.sentences), 4)
+        # FC is updated, DPLL built again by its next query
+        self.assertEqual(session.retract("a; e"), 1)
+        self.assertEqual(set(session.solvers), {"FC"})
+        self.assertEqual(session.ask("d", "FC"), { "entails": False })
+        self.assertEqual(session.ask("d", "DPLL")["entails"], False)
+        self.assertEqual(session.ask("c", "BC"), { "entails": True, "message": "c" })
+
+    def test_shell(self):
+        lines = run("TELL a; a => b\nask b\nAsk fc b\nmethod bc\nask b\nask fc (b\nfoo\nmethod xyz\nLIST\nretract a => b\nLOAD horn_1.txt\nquit\nask b\n")
+        answers = [line for line in lines if not line.startswith("(")]
+        self.assertEqual(answers[0], "2 sentences added (2 in the knowledge base)")
+        self.assertEqual(answers[1:5], ["YES", "YES: a, b", "Method: BC", "YES: a, b"])
+        self.assertTrue(answers[5].startswith("ERROR: Expected"))
+        self.assertTrue(answers[6].startswith("ERROR: Unknown command"))
+        self.assertTrue(answers[7].startswith("ERROR: Invalid method"))
+        self.assertEqual(answers[8:11], ["a", "a => b", "1 sentence removed (1 in the knowledge base)"])
+        self.assertEqual(answers[-1], "Query of the file: d")
+        self.assertTrue(lines[4].startswith("(FC, "))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import unittest, sys, os, json, socket, tempfile, threading
+from urllib.request import urlopen, Request
+from urllib.error import HTTPError
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from server import *
+
+HORN = ["p2=> p3", "p3 => p1", "c => e", "b&e => f", "f&g => h", "p1=>d", "p1&p3 => c", "a", "b", "p2"]
+
+class TestServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = InferenceServer()
+
+    def test_tell_ask(self):
+        response = self.server.handle({"command": "TELL", "kb": "horn", "sentences": HORN})
+        self.assertEqual(response, {"kb": "horn", "added": 10, "sentences": 10})
+        # Told sentences are not added twice
+        self.assertEqual(self.server.handle({"command": "TELL", "kb": "horn", "sentences": ["a", "a"]})["added"], 0)
+        for method in InferenceServer.METHODS:
+            self.assertTrue(self.server.handle({"command": "ASK", "kb": "horn", "query": "d", "method": method})["entails"], method)
+        # The chain of forward chaining, from the facts
+        chain = self.server.handle({"command": "ASK", "kb": "horn", "query": "d", "method": "fc"})["message"].split(", ")
+        self.assertEqual(chain[:3], ["a", "b", "p2"])
+        self.assertEqual(chain[-1], "d")
+        response = self.server.handle({"command": "ASK", "kb": "horn", "query": "h"})
+        self.assertFalse(response["entails"])
+        self.assertFalse(response["model"]["h"])
+
+    def test_retract(self):
+        self.server.handle({"command": "TELL", "kb": "horn", "sentences": HORN})
+        self.assertTrue(self.server.handle({"command": "ASK", "kb": "horn", "query": "d", "method": "BDD"})["entails"])
+        self.assertEqual(self.server.handle({"command": "RETRACT", "kb": "horn", "sentences": ["p2", "z"]}), {"kb": "horn", "removed": 1, "sentences": 9})
+        # The compiled diagram is thrown away
+        for method in ("BDD", "FC", "DPLL"):
+            self.assertFalse(self.server.handle({"command": "ASK", "kb": "horn", "query": "d", "method": method})["entails"], method)
+
+    def test_hash(self):
+        first = self.server.handle({"command": "ASK", "sentences": ["a", "a => b"], "query": "b"})
+        second = self.server.handle({"command": "ASK", "sentences": ["a=>b", "a"], "query": "b"})
+        self.assertTrue(first["entails"])
+        self.assertEqual(first, second)
+        # The same sentences in any order are parsed once
+        self.assertEqual(len(self.server.cache.entries), 1)
+        self.assertTrue(self.server.handle({"command": "STATUS"})["kbs"][0]["inline"])
+        # A TELL without a name gets a knowledge base of its own, apart from those of ASK
+        self.server.handle({"command": "TELL", "sentences": ["a", "a => b"]})
+        self.assertEqual(len(self.server.cache.entries), 2)
+
+    def test_hash_changed(self):
+        # The knowledge base named by the hash of a TELL is not the one of an ASK giving the same sentences
+        kb = self.server.handle({"command": "TELL", "sentences": ["a"]})["kb"]
+        self.server.handle({"command": "TELL", "kb": kb, "sentences": ["a => b"]})
+        self.assertTrue(self.server.handle({"command": "ASK", "kb": kb, "query": "b"})["entails"])
+        response = self.server.handle({"command": "ASK", "sentences": ["a"], "query": "b"})
+        self.assertNotIn("kb", response)
+        self.assertFalse(response["entails"])
+        # and answering it leaves the named knowledge base unchanged
+        response = self.server.handle({"command": "ASK", "kb": kb, "query": "b", "method": "FC"})
+        self.assertTrue(response["entails"])
+        self.assertEqual(self.server.cache.get(kb).sentences, {parse_sentence("a"): "a", parse_sentence("a => b"): "a => b"})
+        self.server.handle({"command": "RETRACT", "kb": kb, "sentences": ["a"]})
+        self.assertTrue(self.server.handle({"command": "ASK", "sentences": ["a"], "query": "a", "method": "BDD"})["entails"])
+
+    def test_resident_solvers(self):
+        self.server.handle({"command": "TELL", "kb": "horn", "sentences": HORN})
+        for method in InferenceServer.METHODS:
+            self.server.handle({"command": "ASK", "kb": "horn", "query": "d", "method": method})
+        entry = self.server.cache.get("horn")
+        self.assertCountEqual(entry.compiled, ["BDD", "FC", "BC", "DPLL"])
+        solvers = dict(entry.compiled)
+        self.assertEqual(len(entry.answers), 4)
+        # Kept between queries, then updated by a TELL or RETRACT
+        for method in ("FC", "BC", "DPLL"):
+            self.assertTrue(self.server.handle({"command": "ASK", "kb": "horn", "query": "p1", "method": method})["entails"], method)
+            self.assertIs(entry.compiled[method], solvers[method])
+        self.server.handle({"command": "TELL", "kb": "horn", "sentences": ["g"]})
+        self.assertNotIn("BDD", entry.compiled)
+        self.assertEqual(entry.answers, {})
+        for method in InferenceServer.METHODS:
+            self.assertTrue(self.server.handle({"command": "ASK", "kb": "horn", "query": "h", "method": method})["entails"], method)
+        self.assertIs(entry.compiled["FC"], solvers["FC"])
+        self.server.handle({"command": "RETRACT", "kb": "horn", "sentences": ["b"]})
+        for method in InferenceServer.METHODS:
+            self.assertFalse(self.server.handle({"command": "ASK", "kb": "horn", "query": "h", "method": method})["entails"], method)
+
+    def test_errors(self):
+        self.assertIn("error", self.server.handle({"command": "ASK", "kb": "missing", "query": "a"}))
+        self.assertIn("error", self.server.handle({"command": "FORGET"}))
+        self.assertIn("error", self.server.handle({"command": "TELL", "sentences": "a"}))
+        self.assertIn("error", self.server.handle({"command": "TELL", "kb": "k", "sentences": ["a", "b &"]}))
+        self.assertIn("error", self.server.handle({"command": "ASK", "sentences": ["a"], "query": "a", "method": "XYZ"}))
+        self.assertIn("error", self.server.handle(["ASK"]))
+        # A failed TELL leaves the knowledge base unchanged
+        self.server.handle({"command": "TELL", "kb": "k", "sentences": ["a"]})
+        self.server.handle({"command": "TELL", "kb": "k", "sentences": ["b", "c &"]})
+        self.assertEqual(len(self.server.cache.get("k").sentences), 1)
+
+    def test_eviction(self):
+        for name in ("first", "second"):
+            self.server.handle({"command": "TELL", "kb": name, "sentences": HORN})
+        # Room for two of these knowledge bases, but not three
+        self.server.cache.max_memory = 2.5 * max(entry.memory for entry in self.server.cache.entries.values())
+        # The first one is used again, so the second one is evicted
+        self.server.handle({"command": "ASK", "kb": "first", "query": "d", "method": "FC"})
+        self.server.handle({"command": "TELL", "kb": "third", "sentences": HORN})
+        self.assertEqual(list(self.server.cache.entries), ["first", "third"])
+        self.assertEqual(self.server.handle({"command": "STATUS"})["evictions"], 1)
+        self.assertLessEqual(self.server.cache.memory(), self.server.cache.max_memory)
+
+    def test_http(self):
+        http = serve_http(self.server, port=0)
+        threading.Thread(target=http.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{http.server_address[1]}"
+        post = lambda request: json.loads(urlopen(Request(url, json.dumps(request).encode(), method="POST")).read())
+        try:
+            post({"command": "TELL", "kb": "horn", "sentences": HORN})
+            results = []
+            # Concurrent clients
+            threads = [threading.Thread(target=lambda method=method: results.append(post({"command": "ASK", "kb": "horn", "query": "d", "method": method}))) for method in InferenceServer.METHODS]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(len(results), len(InferenceServer.METHODS))
+            self.assertTrue(all(result["entails"] for result in results))
+            with self.assertRaises(HTTPError) as error:
+                post({"command": "ASK", "kb": "missing", "query": "a"})
+            self.assertEqual(error.exception.code, 400)
+            self.assertEqual(json.loads(urlopen(url).read())["kbs"][0]["kb"], "horn")
+        finally:
+            http.shutdown()
+            http.server_close()
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets are not available")
+    def test_unix(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "iengine.sock")
+            unix = serve_unix(self.server, path)
+            threading.Thread(target=unix.serve_forever, daemon=True).start()
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                    client.connect(path)
+                    stream = client.makefile("rwb")
+                    for request in ({"command": "TELL", "kb": "horn", "sentences": HORN}, {"command": "ASK", "kb": "horn", "query": "d", "method": "BC"}):
+                        stream.write(json.dumps(request).encode() + b"\n")
+                    stream.write(b"not json\n")
+                    stream.flush()
+                    responses = [json.loads(stream.readline()) for _ in range(3)]
+                    stream.close()
+                self.assertEqual(responses[0]["added"], 10)
+                self.assertEqual(responses[1]["message"], "p2, p3, p1, d")
+                self.assertIn("error", responses[2])
+            finally:
+                unix.shutdown()
+                unix.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest, sys, os
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from parser import parse_kb_and_query, problem_files
+from slicing import slice_kb, cone_of_influence, symbol_components, is_consistent
+from methods import TruthTable
+
+class TestSlicing(unittest.TestCase):
+
+    def setUp(self):
+        self.a, self.b, self.c, self.d, self.e = (Symbol(name) for name in "abcde")
+
+    def test_cone_of_influence(self):
+        # a; a => b; b & c => d; e => c; d => e
+        sentences = [self.a, Implication(self.a, self.b), Implication(Conjunction(self.b, self.c), self.d),
+                     Implication(self.e, self.c), Implication(self.d, self.e)]
+        self.assertEqual(cone_of_influence(sentences, self.b), sentences[:2])
+        self.assertEqual(cone_of_influence(sentences, self.c), sentences)
+        self.assertEqual(cone_of_influence(sentences, Symbol("f")), [])
+
+    def test_horn_slice(self):
+        kb = Conjunction(self.a, Implication(self.a, self.b), Implication(self.c, self.d), Disjunction(Negation(self.d), self.e))
+        self.assertEqual(slice_kb(kb, self.b), Conjunction(self.a, Implication(self.a, self.b)))
+        self.assertEqual(slice_kb(kb, self.e), Conjunction(Implication(self.c, self.d), Disjunction(Negation(self.d), self.e)))
+        # Nothing to keep: the KB is left unchanged
+        self.assertEqual(slice_kb(kb, Symbol("f")), kb)
+
+    def test_symbol_components(self):
+        sentences = [Disjunction(self.a, self.b), Negation(self.c), Biconditional(self.b, self.d), self.e]
+        self.assertEqual(symbol_components(sentences), [[sentences[0], sentences[2]], [sentences[1]], [sentences[3]]])
+
+    def test_general_slice(self):
+        kb = Conjunction(Disjunction(self.a, self.b), Negation(self.b), Biconditional(self.c, self.d))
+        self.assertEqual(slice_kb(kb, self.a), Conjunction(Disjunction(self.a, self.b), Negation(self.b)))
+        self.assertEqual(slice_kb(kb, Implication(self.c, self.d)), Biconditional(self.c, self.d))
+
+    def test_inconsistent_remainder(self):
+        # The unrelated part is a contradiction, so the KB entails everything and is kept whole
+        kb = Conjunction(Disjunction(self.a, self.b), self.c, Negation(self.c))
+        self.assertFalse(is_consistent([self.c, Negation(self.c)]))
+        self.assertEqual(slice_kb(kb, self.a), kb)
+
+    def test_entailment_preserved(self):
+        for file_name in problem_files():
+            kb, query = parse_kb_and_query(file_name)
+            self.assertEqual(TruthTable(slice_kb(kb, query), query).solve()["entails"], TruthTable(kb, query).solve()["entails"], file_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest, sys, os, json
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from parser import parse_kb_and_query
+from stats import *
+from methods import *
+
+class TestStats(unittest.TestCase):
+
+    def test_phase(self):
+        stats = Stats()
+        with stats.phase("search"):
+            # Nested phases of the same name are only timed once
+            with stats.phase("search"):
+                pass
+            with stats.phase("cnf"):
+                pass
+        self.assertCountEqual(stats.timings, ["search", "cnf"])
+        self.assertGreaterEqual(stats.timings["search"], stats.timings["cnf"])
+
+    def test_counters(self):
+        stats = Stats()
+        stats.count("decisions")
+        stats.count("decisions", 2)
+        stats.peak("peak_clauses", 0)
+        stats.peak("peak_clauses", 5)
+        stats.peak("peak_clauses", 3)
+        self.assertEqual(stats.counters, {"decisions": 3, "peak_clauses": 5})
+        self.assertEqual(json.loads(stats.to_json()), {"timings": {}, "counters": {"decisions": 3, "peak_clauses": 5}})
+        self.assertEqual(stats.report(), "decisions: 3\npeak_clauses: 5")
+
+    def test_disabled(self):
+        with DISABLED.phase("search"):
+            DISABLED.count("decisions")
+        kb, query = parse_kb_and_query("horn_1.txt")
+        DPLL(kb, query).solve()
+        self.assertEqual(DISABLED.to_dict(), {"timings": {}, "counters": {}})
+
+    def test_solvers(self):
+        kb, query = parse_kb_and_query("horn_1.txt")
+        expected = {
+            TruthTable: ("compile", "models_enumerated"),
+            ForwardChaining: ("search", "agenda_pops"),
+            BackwardChaining: ("search", "goals_expanded"),
+            Resolution: ("cnf", "resolvents"),
+            DPLL: ("cnf", "propagations"),
+            BDD: ("compile", "peak_nodes"),
+            ModelCounting: ("cnf", "peak_cache"),
+            WalkSAT: ("cnf", "flips"),
+        }
+        for solver_class, (phase, counter) in expected.items():
+            stats = Stats()
+            solver_class(kb, query, stats=stats).solve()
+            self.assertIn("search", stats.timings, solver_class.__name__)
+            self.assertIn(phase, stats.timings, solver_class.__name__)
+            self.assertIn(counter, stats.counters, solver_class.__name__)
+        stats = Stats()
+        Decomposition("DPLL", kb, query, workers=1, stats=stats).solve()
+        self.assertIn("split", stats.timings)
+
+    def test_counts(self):
+        kb, query = parse_kb_and_query("horn_1.txt")
+        stats = Stats()
+        solver = TruthTable(kb, query, stats)
+        solver.solve()
+        solver.solve()
+        # Every call adds its own work
+        self.assertEqual(stats.counters["models_enumerated"], 2 * 2 ** len(solver.symbols))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,4 @@
-import unittest, sys, os
+import unittest, sys, os, pickle
 
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
@@ -75,5 +75,74 @@ class TestSyntax(unittest.TestCase):
         self.assertIsNone(Implication(self.p, Implication(self.q, self.r)).negate().evaluate(self.model))
 
 
+    def test_metadata(self):
+        # (p & q) => ~r
+        sentence = Implication(Conjunction(self.p, self.q), Negation(self.r))
+        self.assertEqual(sentence.depth, 2)
+        self.assertEqual(sentence.size, 6)
+        self.assertEqual(self.p.depth, 0)
+        self.assertEqual(self.p.size, 1)
+        self.assertSetEqual(sentence.symbols(), {self.p, self.q, self.r})
+        # Computed once and reused
+        self.assertIs(sentence.symbols(), sentence.symbols())
+        self.assertFalse(sentence.is_horn())
+        self.assertTrue(Implication(Conjunction(self.p, self.q), self.r).is_horn())
+        self.assertTrue(Disjunction(self.p.negate(), self.q.negate(), self.r).is_horn())
+        self.assertFalse(Disjunction(self.p, self.q).is_horn())
+
+    def test_deep_sentences(self):
+        # p0 → (p1 → (... → pn)), nested far beyond the recursion limit
+        symbols = [Symbol(f"p{i}") for i in range(10**5 + 1)]
+        def chain(last:Sentence) -> Sentence:
+            sentence = last
+            for symbol in reversed(symbols[:-1]):
+                sentence = Implication(symbol, sentence)
+            return sentence
+        sentence = chain(symbols[-1])
+        model = {symbol: True for symbol in symbols}
+        self.assertEqual(sentence.depth, 10**5)
+        self.assertTrue(sentence.evaluate(model))
+        model[symbols[-1]] = False
+        self.assertFalse(sentence.evaluate(model))
+        del model[symbols[0]]
+        self.assertIsNone(sentence.evaluate(model))
+        self.assertSetEqual(sentence.symbols(), set(symbols))
+        self.assertEqual(sentence, sentence)
+        self.assertEqual(len({sentence, Conjunction(sentence, self.p)}), 2)
+        # Built apart, and equal or not only by their deepest symbol
+        self.assertEqual(sentence, chain(Symbol(f"p{10**5}")))
+        self.assertNotEqual(sentence, chain(self.p))
+        text = str(sentence)
+        self.assertTrue(text.startswith("p0 => (p1 => (p2 => "))
+        self.assertTrue(text.endswith(f"p99999 => p{10**5}" + ")" * (10**5 - 1)))
+        self.assertEqual(repr(sentence), text)
+
+    def test_deep_commutative_sentences(self):
+        # (((p0 || q) & p1) || q) & ..., nested beyond the recursion limit through conjunctions and disjunctions
+        def chain(first:Sentence) -> Sentence:
+            sentence = first
+            for i in range(1, 5001):
+                sentence = Conjunction(Disjunction(sentence, self.q), Symbol(f"p{i}"))
+            return sentence
+        sentence = chain(Symbol("p0"))
+        self.assertEqual(sentence, chain(Symbol("p0")))
+        self.assertNotEqual(sentence, chain(self.r))
+        text = str(sentence)
+        # Arguments are ordered by their text, as for shallow sentences
+        self.assertTrue(text.startswith("(((("))
+        self.assertTrue(text.endswith(") || q) & p5000"))
+        self.assertEqual(str(chain(Symbol("p0"))), text)
+
+    def test_pickle(self):
+        # Metadata is cached on the nodes, including symbol sets referring to the symbols themselves
+        sentence = Conjunction(Implication(self.p, self.q), Negation(self.r), Disjunction(self.p, self.r))
+        sentence.symbols()
+        self.p.symbols()
+        copy = pickle.loads(pickle.dumps([sentence, self.p]))
+        self.assertEqual(copy, [sentence, self.p])
+        self.assertEqual(hash(copy[0]), hash(sentence))
+        self.assertSetEqual(copy[0].symbols(), {self.p, self.q, self.r})
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
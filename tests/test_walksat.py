@@ -0,0 +1,60 @@
+import unittest, sys, os, random
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from syntax import *
+from parser import parse_kb_and_query, problem_files
+from methods import WalkSAT, DPLL, TruthTable
+
+class TestWalkSAT(unittest.TestCase):
+
+    def test_same_result_as_dpll(self):
+        for file_name in problem_files():
+            kb, query = parse_kb_and_query(file_name)
+            solver = WalkSAT(kb, query)
+            result = solver.solve()
+            self.assertEqual(result["entails"], DPLL(kb, query).solve()["entails"], file_name)
+            if not result["entails"]:
+                # The model witnesses the NO answer: it satisfies the KB and falsifies the query
+                self.assertTrue(kb.evaluate(result["model"]), file_name)
+                self.assertFalse(query.evaluate(result["model"]), file_name)
+
+    def test_fallback(self):
+        # Unsatisfiable clauses: the local search fails and DPLL refutes them
+        p, q = Symbol("p"), Symbol("q")
+        solver = WalkSAT.from_clauses([Disjunction(p, q), Disjunction(Negation(p), q), Disjunction(p, Negation(q)), Disjunction(Negation(p), Negation(q))], max_flips=50)
+        self.assertEqual(solver.solve(), { "entails": True })
+        self.assertEqual(solver.flips, 50)
+        self.assertIsNone(solver.model)
+        self.assertEqual(WalkSAT.from_clauses([p, Negation(p)]).solve(), { "entails": True })
+
+    def test_tautology(self):
+        # s0 ∧ (s0 ∨ ¬s0) ∧ s1 ∧ (¬s0 → s1): the tautology is always true, so ¬s1 is not entailed
+        s0, s1 = Symbol("s0"), Symbol("s1")
+        kb = Conjunction(s0, Disjunction(s0, Negation(s0)), s1, Implication(Negation(s0), s1))
+        result = WalkSAT(kb, Negation(s1)).solve()
+        self.assertEqual(result["entails"], TruthTable(kb, Negation(s1)).solve()["entails"])
+        self.assertEqual(result["model"], { s0: True, s1: True })
+        self.assertTrue(WalkSAT(kb, s1).solve()["entails"])
+
+    def test_random_3sat(self):
+        # Satisfiable random 3-SAT, too large for DPLL to solve quickly
+        rng = random.Random(0)
+        symbols = [Symbol(f"x{i}") for i in range(300)]
+        clauses = [Disjunction(*(symbol if rng.random() < 0.5 else Negation(symbol) for symbol in rng.sample(symbols, 3))) for _ in range(1200)]
+        solver = WalkSAT.from_clauses(clauses)
+        result = solver.solve()
+        self.assertFalse(result["entails"])
+        self.assertLess(solver.flips, solver.max_flips)
+        self.assertTrue(all(clause.evaluate(result["model"]) for clause in clauses))
+
+    def test_seed(self):
+        kb, query = parse_kb_and_query("generic_3.txt")
+        first, second = WalkSAT(kb, query, seed=3), WalkSAT(kb, query, seed=3)
+        self.assertEqual(first.solve(), second.solve())
+        self.assertEqual(first.flips, second.flips)
+
+
+if __name__ == '__main__':
+    unittest.main()